@@ -0,0 +1,71 @@
+"""Compare sequential and batched faster-whisper decoding on one file.
+
+Usage::
+
+    python benchmarks/batched_decoding.py talk.mp3 --model small \\
+        --batch-sizes 1,4,8,16
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from scribebox.backends import TranscribeOptions, transcribe_file
+from scribebox.media import get_audio_duration_s
+from scribebox.model_cache import load_faster_whisper_model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio", type=Path)
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    parser.add_argument("--no-vad", action="store_true")
+    args = parser.parse_args()
+
+    duration_s = get_audio_duration_s(args.audio)
+    # Load once up front so the first configuration is not charged for it.
+    load_faster_whisper_model(
+        args.model,
+        device=args.device,
+        compute_type=args.compute_type,
+    )
+
+    baseline_words: int | None = None
+    print(f"{'batch':>5}  {'seconds':>8}  {'rtf':>6}  {'speedup':>7}  words")
+    sequential_s: float | None = None
+    for size in (int(v) for v in args.batch_sizes.split(",")):
+        options = TranscribeOptions(
+            model=args.model,
+            language=args.language,
+            device=args.device,
+            compute_type=args.compute_type,
+            vad_filter=not args.no_vad,
+            batch_size=size,
+        )
+        started = time.perf_counter()
+        transcript = transcribe_file(
+            audio_path=args.audio,
+            backend="faster-whisper",
+            options=options,
+        )
+        elapsed = time.perf_counter() - started
+
+        words = len(transcript.text.split())
+        baseline_words = baseline_words or words
+        sequential_s = sequential_s or elapsed
+        rtf = f"{elapsed / duration_s:.3f}" if duration_s else "n/a"
+        print(
+            f"{size:>5}  {elapsed:>8.1f}  {rtf:>6}  "
+            f"{sequential_s / elapsed:>6.2f}x  {words} "
+            f"({words - baseline_words:+d})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark PDF layout on a large synthetic transcript.
+
+ReportLab keeps every finished page in memory until the file is saved,
+so the peak RSS reported here grows with the length of the transcript.
+
+Usage::
+
+    python benchmarks/pdf_layout.py --hours 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from scribebox.pdf import PdfWriter
+
+_VOCAB = (
+    "the",
+    "of",
+    "and",
+    "to",
+    "a",
+    "in",
+    "that",
+    "is",
+    "was",
+    "he",
+    "for",
+    "it",
+    "with",
+    "as",
+    "his",
+    "on",
+    "be",
+    "at",
+    "by",
+    "transcript",
+    "segment",
+    "whisper",
+    "decoding",
+    "audio",
+    "model",
+    "language",
+    "speaker",
+    "international",
+    "understanding",
+    "approximately",
+    "responsibility",
+    "meanwhile",
+)
+
+
+def synthetic_segments(
+    *,
+    hours: float,
+    words_per_minute: int = 150,
+    words_per_segment: int = 18,
+    seed: int = 0,
+) -> Iterator[str]:
+    """Yield segment texts for ``hours`` of speech."""
+    rng = random.Random(seed)
+    total = int(hours * 60 * words_per_minute)
+    for _ in range(0, total, words_per_segment):
+        yield " ".join(rng.choices(_VOCAB, k=words_per_segment))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=10.0)
+    parser.add_argument("--words-per-minute", type=int, default=150)
+    parser.add_argument("--no-compress", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out = Path(tmpdir) / "bench.pdf"
+        started = time.perf_counter()
+        with PdfWriter(
+            out,
+            title="Benchmark",
+            compress=not args.no_compress,
+        ) as writer:
+            for text in synthetic_segments(
+                hours=args.hours,
+                words_per_minute=args.words_per_minute,
+            ):
+                writer.write(text)
+        elapsed = time.perf_counter() - started
+        size_mb = out.stat().st_size / (1024 * 1024)
+
+    print(f"pages: {writer.pages}")
+    print(f"size: {size_mb:.1f} MiB")
+    print(f"elapsed: {elapsed:.2f}s")
+    print(f"pages/s: {writer.pages / elapsed:.1f}")
+    print(f"peak RSS: {_peak_rss_mb():.0f} MiB")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+if __name__ == "__main__":
+    main()
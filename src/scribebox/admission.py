@@ -0,0 +1,401 @@
+"""Admission control for the web app, in audio seconds."""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+
+from .exceptions import ScribeboxError
+from .metrics import (
+    ADMISSION_DECODES,
+    ADMISSION_OUTSTANDING_AUDIO,
+    ADMISSION_REJECTIONS,
+)
+
+# Real-time factor assumed until a decode has been observed.
+DEFAULT_RTF = 0.5
+# Weight of the newest observation in the real-time factor estimate.
+RTF_SMOOTHING = 0.2
+MIN_RETRY_AFTER_S = 1
+
+
+class RejectReason(StrEnum):
+    """Why a request was not admitted."""
+
+    DECODES = "decodes"
+    QUEUED_AUDIO = "queued_audio"
+    AUDIO_TOO_LONG = "audio_too_long"
+
+
+class AdmissionRejectedError(ScribeboxError):
+    """Raised when a request cannot be admitted.
+
+    Parameters
+    ----------
+    reason:
+        Which limit was hit.
+    retry_after_s:
+        Suggested wait before retrying, or ``None`` if retrying cannot
+        help (the input alone exceeds a limit).
+    message:
+        Human-readable explanation.
+    """
+
+    def __init__(
+        self,
+        reason: RejectReason,
+        *,
+        retry_after_s: int | None,
+        message: str,
+    ) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+    @property
+    def status_code(self) -> int:
+        """HTTP status: 413 for oversized input, 503 busy, 429 backlog."""
+        if self.reason is RejectReason.AUDIO_TOO_LONG:
+            return 413
+        if self.reason is RejectReason.DECODES:
+            return 503
+        return 429
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionLimits:
+    """Limits enforced by :class:`AdmissionController`.
+
+    Parameters
+    ----------
+    max_decodes:
+        Decodes allowed to run at the same time, across synchronous
+        requests and background jobs. The default leaves one slot for a
+        synchronous request next to a single job worker.
+    max_outstanding_audio_s:
+        Audio seconds admitted but not finished yet (queued and running).
+    max_audio_s:
+        Longest single input accepted, in seconds.
+    max_upload_bytes:
+        Largest upload accepted, in bytes.
+    """
+
+    max_decodes: int = 2
+    max_outstanding_audio_s: float | None = None
+    max_audio_s: float | None = None
+    max_upload_bytes: int | None = None
+
+    @classmethod
+    def from_env(cls, *, workers: int = 1) -> AdmissionLimits:
+        """Read limits from the environment.
+
+        ``SCRIBEBOX_MAX_DECODES`` (default: ``workers + 1``, so busy job
+        workers never turn synchronous requests away on their own),
+        ``SCRIBEBOX_MAX_QUEUED_AUDIO_S``, ``SCRIBEBOX_MAX_AUDIO_S`` and
+        ``SCRIBEBOX_MAX_UPLOAD_MB``; unset limits are not enforced.
+        """
+        decodes = _env_float("SCRIBEBOX_MAX_DECODES") or workers + 1
+        upload_mb = _env_float("SCRIBEBOX_MAX_UPLOAD_MB")
+        return cls(
+            max_decodes=max(1, int(decodes)),
+            max_outstanding_audio_s=_env_float("SCRIBEBOX_MAX_QUEUED_AUDIO_S"),
+            max_audio_s=_env_float("SCRIBEBOX_MAX_AUDIO_S"),
+            max_upload_bytes=(
+                None if upload_mb is None else int(upload_mb * 1024 * 1024)
+            ),
+        )
+
+
+def _env_float(name: str) -> float | None:
+    raw = os.environ.get(name, "").strip()
+    return float(raw) if raw else None
+
+
+class Ticket:
+    """An admitted request, holding its audio seconds until released.
+
+    Parameters
+    ----------
+    controller:
+        Controller that admitted the request.
+    audio_s:
+        Probed duration of the input, if known.
+    """
+
+    def __init__(
+        self,
+        controller: AdmissionController,
+        audio_s: float | None,
+    ) -> None:
+        self._controller = controller
+        self.audio_s = audio_s
+        self.started_at: float | None = None
+        self.released = False
+
+    def __enter__(self) -> Ticket:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+    def set_audio_s(self, audio_s: float | None) -> None:
+        """Record a duration learned after admission (e.g. a download).
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the input is longer than the per-request limit.
+        """
+        self._controller._update(self, audio_s)
+
+    def start(self) -> None:
+        """Wait for a free decode slot and claim it."""
+        self._controller._start(self)
+
+    def release(self) -> None:
+        """Free the slot and the audio seconds; safe to call twice."""
+        self._controller._release(self)
+
+
+class AdmissionController:
+    """Admit work by free decode slots and outstanding audio seconds.
+
+    Synchronous requests claim a decode slot on admission and are turned
+    away with 503 when every slot is busy, instead of piling more decodes
+    onto the same CPUs. Background jobs only reserve their audio seconds
+    on admission and claim a slot when a worker starts them; they are
+    turned away with 429 once the audio already admitted would take too
+    long to drain. ``Retry-After`` is estimated from the observed
+    real-time factor.
+
+    Parameters
+    ----------
+    limits:
+        Limits to enforce.
+    """
+
+    def __init__(self, limits: AdmissionLimits) -> None:
+        self.limits = limits
+        self._cond = threading.Condition()
+        self._running: set[Ticket] = set()
+        self._admitted = 0
+        self._outstanding_s = 0.0
+        self._rtf = DEFAULT_RTF
+
+    @property
+    def decodes(self) -> int:
+        """Decodes currently running."""
+        with self._cond:
+            return len(self._running)
+
+    @property
+    def outstanding_audio_s(self) -> float:
+        """Audio seconds admitted and not yet released."""
+        with self._cond:
+            return self._outstanding_s
+
+    @property
+    def real_time_factor(self) -> float:
+        """Smoothed real-time factor of finished decodes."""
+        with self._cond:
+            return self._rtf
+
+    def check(self, *, start: bool) -> None:
+        """Reject early, before an upload is read, if nothing would fit.
+
+        Parameters
+        ----------
+        start:
+            As for :meth:`admit`.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the outstanding audio budget is already exhausted, or
+            with ``start`` if every decode slot is busy.
+        """
+        with self._cond:
+            budget = self.limits.max_outstanding_audio_s
+            if budget is not None and self._outstanding_s >= budget:
+                # The size of this request is not known yet; assume an
+                # average one.
+                average = self._outstanding_s / max(1, self._admitted)
+                self._reject_backlog_locked(average, self._outstanding_s)
+            if start and len(self._running) >= self.limits.max_decodes:
+                self._reject_busy_locked()
+
+    def admit(self, audio_s: float | None, *, start: bool) -> Ticket:
+        """Admit a request with ``audio_s`` seconds of audio.
+
+        Parameters
+        ----------
+        audio_s:
+            Probed duration, or ``None`` if not known yet.
+        start:
+            Claim a decode slot now (synchronous requests) instead of
+            when a worker picks the job up.
+
+        Returns
+        -------
+        Ticket
+            Release it once the decode is finished or abandoned.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If a limit is exceeded.
+        """
+        seconds = audio_s or 0.0
+        with self._cond:
+            self._check_audio_locked(audio_s, self._outstanding_s)
+            if start and len(self._running) >= self.limits.max_decodes:
+                self._reject_busy_locked()
+            ticket = Ticket(self, audio_s)
+            self._admitted += 1
+            self._add_locked(seconds)
+            if start:
+                self._start_locked(ticket)
+        return ticket
+
+    def check_queued(
+        self,
+        audio_s: float | None,
+        *,
+        outstanding_s: float,
+    ) -> None:
+        """Check work queued outside this process (e.g. a job store).
+
+        The per-request and outstanding audio limits are applied to
+        ``outstanding_s`` as reported by the shared queue; nothing is
+        reserved here, as the queue itself holds the backlog.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If a limit is exceeded.
+        """
+        with self._cond:
+            self._check_audio_locked(audio_s, outstanding_s)
+
+    def _check_audio_locked(
+        self,
+        audio_s: float | None,
+        outstanding_s: float,
+    ) -> None:
+        limit = self.limits.max_audio_s
+        if audio_s is not None and limit is not None and audio_s > limit:
+            self._reject(
+                RejectReason.AUDIO_TOO_LONG,
+                None,
+                f"Audio is {audio_s:.0f}s long; the limit is {limit:.0f}s.",
+            )
+        seconds = audio_s or 0.0
+        budget = self.limits.max_outstanding_audio_s
+        if budget is None or outstanding_s + seconds <= budget:
+            return
+        if seconds > budget:
+            self._reject(
+                RejectReason.AUDIO_TOO_LONG,
+                None,
+                f"Audio is {seconds:.0f}s long; at most "
+                f"{budget:.0f}s can be queued.",
+            )
+        self._reject_backlog_locked(seconds, outstanding_s)
+
+    def _reject_backlog_locked(
+        self,
+        seconds: float,
+        outstanding_s: float,
+    ) -> None:
+        budget = self.limits.max_outstanding_audio_s or 0.0
+        excess = outstanding_s + seconds - budget
+        drain_s = excess * self._rtf / max(1, self.limits.max_decodes)
+        self._reject(
+            RejectReason.QUEUED_AUDIO,
+            max(MIN_RETRY_AFTER_S, math.ceil(drain_s)),
+            f"{outstanding_s:.0f}s of audio are already queued; "
+            f"the limit is {budget:.0f}s.",
+        )
+
+    def _reject_busy_locked(self) -> None:
+        # Until the running decode expected to finish first is done.
+        now = time.monotonic()
+        wait = min(
+            (
+                (t.started_at or now) + (t.audio_s or 0.0) * self._rtf - now
+                for t in self._running
+            ),
+            default=0.0,
+        )
+        self._reject(
+            RejectReason.DECODES,
+            max(MIN_RETRY_AFTER_S, math.ceil(wait)),
+            "All decode slots are busy.",
+        )
+
+    def _reject(
+        self,
+        reason: RejectReason,
+        retry_after_s: int | None,
+        message: str,
+    ) -> None:
+        ADMISSION_REJECTIONS.inc(reason=reason)
+        raise AdmissionRejectedError(
+            reason,
+            retry_after_s=retry_after_s,
+            message=message,
+        )
+
+    def _add_locked(self, seconds: float) -> None:
+        self._outstanding_s += seconds
+        ADMISSION_OUTSTANDING_AUDIO.inc(seconds)
+
+    def _start_locked(self, ticket: Ticket) -> None:
+        ticket.started_at = time.monotonic()
+        self._running.add(ticket)
+        ADMISSION_DECODES.inc()
+
+    def _start(self, ticket: Ticket) -> None:
+        with self._cond:
+            if ticket in self._running or ticket.released:
+                return
+            while len(self._running) >= self.limits.max_decodes:
+                self._cond.wait()
+            self._start_locked(ticket)
+
+    def _update(self, ticket: Ticket, audio_s: float | None) -> None:
+        limit = self.limits.max_audio_s
+        if audio_s is not None and limit is not None and audio_s > limit:
+            self._reject(
+                RejectReason.AUDIO_TOO_LONG,
+                None,
+                f"Audio is {audio_s:.0f}s long; the limit is {limit:.0f}s.",
+            )
+        with self._cond:
+            if ticket.released:
+                return
+            self._add_locked((audio_s or 0.0) - (ticket.audio_s or 0.0))
+            ticket.audio_s = audio_s
+
+    def _release(self, ticket: Ticket) -> None:
+        with self._cond:
+            if ticket.released:
+                return
+            ticket.released = True
+            self._admitted -= 1
+            self._add_locked(-(ticket.audio_s or 0.0))
+            if ticket in self._running:
+                self._running.discard(ticket)
+                ADMISSION_DECODES.dec()
+                self._observe_locked(ticket)
+                self._cond.notify()
+
+    def _observe_locked(self, ticket: Ticket) -> None:
+        if not ticket.audio_s or ticket.started_at is None:
+            return
+        rtf = (time.monotonic() - ticket.started_at) / ticket.audio_s
+        self._rtf += RTF_SMOOTHING * (rtf - self._rtf)
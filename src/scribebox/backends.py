@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable
 
-from .types import Transcript, TranscriptSegment
+from .model_cache import load_faster_whisper_model, load_whisper_model
+from .types import SegmentTable, Transcript, TranscriptSegment
+
+if TYPE_CHECKING:
+    from .refine import RefineStats
+    from .vad import SpeechTimeline
 
 ProgressCallback = Callable[[float], None]
 
+BATCH_WINDOW_S = 30
+
 
 @dataclass(frozen=True, slots=True)
 class TranscribeOptions:
@@ -28,11 +36,27 @@ class TranscribeOptions:
     compute_type:
         Quantization/compute type for faster-whisper (e.g. ``int8``).
     vad_filter:
-        If True, apply VAD filtering when supported.
+        If True, skip non-speech audio: faster-whisper uses its built-in
+        Silero VAD, whisper goes through :mod:`scribebox.vad`. Either way
+        the stream reports the fraction skipped.
     beam_size:
         Beam size for decoding when supported.
     initial_prompt:
         Optional prompt/glossary to bias decoding.
+    batch_size:
+        If greater than 1, decode with faster-whisper's batched pipeline,
+        running this many 30 s windows through the model at once.
+        Ignored by the whisper backend.
+    cpu_threads:
+        CPU threads used by one decode; ``0`` keeps the backend default
+        (CTranslate2's, or PyTorch's for whisper).
+    num_workers:
+        Number of decodes one faster-whisper model may run concurrently
+        (e.g. the web app's worker count). Ignored by the whisper backend.
+    draft_model:
+        If set, decode with this (smaller, faster) model first and
+        re-decode only low-confidence regions with ``model``; see
+        :mod:`scribebox.refine`.
     """
 
     model: str = "large-v3"
@@ -43,16 +67,109 @@ class TranscribeOptions:
     vad_filter: bool = True
     beam_size: int = 5
     initial_prompt: str | None = None
+    batch_size: int | None = None
+    cpu_threads: int = 0
+    num_workers: int = 1
+    draft_model: str | None = None
 
 
-def transcribe_file(
+@dataclass(frozen=True, slots=True)
+class SegmentConfidence:
+    """Confidence signals the backend reported for one segment.
+
+    Parameters
+    ----------
+    avg_logprob:
+        Average log probability of the decoded tokens.
+    compression_ratio:
+        gzip compression ratio of the text; high values mean repetitive
+        (often hallucinated) output.
+    no_speech_prob:
+        Probability that the window holds no speech.
+    """
+
+    avg_logprob: float | None = None
+    compression_ratio: float | None = None
+    no_speech_prob: float | None = None
+
+    @classmethod
+    def from_raw(cls, seg: Any) -> SegmentConfidence:
+        """Read the signals from a faster-whisper or whisper segment."""
+        return cls(
+            avg_logprob=_raw_float(seg, "avg_logprob"),
+            compression_ratio=_raw_float(seg, "compression_ratio"),
+            no_speech_prob=_raw_float(seg, "no_speech_prob"),
+        )
+
+
+def _raw_float(seg: Any, name: str) -> float | None:
+    if isinstance(seg, dict):
+        value = seg.get(name)
+    else:
+        value = getattr(seg, name, None)
+    return None if value is None else float(value)
+
+
+class SegmentStream:
+    """Lazy iterator over decoded segments.
+
+    Segments are yielded as the backend decodes them. ``language`` is
+    known as soon as the stream is opened (it is detected before the
+    first segment is decoded).
+
+    Parameters
+    ----------
+    segments:
+        Iterator of decoded segments.
+    language:
+        Detected or forced language, if known.
+    vad_skipped_fraction:
+        Fraction of the audio cut out by scribebox's VAD stage, if it ran.
+    confidences:
+        Confidence signals of the segments yielded so far, in the same
+        order, filled in by the backend as it decodes (``None`` if the
+        segments carry none, e.g. cached ones).
+    refine:
+        Draft-and-refine statistics, updated while the stream is
+        consumed, when ``TranscribeOptions.draft_model`` is set.
+    """
+
+    def __init__(
+        self,
+        segments: Iterable[TranscriptSegment],
+        *,
+        language: str | None,
+        vad_skipped_fraction: float | None = None,
+        confidences: list[SegmentConfidence] | None = None,
+        refine: RefineStats | None = None,
+    ) -> None:
+        self._segments = iter(segments)
+        self.language = language
+        self.vad_skipped_fraction = vad_skipped_fraction
+        self.confidences = confidences
+        self.refine = refine
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        return self
+
+    def __next__(self) -> TranscriptSegment:
+        return next(self._segments)
+
+
+def iter_segments(
     *,
     audio_path: Path,
     backend: str,
     options: TranscribeOptions,
     progress_cb: ProgressCallback | None = None,
-) -> Transcript:
-    """Transcribe a local audio file.
+    start_s: float = 0.0,
+    end_s: float | None = None,
+) -> SegmentStream:
+    """Open a streaming transcription of a local audio file.
+
+    With faster-whisper, decoding happens lazily while the stream is
+    consumed. openai-whisper has no incremental API, so its stream is
+    only opened once the whole file is decoded.
 
     Parameters
     ----------
@@ -64,58 +181,218 @@ def transcribe_file(
         Transcription options.
     progress_cb:
         Optional callback receiving the current processed time (seconds).
+    start_s:
+        Seek to this offset before decoding (used to resume from a
+        checkpoint). Timestamps stay on the original timeline.
+    end_s:
+        Stop decoding at this offset (used to re-decode a region).
 
     Returns
     -------
-    Transcript
-        Transcription result.
+    SegmentStream
+        Iterator of segments with the detected language.
     """
+    if options.draft_model is not None:
+        from .refine import iter_refined_segments
+
+        return iter_refined_segments(
+            audio_path=audio_path,
+            backend=backend,
+            options=options,
+            progress_cb=progress_cb,
+            start_s=start_s,
+            end_s=end_s,
+        )
     if backend == "faster-whisper":
-        return _transcribe_faster_whisper(
+        return _stream_faster_whisper(
             audio_path=audio_path,
             options=options,
             progress_cb=progress_cb,
+            start_s=start_s,
+            end_s=end_s,
         )
     if backend == "whisper":
-        return _transcribe_whisper(
+        return _stream_whisper(
             audio_path=audio_path,
             options=options,
             progress_cb=progress_cb,
+            start_s=start_s,
+            end_s=end_s,
         )
     raise ValueError(f"Unsupported backend: {backend}")
 
 
-def _transcribe_faster_whisper(
+def iter_sample_segments(
+    samples: Any,
+    *,
+    backend: str,
+    options: TranscribeOptions,
+    offset_s: float = 0.0,
+) -> SegmentStream:
+    """Open a transcription of 16kHz mono samples already in memory.
+
+    Used for live audio, which has no file to seek in. The whisper
+    backend decodes ``samples`` as given (no VAD stage);
+    ``options.draft_model`` and ``batch_size`` are ignored.
+
+    Parameters
+    ----------
+    samples:
+        1-D float32 array sampled at 16kHz.
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    options:
+        Transcription options.
+    offset_s:
+        Timeline position of the first sample.
+
+    Returns
+    -------
+    SegmentStream
+        Iterator of segments with the detected language.
+    """
+    task = "translate" if options.translate else "transcribe"
+    confidences: list[SegmentConfidence] = []
+    if backend == "faster-whisper":
+        model = load_faster_whisper_model(
+            options.model,
+            device=options.device,
+            compute_type=options.compute_type,
+            cpu_threads=options.cpu_threads,
+            num_workers=options.num_workers,
+        )
+        raw, info = model.transcribe(
+            samples,
+            language=options.language,
+            task=task,
+            vad_filter=options.vad_filter,
+            beam_size=options.beam_size,
+            initial_prompt=options.initial_prompt,
+        )
+        language = getattr(info, "language", None)
+    elif backend == "whisper":
+        model = load_whisper_model(
+            options.model,
+            device=options.device,
+            cpu_threads=options.cpu_threads,
+        )
+        result = model.transcribe(
+            samples,
+            language=options.language,
+            task=task,
+            initial_prompt=options.initial_prompt,
+            verbose=False,
+        )
+        raw = result.get("segments", []) or []
+        language = result.get("language")
+    else:
+        raise ValueError(f"Unsupported backend: {backend}")
+    return SegmentStream(
+        _convert_segments(
+            raw,
+            progress_cb=None,
+            offset_s=offset_s,
+            confidences=confidences,
+        ),
+        language=language,
+        confidences=confidences,
+    )
+
+
+def preload_model(*, backend: str, options: TranscribeOptions) -> None:
+    """Load the model ``options`` select into the process-wide cache."""
+    if backend == "faster-whisper":
+        load_faster_whisper_model(
+            options.model,
+            device=options.device,
+            compute_type=options.compute_type,
+            cpu_threads=options.cpu_threads,
+            num_workers=options.num_workers,
+        )
+    elif backend == "whisper":
+        load_whisper_model(
+            options.model,
+            device=options.device,
+            cpu_threads=options.cpu_threads,
+        )
+    else:
+        raise ValueError(f"Unsupported backend: {backend}")
+
+
+def transcribe_file(
     *,
     audio_path: Path,
+    backend: str,
     options: TranscribeOptions,
-    progress_cb: ProgressCallback | None,
+    progress_cb: ProgressCallback | None = None,
 ) -> Transcript:
-    try:
-        from faster_whisper import WhisperModel
-    except Exception as exc:  # pragma: no cover
-        raise ImportError(
-            "faster-whisper is not installed. "
-            "Install with: pip install -e '.[faster-whisper]'"
-        ) from exc
-
-    model = WhisperModel(
+    """Transcribe a local audio file.
+
+    Parameters
+    ----------
+    audio_path:
+        Path to a local audio file.
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    options:
+        Transcription options.
+    progress_cb:
+        Optional callback receiving the current processed time (seconds).
+
+    Returns
+    -------
+    Transcript
+        Transcription result.
+    """
+    stream = iter_segments(
+        audio_path=audio_path,
+        backend=backend,
+        options=options,
+        progress_cb=progress_cb,
+    )
+    segments = SegmentTable(stream)
+    return Transcript(segments=segments, language=stream.language)
+
+
+def _stream_faster_whisper(
+    *,
+    audio_path: Path,
+    options: TranscribeOptions,
+    progress_cb: ProgressCallback | None,
+    start_s: float = 0.0,
+    end_s: float | None = None,
+) -> SegmentStream:
+    model = load_faster_whisper_model(
         options.model,
         device=options.device,
         compute_type=options.compute_type,
+        cpu_threads=options.cpu_threads,
+        num_workers=options.num_workers,
     )
 
     task = "translate" if options.translate else "transcribe"
+    batch_size = options.batch_size or 1
 
     try:
-        segments_iter, info = model.transcribe(
-            str(audio_path),
-            language=options.language,
-            task=task,
-            vad_filter=options.vad_filter,
-            beam_size=options.beam_size,
-            initial_prompt=options.initial_prompt,
-        )
+        if batch_size > 1:
+            segments_iter, info = _transcribe_batched(
+                model,
+                audio_path=audio_path,
+                options=options,
+                task=task,
+                batch_size=batch_size,
+                start_s=start_s,
+                end_s=end_s,
+            )
+        else:
+            segments_iter, info = model.transcribe(
+                _model_audio(audio_path, start_s, end_s),
+                language=options.language,
+                task=task,
+                vad_filter=options.vad_filter,
+                beam_size=options.beam_size,
+                initial_prompt=options.initial_prompt,
+            )
     except RuntimeError as exc:
         msg = str(exc)
         if "onnxruntime" in msg.lower() and options.vad_filter:
@@ -125,82 +402,219 @@ def _transcribe_faster_whisper(
             ) from exc
         raise
 
-    segments: list[TranscriptSegment] = []
-    texts: list[str] = []
+    detected = getattr(info, "language", None)
+    confidences: list[SegmentConfidence] = []
+    return SegmentStream(
+        _convert_segments(
+            segments_iter,
+            progress_cb=progress_cb,
+            offset_s=start_s,
+            confidences=confidences,
+        ),
+        language=detected,
+        vad_skipped_fraction=(
+            _silero_skipped_fraction(info) if options.vad_filter else None
+        ),
+        confidences=confidences,
+    )
 
-    last_end = 0.0
-    for seg in segments_iter:
-        seg_text = str(seg.text).strip()
-        end_s = float(seg.end)
-        segments.append(
-            TranscriptSegment(
-                start_s=float(seg.start),
-                end_s=end_s,
-                text=seg_text,
-            )
-        )
-        if seg_text:
-            texts.append(seg_text)
 
-        if progress_cb is not None and end_s >= last_end:
-            last_end = end_s
-            progress_cb(end_s)
+def _silero_skipped_fraction(info: Any) -> float | None:
+    """Report what faster-whisper's own VAD cut out, like :func:`_speech_only`.
 
-    detected = getattr(info, "language", None)
-    return Transcript(
-        text="\n".join(texts).strip(),
-        segments=segments,
-        language=detected,
+    The skipped seconds are counted in ``scribebox_vad_skipped_seconds``.
+    """
+    from .metrics import VAD_SKIPPED_SECONDS
+
+    duration = getattr(info, "duration", None)
+    after_vad = getattr(info, "duration_after_vad", None)
+    if not isinstance(duration, int | float) or not isinstance(
+        after_vad, int | float
+    ):
+        return None
+    if duration <= 0.0:
+        return 0.0
+    skipped = max(0.0, float(duration) - float(after_vad))
+    VAD_SKIPPED_SECONDS.inc(skipped)
+    return min(1.0, skipped / float(duration))
+
+
+def _model_audio(
+    audio_path: Path,
+    start_s: float,
+    end_s: float | None = None,
+) -> Any:
+    """Return the model input for ``audio_path`` from ``start_s`` on."""
+    if start_s <= 0.0 and end_s is None:
+        return str(audio_path)
+    from .ffmpeg import decode_pcm_16k_mono
+
+    return decode_pcm_16k_mono(
+        audio_path,
+        start_s=start_s if start_s > 0.0 else None,
+        duration_s=None if end_s is None else end_s - start_s,
+    )
+
+
+def _batched_pipeline(model: Any) -> Any:
+    from faster_whisper import BatchedInferencePipeline
+
+    return BatchedInferencePipeline(model=model)
+
+
+def _transcribe_batched(
+    model: Any,
+    *,
+    audio_path: Path,
+    options: TranscribeOptions,
+    task: str,
+    batch_size: int,
+    start_s: float = 0.0,
+    end_s: float | None = None,
+) -> tuple[Iterable[Any], Any]:
+    """Decode with faster-whisper's batched pipeline.
+
+    The pipeline splits the audio into windows of at most 30 s, using VAD
+    when enabled, and returns segments with timestamps on the original
+    timeline. Without VAD it needs explicit windows, so the audio is
+    decoded once and cut into fixed 30 s windows.
+    """
+    pipeline = _batched_pipeline(model)
+    audio: Any = _model_audio(audio_path, start_s, end_s)
+    clip_timestamps: list[dict[str, int]] | None = None
+    if not options.vad_filter:
+        from .ffmpeg import SAMPLE_RATE, decode_pcm_16k_mono
+
+        if isinstance(audio, str):
+            audio = decode_pcm_16k_mono(audio_path)
+        window = BATCH_WINDOW_S * SAMPLE_RATE
+        clip_timestamps = [
+            {"start": start, "end": min(start + window, len(audio))}
+            for start in range(0, len(audio), window)
+        ]
+
+    segments_iter, info = pipeline.transcribe(
+        audio,
+        language=options.language,
+        task=task,
+        vad_filter=options.vad_filter,
+        clip_timestamps=clip_timestamps,
+        beam_size=options.beam_size,
+        initial_prompt=options.initial_prompt,
+        batch_size=batch_size,
     )
+    return segments_iter, info
 
 
-def _transcribe_whisper(
+def _stream_whisper(
     *,
     audio_path: Path,
     options: TranscribeOptions,
     progress_cb: ProgressCallback | None,
-) -> Transcript:
-    try:
-        import whisper
-    except Exception as exc:  # pragma: no cover
-        raise ImportError(
-            "openai-whisper is not installed. "
-            "Install with: pip install -e '.[whisper]'"
-        ) from exc
-
-    model = whisper.load_model(options.model)
+    start_s: float = 0.0,
+    end_s: float | None = None,
+) -> SegmentStream:
+    model = load_whisper_model(
+        options.model,
+        device=options.device,
+        cpu_threads=options.cpu_threads,
+    )
     task = "translate" if options.translate else "transcribe"
 
+    # openai-whisper has no VAD of its own; cut silence out up front.
+    audio: Any
+    timeline: SpeechTimeline | None = None
+    if not options.vad_filter:
+        audio = _model_audio(audio_path, start_s, end_s)
+    else:
+        audio, timeline = _speech_only(
+            audio_path,
+            start_s=start_s,
+            end_s=end_s,
+        )
+        if not timeline.regions:
+            return SegmentStream(
+                [],
+                language=options.language,
+                vad_skipped_fraction=timeline.skipped_fraction,
+            )
+
     result = model.transcribe(
-        str(audio_path),
+        audio,
         language=options.language,
         task=task,
         initial_prompt=options.initial_prompt,
         verbose=False,
     )
 
-    segs: list[TranscriptSegment] = []
-    texts: list[str] = []
+    confidences: list[SegmentConfidence] = []
+    return SegmentStream(
+        _convert_segments(
+            result.get("segments", []) or [],
+            progress_cb=progress_cb,
+            timeline=timeline,
+            offset_s=start_s,
+            confidences=confidences,
+        ),
+        language=result.get("language"),
+        vad_skipped_fraction=(
+            None if timeline is None else timeline.skipped_fraction
+        ),
+        confidences=confidences,
+    )
+
+
+def _speech_only(
+    audio_path: Path,
+    *,
+    start_s: float = 0.0,
+    end_s: float | None = None,
+) -> tuple[Any, SpeechTimeline]:
+    from .ffmpeg import decode_pcm_16k_mono
+    from .metrics import VAD_SKIPPED_SECONDS, timed_stage
+    from .vad import SpeechTimeline
+
+    samples = decode_pcm_16k_mono(
+        audio_path,
+        start_s=start_s or None,
+        duration_s=None if end_s is None else end_s - start_s,
+    )
+    with timed_stage("vad"):
+        timeline = SpeechTimeline.detect(samples)
+        speech = timeline.compact(samples)
+    VAD_SKIPPED_SECONDS.inc(timeline.duration_s - timeline.speech_s)
+    return speech, timeline
+
 
+def _convert_segments(
+    raw: Iterable[Any],
+    *,
+    progress_cb: ProgressCallback | None,
+    timeline: SpeechTimeline | None = None,
+    offset_s: float = 0.0,
+    confidences: list[SegmentConfidence] | None = None,
+) -> Iterator[TranscriptSegment]:
     last_end = 0.0
-    for seg in result.get("segments", []) or []:
-        seg_text = str(seg.get("text", "")).strip()
-        end_s = float(seg.get("end", 0.0))
-        segs.append(
-            TranscriptSegment(
-                start_s=float(seg.get("start", 0.0)),
-                end_s=end_s,
-                text=seg_text,
-            )
-        )
-        if seg_text:
-            texts.append(seg_text)
+    for seg in raw:
+        if isinstance(seg, dict):
+            start_s = float(seg.get("start", 0.0))
+            end_s = float(seg.get("end", 0.0))
+            seg_text = str(seg.get("text", "")).strip()
+        else:
+            start_s = float(seg.start)
+            end_s = float(seg.end)
+            seg_text = str(seg.text).strip()
+
+        if timeline is not None:
+            start_s = timeline.to_original(start_s)
+            end_s = timeline.to_original(end_s, end=True)
+        start_s += offset_s
+        end_s += offset_s
+
+        if confidences is not None:
+            confidences.append(SegmentConfidence.from_raw(seg))
+        yield TranscriptSegment(start_s=start_s, end_s=end_s, text=seg_text)
+
         if progress_cb is not None and end_s >= last_end:
             last_end = end_s
             progress_cb(end_s)
-
-    return Transcript(
-        text="\n".join(texts).strip(),
-        segments=segs,
-        language=result.get("language"),
-    )
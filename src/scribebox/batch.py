@@ -0,0 +1,373 @@
+"""Batch transcription with a resumable manifest."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from enum import StrEnum
+from pathlib import Path
+
+from .backends import TranscribeOptions
+from .cache import TranscriptCache
+from .checkpoint import checkpoint_path
+from .core import run_transcription
+from .media import get_audio_duration_s
+from .writers import parse_formats
+
+MEDIA_SUFFIXES = frozenset(
+    {
+        ".aac",
+        ".flac",
+        ".m4a",
+        ".mkv",
+        ".mov",
+        ".mp3",
+        ".mp4",
+        ".ogg",
+        ".opus",
+        ".wav",
+        ".webm",
+    }
+)
+
+MANIFEST_NAME = "batch-manifest.json"
+
+
+class ItemStatus(StrEnum):
+    """Processing state of a batch item."""
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class BatchItem:
+    """One input of a batch run.
+
+    Parameters
+    ----------
+    input_path:
+        Media file to transcribe.
+    outdir:
+        Directory receiving this item's outputs.
+    status:
+        Processing state.
+    error:
+        Error message of the last failed attempt.
+    audio_s:
+        Audio duration in seconds, when known.
+    elapsed_s:
+        Wall-clock processing time of the last attempt.
+    """
+
+    input_path: str
+    outdir: str
+    status: ItemStatus = ItemStatus.PENDING
+    error: str | None = None
+    audio_s: float | None = None
+    elapsed_s: float | None = None
+
+
+@dataclass(slots=True)
+class BatchSummary:
+    """Outcome of a batch run.
+
+    Parameters
+    ----------
+    processed:
+        Items transcribed in this run.
+    skipped:
+        Items whose outputs were already up to date.
+    failures:
+        ``(input_path, error)`` pairs for items that failed.
+    audio_s:
+        Total audio seconds transcribed in this run.
+    wall_s:
+        Wall-clock duration of the run.
+    """
+
+    processed: int = 0
+    skipped: int = 0
+    failures: list[tuple[str, str]] = field(default_factory=list)
+    audio_s: float = 0.0
+    wall_s: float = 0.0
+
+    @property
+    def throughput(self) -> float | None:
+        """Audio hours transcribed per wall-clock hour."""
+        if self.wall_s <= 0.0 or self.audio_s <= 0.0:
+            return None
+        return self.audio_s / self.wall_s
+
+
+class BatchManifest:
+    """Per-item status persisted as JSON so interrupted runs can resume.
+
+    Parameters
+    ----------
+    path:
+        Manifest file location.
+    items:
+        Items keyed by input path.
+    """
+
+    def __init__(self, path: Path, items: dict[str, BatchItem]) -> None:
+        self.path = path
+        self.items = items
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> BatchManifest:
+        """Load a manifest, or return an empty one if it does not exist."""
+        if not path.exists():
+            return cls(path, {})
+        data = json.loads(path.read_text(encoding="utf-8"))
+        items: dict[str, BatchItem] = {}
+        for raw in data.get("items", []):
+            item = BatchItem(**raw)
+            item.status = ItemStatus(item.status)
+            items[item.input_path] = item
+        return cls(path, items)
+
+    def add(self, input_path: Path, outdir: Path) -> BatchItem:
+        """Register an input, keeping any recorded status."""
+        key = str(input_path)
+        item = self.items.get(key)
+        if item is None:
+            item = BatchItem(input_path=key, outdir=str(outdir))
+            self.items[key] = item
+        return item
+
+    def save(self) -> None:
+        """Atomically write the manifest to disk."""
+        with self._lock:
+            payload = {"items": [asdict(i) for i in self.items.values()]}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+
+
+def collect_inputs(source: Path, outdir: Path) -> list[tuple[Path, Path]]:
+    """Resolve a batch source into ``(input_path, item_outdir)`` pairs.
+
+    Parameters
+    ----------
+    source:
+        A directory (scanned recursively for media files), a manifest JSON
+        written by a previous run, or a text file listing one media path
+        per line.
+    outdir:
+        Root output directory. For directory sources the input's relative
+        sub-directory is mirrored below it so equal file names do not
+        collide. Listed inputs share it, except those whose outputs
+        would collide (same file stem), which get sub-directories (see
+        :func:`_disambiguate`).
+
+    Returns
+    -------
+    list[tuple[Path, Path]]
+        Inputs with their output directories, in a stable order.
+    """
+    if source.is_dir():
+        return [
+            (path, outdir / path.parent.relative_to(source))
+            for path in sorted(source.rglob("*"))
+            if path.is_file() and path.suffix.lower() in MEDIA_SUFFIXES
+        ]
+
+    if source.suffix.lower() == ".json":
+        manifest = BatchManifest.load(source)
+        return [
+            (Path(item.input_path), Path(item.outdir))
+            for item in manifest.items.values()
+        ]
+
+    paths: list[Path] = []
+    for line in source.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            paths.append(Path(line).expanduser())
+    return _disambiguate(paths, outdir)
+
+
+def _disambiguate(paths: list[Path], outdir: Path) -> list[tuple[Path, Path]]:
+    """Give inputs sharing a file stem their own output directories.
+
+    Outputs are named after the input stem, so ``a/talk.mp3`` and
+    ``b/talk.mp3`` would overwrite each other in one directory. Each of
+    them mirrors its directory relative to the others' common parent
+    (``out/a``, ``out/b``); files in the same directory are further split
+    by extension (``out/mp3``, ``out/wav``).
+    """
+    groups: dict[str, list[Path]] = {}
+    for path in paths:
+        groups.setdefault(path.stem.lower(), []).append(path)
+
+    outdirs: dict[Path, Path] = {}
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        parents = [path.resolve().parent for path in group]
+        root = Path(os.path.commonpath(parents))
+        parent_count: dict[Path, int] = {}
+        for parent in parents:
+            parent_count[parent] = parent_count.get(parent, 0) + 1
+        for path, parent in zip(group, parents, strict=True):
+            item_outdir = outdir / parent.relative_to(root)
+            if parent_count[parent] > 1:
+                item_outdir /= path.suffix.lstrip(".").lower() or "_"
+            outdirs[path] = item_outdir
+    return [(path, outdirs.get(path, outdir)) for path in paths]
+
+
+def is_up_to_date(
+    input_path: Path,
+    outdir: Path,
+    *,
+    pdf: bool,
+    formats: Iterable[str] = (),
+) -> bool:
+    """Return True if the outputs for ``input_path`` are newer than it.
+
+    An item that left a checkpoint behind was interrupted, so its
+    outputs are partial and it is never up to date.
+    """
+    if checkpoint_path(outdir, input_path.stem).exists():
+        return False
+    try:
+        src_mtime = input_path.stat().st_mtime
+    except OSError:
+        return False
+    outputs = [
+        outdir / f"{input_path.stem}.{fmt.value}"
+        for fmt in parse_formats(formats, pdf=pdf)
+    ]
+    for out in outputs:
+        try:
+            if out.stat().st_mtime < src_mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def run_batch(
+    pairs: list[tuple[Path, Path]],
+    *,
+    manifest: BatchManifest,
+    backend: str,
+    options: TranscribeOptions,
+    pdf: bool = False,
+    formats: Iterable[str] = (),
+    concurrency: int = 1,
+    cache: TranscriptCache | None = None,
+    on_item: Callable[[BatchItem], None] | None = None,
+) -> BatchSummary:
+    """Transcribe many inputs with one warm model.
+
+    All items run in this process and share the process-wide model cache,
+    so the model is loaded once. Items whose outputs are all newer than
+    the input are skipped (see :func:`is_up_to_date`; the decode options
+    are not compared, so use a fresh ``outdir`` to redo a batch with
+    other options), and the manifest is saved after every item so its
+    status reflects an interrupted run.
+
+    Parameters
+    ----------
+    pairs:
+        ``(input_path, item_outdir)`` pairs from :func:`collect_inputs`.
+    manifest:
+        Manifest recording per-item status.
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    options:
+        Transcription options.
+    pdf:
+        Also export PDFs.
+    formats:
+        Additional output formats (``srt``, ``vtt``, ``json``, ``pdf``).
+    concurrency:
+        Number of items decoded at the same time.
+    cache:
+        Optional transcript cache.
+    on_item:
+        Optional callback invoked after each item finishes or is skipped.
+
+    Returns
+    -------
+    BatchSummary
+        Counts, failures and throughput.
+    """
+    started = time.perf_counter()
+    summary = BatchSummary()
+    summary_lock = threading.Lock()
+
+    todo: list[tuple[BatchItem, Path, Path]] = []
+    for input_path, item_outdir in pairs:
+        item = manifest.add(input_path, item_outdir)
+        if is_up_to_date(input_path, item_outdir, pdf=pdf, formats=formats):
+            item.status = ItemStatus.DONE
+            summary.skipped += 1
+            if on_item is not None:
+                on_item(item)
+            continue
+        item.status = ItemStatus.PENDING
+        todo.append((item, input_path, item_outdir))
+    manifest.save()
+
+    # One probe per item, shared with every later stage of its run.
+    durations = {path: get_audio_duration_s(path) for _, path, _ in todo}
+    if concurrency > 1:
+        # Longest first, so a long file does not start last and leave the
+        # other workers idle at the end of the batch.
+        todo.sort(key=lambda entry: -(durations[entry[1]] or 0.0))
+
+    def process(entry: tuple[BatchItem, Path, Path]) -> None:
+        item, input_path, item_outdir = entry
+        t0 = time.perf_counter()
+        audio_s = durations[input_path]
+        try:
+            run_transcription(
+                audio_path=input_path,
+                outdir=item_outdir,
+                pdf=pdf,
+                backend=backend,
+                options=options,
+                title=input_path.name,
+                audio_duration_s=audio_s,
+                cache=cache,
+                formats=formats,
+            )
+        except Exception as exc:
+            item.status = ItemStatus.FAILED
+            item.error = str(exc) or type(exc).__name__
+            with summary_lock:
+                summary.failures.append((item.input_path, item.error))
+        else:
+            item.status = ItemStatus.DONE
+            item.error = None
+            item.audio_s = audio_s
+            with summary_lock:
+                summary.processed += 1
+                summary.audio_s += audio_s or 0.0
+        item.elapsed_s = time.perf_counter() - t0
+        manifest.save()
+        if on_item is not None:
+            on_item(item)
+
+    if concurrency <= 1:
+        for entry in todo:
+            process(entry)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(process, todo))
+
+    summary.wall_s = time.perf_counter() - started
+    return summary
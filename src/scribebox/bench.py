@@ -0,0 +1,429 @@
+"""Pipeline benchmarks with synthetic audio."""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import tempfile
+import time
+import wave
+from array import array
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .config import OutputOptions, TranscribeOptions
+from .ffmpeg import SAMPLE_RATE, decode_pcm_16k_mono
+from .pdf import write_pdf
+from .service import transcribe_local_file
+from .transcribe.base import AudioInput, Transcriber, TranscriptionResult
+from .transcript import format_transcript, write_text
+from .types import SegmentTable
+from .uploads import peak_rss_bytes
+from .vad import SpeechTimeline
+
+RESULTS_VERSION = 1
+STAGES = ("decode", "vad", "transcribe", "write_txt", "write_pdf")
+
+# Differences below this are treated as timer noise when comparing runs.
+MIN_REGRESSION_S = 0.005
+
+_T = TypeVar("_T")
+
+_WORDS = (
+    "the",
+    "quick",
+    "brown",
+    "fox",
+    "jumps",
+    "over",
+    "the",
+    "lazy",
+    "dog",
+    "while",
+    "the",
+    "transcript",
+    "keeps",
+    "growing",
+    "one",
+    "segment",
+)
+
+
+def write_synthetic_wav(
+    path: Path,
+    *,
+    duration_s: float,
+    tone_hz: float = 220.0,
+) -> Path:
+    """Write a 16 kHz mono WAV of alternating tone bursts and silence.
+
+    Every 4 seconds hold 3 seconds of tone followed by 1 second of
+    silence, so silence detection and VAD have something to find.
+
+    Parameters
+    ----------
+    path:
+        Destination WAV file.
+    duration_s:
+        Length of the audio in seconds.
+    tone_hz:
+        Tone frequency.
+
+    Returns
+    -------
+    pathlib.Path
+        ``path``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tone = array(
+        "h",
+        (
+            int(8000 * math.sin(2.0 * math.pi * tone_hz * i / SAMPLE_RATE))
+            for i in range(SAMPLE_RATE)
+        ),
+    ).tobytes()
+    silence = bytes(2 * SAMPLE_RATE)
+    pattern = [tone, tone, tone, silence]
+
+    total = int(duration_s * SAMPLE_RATE)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        written = 0
+        second = 0
+        while written < total:
+            block = pattern[second % len(pattern)]
+            n = min(SAMPLE_RATE, total - written)
+            wf.writeframes(block[: 2 * n])
+            written += n
+            second += 1
+    return path
+
+
+class FakeTranscriber(Transcriber):
+    """Deterministic transcriber emitting fixed-length segments.
+
+    Parameters
+    ----------
+    segment_s:
+        Length of each emitted segment in seconds.
+    words_per_segment:
+        Number of words in each segment's text.
+    """
+
+    def __init__(
+        self,
+        *,
+        segment_s: float = 5.0,
+        words_per_segment: int = 12,
+    ) -> None:
+        self.segment_s = segment_s
+        self.words_per_segment = words_per_segment
+
+    def transcribe(
+        self,
+        audio_path: AudioInput,
+        *,
+        language: str | None,
+        translate_to_english: bool,
+        model: str,
+        device: str,
+    ) -> TranscriptionResult:
+        """Return segments covering the whole input."""
+        duration_s = _audio_duration_s(audio_path)
+        segments = SegmentTable()
+        count = math.ceil(duration_s / self.segment_s)
+        for i in range(count):
+            words = [
+                _WORDS[(i + k) % len(_WORDS)]
+                for k in range(self.words_per_segment)
+            ]
+            segments.append(
+                i * self.segment_s,
+                min(duration_s, (i + 1) * self.segment_s),
+                " ".join(words),
+            )
+        return TranscriptionResult(segments=segments, language=language)
+
+
+def _audio_duration_s(audio: AudioInput) -> float:
+    if isinstance(audio, Path):
+        with wave.open(str(audio), "rb") as wf:
+            return wf.getnframes() / float(wf.getframerate())
+    return len(audio) / float(SAMPLE_RATE)
+
+
+@dataclass(slots=True)
+class BenchRun:
+    """Measurements for one audio length.
+
+    Parameters
+    ----------
+    audio_s:
+        Synthetic audio duration in seconds.
+    stages:
+        Best time per pipeline stage in seconds.
+    pipeline_s:
+        Best end-to-end time of ``service.transcribe_local_file``.
+    peak_rss_bytes:
+        Peak resident memory of the process after the run.
+    """
+
+    audio_s: float
+    stages: dict[str, float] = field(default_factory=dict)
+    pipeline_s: float = 0.0
+    peak_rss_bytes: int | None = None
+
+    @property
+    def real_time_factor(self) -> float:
+        """End-to-end processing time divided by audio duration."""
+        return self.pipeline_s / self.audio_s
+
+    @property
+    def throughput(self) -> float:
+        """Audio seconds processed per wall-clock second."""
+        return self.audio_s / self.pipeline_s if self.pipeline_s else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view."""
+        data = asdict(self)
+        data["real_time_factor"] = self.real_time_factor
+        data["throughput"] = self.throughput
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    """A metric that got slower than the baseline allows.
+
+    Parameters
+    ----------
+    audio_s:
+        Audio duration of the affected run.
+    metric:
+        Stage name or ``pipeline``.
+    baseline_s:
+        Baseline time in seconds.
+    current_s:
+        Current time in seconds.
+    """
+
+    audio_s: float
+    metric: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        """Current time relative to the baseline."""
+        return self.current_s / self.baseline_s
+
+
+@contextmanager
+def _timed(into: dict[str, float], name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        into[name] = min(into.get(name, math.inf), elapsed)
+
+
+def _best_of(repeat: int, fn: Callable[[], _T]) -> tuple[_T, float]:
+    best = math.inf
+    result: _T
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def run_bench(
+    *,
+    durations_s: list[float],
+    transcriber: Transcriber | None = None,
+    options: TranscribeOptions | None = None,
+    pdf: bool = True,
+    repeat: int = 3,
+    workdir: Path | None = None,
+) -> list[BenchRun]:
+    """Benchmark the service pipeline on synthetic audio.
+
+    Each stage (decode, VAD, transcribe, TXT and PDF writing) is timed on its
+    own, then the whole of :func:`scribebox.service.transcribe_local_file`
+    is timed end to end. The best of ``repeat`` runs is kept.
+
+    Parameters
+    ----------
+    durations_s:
+        Synthetic audio lengths to benchmark, in seconds.
+    transcriber:
+        Transcriber to use; defaults to :class:`FakeTranscriber`, which
+        isolates pipeline overhead from model time.
+    options:
+        Transcription options passed to the transcriber.
+    pdf:
+        Include PDF writing.
+    repeat:
+        Number of repetitions per measurement.
+    workdir:
+        Scratch directory; a temporary one is used by default.
+
+    Returns
+    -------
+    list[BenchRun]
+        One entry per duration.
+    """
+    transcriber = transcriber or FakeTranscriber()
+    options = options or TranscribeOptions(language="en")
+
+    with tempfile.TemporaryDirectory(prefix="scribebox_bench_") as tmp:
+        root = workdir or Path(tmp)
+        runs: list[BenchRun] = []
+        for duration_s in durations_s:
+            wav = write_synthetic_wav(
+                root / f"synthetic_{int(duration_s)}s.wav",
+                duration_s=duration_s,
+            )
+            run = BenchRun(audio_s=duration_s)
+
+            for _ in range(max(1, repeat)):
+                with _timed(run.stages, "decode"):
+                    audio = decode_pcm_16k_mono(wav)
+                if options.vad:
+                    with _timed(run.stages, "vad"):
+                        audio = SpeechTimeline.detect(audio).compact(audio)
+                with _timed(run.stages, "transcribe"):
+                    result = transcriber.transcribe(
+                        audio,
+                        language=options.language,
+                        translate_to_english=options.translate_to_english,
+                        model=options.model,
+                        device=options.device,
+                    )
+                with _timed(run.stages, "write_txt"):
+                    text = format_transcript(result.segments)
+                    write_text(root / "stage.txt", text)
+                if pdf:
+                    with _timed(run.stages, "write_pdf"):
+                        write_pdf(root / "stage.pdf", text=text)
+                del audio
+
+            outputs = OutputOptions(outdir=root / "out", write_pdf=pdf)
+            _, run.pipeline_s = _best_of(
+                repeat,
+                partial(
+                    transcribe_local_file,
+                    wav,
+                    transcriber=transcriber,
+                    options=options,
+                    outputs=outputs,
+                ),
+            )
+            run.peak_rss_bytes = peak_rss_bytes()
+            runs.append(run)
+            wav.unlink(missing_ok=True)
+    return runs
+
+
+def save_results(
+    path: Path,
+    runs: list[BenchRun],
+    *,
+    transcriber: str,
+) -> None:
+    """Write benchmark results as JSON.
+
+    Parameters
+    ----------
+    path:
+        Destination file.
+    runs:
+        Benchmark runs.
+    transcriber:
+        Label of the transcriber used (e.g. ``fake`` or a model name).
+    """
+    payload = {
+        "version": RESULTS_VERSION,
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "transcriber": transcriber,
+        "runs": [run.to_dict() for run in runs],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def load_results(path: Path) -> list[BenchRun]:
+    """Read benchmark results written by :func:`save_results`."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return [
+        BenchRun(
+            audio_s=float(raw["audio_s"]),
+            stages={k: float(v) for k, v in raw["stages"].items()},
+            pipeline_s=float(raw["pipeline_s"]),
+            peak_rss_bytes=raw.get("peak_rss_bytes"),
+        )
+        for raw in data["runs"]
+    ]
+
+
+def compare_results(
+    baseline: list[BenchRun],
+    current: list[BenchRun],
+    *,
+    threshold: float = 0.10,
+) -> list[Regression]:
+    """Flag stages that got slower than ``threshold`` allows.
+
+    Runs are matched by audio duration; durations present in only one
+    side are ignored.
+
+    Parameters
+    ----------
+    baseline:
+        Reference results.
+    current:
+        Results to check.
+    threshold:
+        Allowed relative slowdown (0.10 means 10%).
+
+    Returns
+    -------
+    list[Regression]
+        Regressed metrics, empty if none.
+    """
+    base_by_audio = {run.audio_s: run for run in baseline}
+    regressions: list[Regression] = []
+    for run in current:
+        base = base_by_audio.get(run.audio_s)
+        if base is None:
+            continue
+        pairs = [("pipeline", base.pipeline_s, run.pipeline_s)]
+        pairs += [
+            (stage, base.stages[stage], run.stages[stage])
+            for stage in STAGES
+            if stage in base.stages and stage in run.stages
+        ]
+        for metric, before, after in pairs:
+            if (
+                after > before * (1.0 + threshold)
+                and after - before > MIN_REGRESSION_S
+            ):
+                regressions.append(
+                    Regression(
+                        audio_s=run.audio_s,
+                        metric=metric,
+                        baseline_s=before,
+                        current_s=after,
+                    )
+                )
+    return regressions
@@ -0,0 +1,254 @@
+"""Content-addressed on-disk transcript cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from .types import SegmentTable, Transcript, TranscriptSegment
+
+_CHUNK_SIZE = 1 << 20
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_TTL_S = 90 * 24 * 3600.0
+
+
+def default_cache_dir() -> Path:
+    """Return the root directory for scribebox caches.
+
+    ``SCRIBEBOX_CACHE_DIR`` takes precedence, then
+    ``$XDG_CACHE_HOME/scribebox``, then ``~/.cache/scribebox``.
+    """
+    env = os.environ.get("SCRIBEBOX_CACHE_DIR", "").strip()
+    if env:
+        return Path(env).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME", "").strip()
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "scribebox"
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks.
+
+    Parameters
+    ----------
+    path:
+        File to hash.
+
+    Returns
+    -------
+    str
+        Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        while chunk := fh.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def transcript_cache_key(
+    audio_digest: str,
+    fields: Mapping[str, object],
+) -> str:
+    """Combine an audio digest and decode options into a cache key.
+
+    Parameters
+    ----------
+    audio_digest:
+        Content hash of the input media (see :func:`hash_file`).
+    fields:
+        Decode options that affect the transcript (model, language, ...).
+
+    Returns
+    -------
+    str
+        Hex cache key.
+    """
+    payload = json.dumps(
+        {"audio": audio_digest, "options": dict(fields)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def source_key(path: Path, fields: Mapping[str, object]) -> str:
+    """Cheaply identify a local file and the options applied to it.
+
+    Unlike :func:`hash_file`, the file is not read: it is identified by
+    its resolved path, size and modification time, so any change to the
+    file (or a different file at the same path) yields a new key.
+
+    Parameters
+    ----------
+    path:
+        Local file.
+    fields:
+        Options that affect the derived result.
+
+    Returns
+    -------
+    str
+        Hex key.
+    """
+    stat = path.stat()
+    payload = json.dumps(
+        {
+            "path": str(path.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "options": dict(fields),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranscriptCache:
+    """Persistent transcript cache bounded by size and age.
+
+    Entries are JSON files named by their key. Reads refresh an entry's
+    modification time, so size-based eviction drops the least recently
+    used entries first.
+
+    Parameters
+    ----------
+    root:
+        Directory holding cache entries.
+    max_bytes:
+        Total size budget; ``None`` disables size-based eviction.
+    ttl_s:
+        Maximum entry age in seconds since last use; ``None`` disables
+        expiry.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        ttl_s: float | None = DEFAULT_TTL_S,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Transcript | None:
+        """Return the cached transcript for ``key``, if present and fresh."""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        age_s = time.time() - stat.st_mtime
+        if self.ttl_s is not None and age_s > self.ttl_s:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            segments = SegmentTable()
+            for start, end, text in data["segments"]:
+                segments.append(float(start), float(end), str(text))
+            language = data.get("language")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)
+        return Transcript(
+            segments=segments,
+            language=language if isinstance(language, str) else None,
+        )
+
+    def put(
+        self,
+        key: str,
+        segments: SegmentTable | Iterable[TranscriptSegment],
+        language: str | None,
+    ) -> None:
+        """Store a transcript and enforce the cache budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "language": language,
+            "segments": [
+                list(row) for row in SegmentTable.coerce(segments).rows()
+            ],
+        }
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(path)
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to the size budget.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        removed = 0
+        now = time.time()
+        if self.ttl_s is not None:
+            fresh: list[tuple[float, int, Path]] = []
+            for entry in entries:
+                if now - entry[0] > self.ttl_s:
+                    entry[2].unlink(missing_ok=True)
+                    removed += 1
+                else:
+                    fresh.append(entry)
+            entries = fresh
+
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+
+        return removed
+
+
+def default_transcript_cache() -> TranscriptCache:
+    """Return a cache under :func:`default_cache_dir`.
+
+    The budget can be set with ``SCRIBEBOX_CACHE_MAX_MB`` and
+    ``SCRIBEBOX_CACHE_TTL_DAYS``.
+    """
+    max_bytes: int | None = DEFAULT_MAX_BYTES
+    raw_mb = os.environ.get("SCRIBEBOX_CACHE_MAX_MB", "").strip()
+    if raw_mb:
+        max_bytes = int(float(raw_mb) * 1024 * 1024)
+
+    ttl_s: float | None = DEFAULT_TTL_S
+    raw_days = os.environ.get("SCRIBEBOX_CACHE_TTL_DAYS", "").strip()
+    if raw_days:
+        ttl_s = float(raw_days) * 24 * 3600.0
+
+    return TranscriptCache(
+        default_cache_dir() / "transcripts",
+        max_bytes=max_bytes,
+        ttl_s=ttl_s,
+    )
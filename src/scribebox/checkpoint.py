@@ -0,0 +1,192 @@
+"""Segment checkpoints for resumable transcription."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import BinaryIO
+
+from .cache import source_key
+from .exceptions import ScribeboxError
+from .types import Segment, SegmentTable
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+
+
+class CheckpointBusyError(ScribeboxError):
+    """Raised when another run holds the checkpoint."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(f"Checkpoint is in use by another run: {path}")
+        self.path = path
+
+
+def checkpoint_path(outdir: Path, stem: str) -> Path:
+    """Return the sidecar checkpoint path for outputs named ``stem``."""
+    return outdir / f"{stem}{CHECKPOINT_SUFFIX}"
+
+
+def checkpoint_key(audio_path: Path, fields: Mapping[str, object]) -> str:
+    """Identify a source file and the options it is decoded with.
+
+    See :func:`scribebox.cache.source_key`: a checkpoint is only reused
+    for the same, unchanged input.
+    """
+    return source_key(audio_path, fields)
+
+
+class Checkpoint:
+    """Append-only JSON Lines sidecar of committed segments.
+
+    The first line records the format version and the
+    :func:`checkpoint_key` of the run; each following line is either a
+    ``[start_s, end_s, text]`` segment or a ``{"language": ...}`` record.
+    Every line is flushed as soon as it is written, so a killed worker
+    loses at most the segment being decoded. A torn last line is dropped
+    on load, and a checkpoint written for another source or other options
+    is discarded.
+
+    The sidecar is locked exclusively (``flock``) while it is open, so
+    two runs of the same source never write to it at once; the second
+    one gets :class:`CheckpointBusyError`. Platforms without ``fcntl``
+    do not lock.
+
+    Parameters
+    ----------
+    path:
+        Sidecar file.
+    key:
+        :func:`checkpoint_key` of the current run.
+
+    Raises
+    ------
+    CheckpointBusyError
+        If another run has the sidecar open.
+    """
+
+    def __init__(self, path: Path, *, key: str) -> None:
+        self.path = path
+        self.key = key
+        self.segments = SegmentTable()
+        self.language: str | None = None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: BinaryIO = _open_locked(path)
+        try:
+            valid_bytes = self._load()
+            self._fh.truncate(valid_bytes)
+            self._fh.seek(valid_bytes)
+            if not valid_bytes:
+                self._write({"version": CHECKPOINT_VERSION, "key": key})
+        except BaseException:
+            self._fh.close()
+            raise
+
+    def __enter__(self) -> Checkpoint:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def resume_s(self) -> float:
+        """End of the last committed segment, or 0 without any."""
+        return self.segments.ends[-1] if len(self.segments) else 0.0
+
+    def set_language(self, language: str | None) -> None:
+        """Record the language of the run, if not recorded yet."""
+        if language is None or language == self.language:
+            return
+        self.language = language
+        self._write({"language": language})
+
+    def append(self, segment: Segment) -> None:
+        """Commit one segment."""
+        self.segments.append(segment.start_s, segment.end_s, segment.text)
+        self._write([segment.start_s, segment.end_s, segment.text])
+
+    def close(self) -> None:
+        """Close the sidecar, keeping it for a later resume."""
+        if not self._fh.closed:
+            self._fh.close()
+
+    def discard(self) -> None:
+        """Close and delete the sidecar once the run is complete."""
+        if not self._fh.closed:
+            # Still locked, so no other run has it open.
+            self.path.unlink(missing_ok=True)
+        self.close()
+
+    def _write(self, record: object) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._fh.write(line.encode("utf-8"))
+        self._fh.flush()
+
+    def _load(self) -> int:
+        valid = 0
+        self._fh.seek(0)
+        for raw in self._fh:
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            if not raw.endswith(b"\n"):
+                break
+            if valid == 0:
+                if not (
+                    isinstance(record, dict)
+                    and record.get("version") == CHECKPOINT_VERSION
+                    and record.get("key") == self.key
+                ):
+                    return 0
+            elif isinstance(record, dict):
+                language = record.get("language")
+                if isinstance(language, str):
+                    self.language = language
+            elif isinstance(record, list) and len(record) == 3:
+                start, end, text = record
+                try:
+                    start, end = float(start), float(end)
+                except (TypeError, ValueError):
+                    break
+                self.segments.append(start, end, str(text))
+            else:
+                break
+            valid += len(raw)
+        return valid
+
+
+def _open_locked(path: Path) -> BinaryIO:
+    """Open (creating) and lock ``path`` without truncating it."""
+    while True:
+        fh = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        try:
+            _lock(fh, path)
+            # A run that finished in the meantime unlinked the file we
+            # locked; lock the current one instead.
+            current = path.stat()
+            opened = os.fstat(fh.fileno())
+            if (current.st_dev, current.st_ino) == (
+                opened.st_dev,
+                opened.st_ino,
+            ):
+                return fh
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            fh.close()
+            raise
+        fh.close()
+
+
+def _lock(fh: BinaryIO, path: Path) -> None:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        return
+    try:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError as exc:
+        raise CheckpointBusyError(path) from exc
@@ -1,18 +1,34 @@
-"""CLI entrypoint."""
+"""CLI entrypoint.
+
+Pipeline modules (and through them tqdm, ReportLab, NumPy and the model
+backends) are imported inside the commands that need them, so that
+``scribebox --help`` and argument errors stay fast.
+"""
 
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from tqdm import tqdm
-
-from .backends import ProgressCallback, TranscribeOptions
-from .core import run_transcription
 from .errors import ScribeboxError
-from .media import get_audio_duration_s
-from .youtube import download_youtube_audio
+from .exceptions import ScribeboxError as PipelineError
+
+if TYPE_CHECKING:
+    from .backends import ProgressCallback, TranscribeOptions
+    from .cache import TranscriptCache
+    from .refine import RefineStats
+
+
+def _formats_arg(value: str) -> tuple[str, ...]:
+    from .writers import parse_formats
+
+    try:
+        return tuple(fmt.value for fmt in parse_formats(value))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
 
 
 def _add_common_args(
@@ -34,12 +50,31 @@ def _add_common_args(
         default=False if with_defaults else argparse.SUPPRESS,
         help="Also export a PDF.",
     )
+    parser.add_argument(
+        "--formats",
+        type=_formats_arg,
+        default=() if with_defaults else argparse.SUPPRESS,
+        metavar="LIST",
+        help=(
+            "Comma-separated output formats: txt,srt,vtt,json,pdf. All are "
+            "written in one pass; TXT is always included."
+        ),
+    )
     parser.add_argument(
         "--language",
         type=str,
         default=None if with_defaults else argparse.SUPPRESS,
         help="Language code (e.g. en). Default: auto-detect.",
     )
+    parser.add_argument(
+        "--language-id",
+        action="store_true",
+        default=False if with_defaults else argparse.SUPPRESS,
+        help=(
+            "Without --language, identify the language from sampled speech "
+            "windows before decoding (always on with --parallel-chunks)."
+        ),
+    )
     parser.add_argument(
         "--translate",
         action="store_true",
@@ -52,6 +87,16 @@ def _add_common_args(
         default="large-v3" if with_defaults else argparse.SUPPRESS,
         help="Model name or path (default: large-v3).",
     )
+    parser.add_argument(
+        "--draft-model",
+        type=str,
+        default=None if with_defaults else argparse.SUPPRESS,
+        metavar="MODEL",
+        help=(
+            "Decode with this fast model first (e.g. small) and re-decode "
+            "only low-confidence regions with --model."
+        ),
+    )
     parser.add_argument(
         "--backend",
         choices=["faster-whisper", "whisper"],
@@ -67,14 +112,39 @@ def _add_common_args(
     parser.add_argument(
         "--compute-type",
         type=str,
-        default="int8" if with_defaults else argparse.SUPPRESS,
-        help="faster-whisper compute type (default: int8).",
+        default=None if with_defaults else argparse.SUPPRESS,
+        help=(
+            "faster-whisper compute type (default: tuning profile, else int8)."
+        ),
     )
     parser.add_argument(
         "--beam-size",
         type=int,
-        default=5 if with_defaults else argparse.SUPPRESS,
-        help="Beam size (default: 5).",
+        default=None if with_defaults else argparse.SUPPRESS,
+        help="Beam size (default: tuning profile, else 5).",
+    )
+    parser.add_argument(
+        "--cpu-threads",
+        type=int,
+        default=None if with_defaults else argparse.SUPPRESS,
+        metavar="N",
+        help="CPU threads per decode (default: tuning profile, else auto).",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=None if with_defaults else argparse.SUPPRESS,
+        metavar="N",
+        help=(
+            "Concurrent decodes per faster-whisper model "
+            "(default: tuning profile, else 1)."
+        ),
+    )
+    parser.add_argument(
+        "--no-tuning",
+        action="store_true",
+        default=False if with_defaults else argparse.SUPPRESS,
+        help="Ignore the tuning profile written by 'scribebox tune'.",
     )
     parser.add_argument(
         "--no-vad",
@@ -88,6 +158,41 @@ def _add_common_args(
         default=None if with_defaults else argparse.SUPPRESS,
         help="Optional prompt/glossary file.",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None if with_defaults else argparse.SUPPRESS,
+        metavar="N",
+        help=(
+            "Decode N windows at once with faster-whisper's batched "
+            "pipeline (default: sequential)."
+        ),
+    )
+    parser.add_argument(
+        "--parallel-chunks",
+        type=int,
+        default=1 if with_defaults else argparse.SUPPRESS,
+        metavar="N",
+        help=(
+            "Split long audio at silences and decode N chunks in parallel "
+            "processes (default: 1, sequential)."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None if with_defaults else argparse.SUPPRESS,
+        help=(
+            "Transcript cache directory "
+            "(default: ~/.cache/scribebox/transcripts)."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False if with_defaults else argparse.SUPPRESS,
+        help="Do not read or write the transcript and download caches.",
+    )
     parser.add_argument(
         "--no-progress",
         action="store_true",
@@ -122,6 +227,268 @@ def build_parser() -> argparse.ArgumentParser:
                              parents=[common_sub])
     p_file.add_argument("path", type=Path)
 
+    p_batch = subs.add_parser(
+        "batch",
+        help="Transcribe a directory or a list of files with one model.",
+        parents=[common_sub],
+    )
+    p_batch.add_argument(
+        "source",
+        type=Path,
+        help=(
+            "Directory of media files, a text file with one path per line, "
+            "or a manifest JSON from a previous run."
+        ),
+    )
+    p_batch.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of inputs decoded at the same time (default: 1).",
+    )
+    p_batch.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help=(
+            "Manifest recording per-item status "
+            "(default: <outdir>/batch-manifest.json)."
+        ),
+    )
+
+    p_lang = subs.add_parser(
+        "detect-language",
+        help="Identify the spoken language of files without transcribing.",
+        parents=[common_sub],
+    )
+    p_lang.add_argument(
+        "paths",
+        type=Path,
+        nargs="+",
+        help="Media files or directories (scanned recursively).",
+    )
+    p_lang.add_argument(
+        "--windows",
+        type=int,
+        default=3,
+        help="Speech windows sampled per file (default: 3).",
+    )
+    p_lang.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON object per file instead of a table.",
+    )
+
+    p_tune = subs.add_parser(
+        "tune",
+        help=(
+            "Benchmark compute settings on this host and save the fastest "
+            "as the tuning profile."
+        ),
+        parents=[common_sub],
+    )
+    p_tune.add_argument(
+        "path",
+        type=Path,
+        help="Media file with representative speech to calibrate on.",
+    )
+    p_tune.add_argument(
+        "--calibration-s",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Length of the calibration clip (default: 60).",
+    )
+    p_tune.add_argument(
+        "--compute-types",
+        type=str,
+        default=None,
+        metavar="LIST",
+        help="Comma-separated compute types (default: by device).",
+    )
+    p_tune.add_argument(
+        "--threads",
+        type=str,
+        default=None,
+        metavar="LIST",
+        help="Comma-separated CPU thread counts (default: powers of two).",
+    )
+    p_tune.add_argument(
+        "--beam-sizes",
+        type=str,
+        default="1,5",
+        metavar="LIST",
+        help="Comma-separated beam sizes (default: 1,5).",
+    )
+    p_tune.add_argument(
+        "--max-wer",
+        type=float,
+        default=0.05,
+        help=(
+            "Allowed word error rate against the most precise setting "
+            "(default: 0.05)."
+        ),
+    )
+    p_tune.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Reject settings whose peak memory exceeds this budget.",
+    )
+    p_tune.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help=(
+            "Profile file to write (default: $SCRIBEBOX_TUNING_PROFILE or "
+            "~/.cache/scribebox/tuning.json, which are loaded automatically)."
+        ),
+    )
+
+    p_worker = subs.add_parser(
+        "worker",
+        help="Run jobs from a shared job store (see the web app's /jobs).",
+    )
+    p_worker.add_argument(
+        "--store",
+        type=str,
+        default=None,
+        help=(
+            "Job store: a shared directory, or scheme://location for a "
+            "registered backend (default: $SCRIBEBOX_JOB_STORE)."
+        ),
+    )
+    p_worker.add_argument(
+        "--lease-s",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help=(
+            "Lease per claimed job, renewed while it runs; a job is handed "
+            "to another worker if it expires (default: 60)."
+        ),
+    )
+    p_worker.add_argument(
+        "--poll-s",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="Wait between polls of an empty queue (default: 2).",
+    )
+    p_worker.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Exit after running N jobs.",
+    )
+    p_worker.add_argument(
+        "--exit-when-idle",
+        action="store_true",
+        help="Exit once the queue is empty instead of waiting for jobs.",
+    )
+
+    p_live = subs.add_parser(
+        "live",
+        help="Transcribe live audio from stdin, a device or a stream URL.",
+        parents=[common_sub],
+    )
+    p_live.add_argument(
+        "source",
+        type=str,
+        help=(
+            "'-' for stdin, a stream URL (http, rtmp, srt, udp, ...), or a "
+            "capture device with --input-format."
+        ),
+    )
+    p_live.add_argument(
+        "--input-format",
+        type=str,
+        default=None,
+        metavar="FMT",
+        help=(
+            "ffmpeg input format, e.g. alsa, pulse, avfoundation or dshow "
+            "for devices, s16le for raw PCM on stdin."
+        ),
+    )
+    p_live.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Read the input at its native rate (replay a file as live).",
+    )
+    p_live.add_argument(
+        "--step-s",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Decode again after this much new audio (default: 1).",
+    )
+    p_live.add_argument(
+        "--max-window-s",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help=(
+            "Longest decode window; older audio is committed without "
+            "waiting for agreement, which bounds latency (default: 30)."
+        ),
+    )
+    p_live.add_argument(
+        "--name",
+        type=str,
+        default="live",
+        help="File name stem of the outputs (default: live).",
+    )
+
+    p_bench = subs.add_parser(
+        "bench",
+        help="Benchmark the pipeline on synthetic audio.",
+    )
+    p_bench.add_argument(
+        "--durations",
+        type=str,
+        default="60,600",
+        help="Comma-separated audio lengths in seconds (default: 60,600).",
+    )
+    p_bench.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Repetitions per measurement; the best is kept (default: 3).",
+    )
+    p_bench.add_argument(
+        "--real-model",
+        type=str,
+        default=None,
+        metavar="MODEL",
+        help="Use a real model (e.g. tiny) instead of the fake transcriber.",
+    )
+    p_bench.add_argument(
+        "--no-pdf",
+        action="store_true",
+        help="Skip the PDF stage.",
+    )
+    p_bench.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write results as JSON to this file.",
+    )
+    p_bench.add_argument(
+        "--compare",
+        type=Path,
+        default=None,
+        metavar="BASELINE",
+        help="Compare against a previous JSON result; exit 1 on regression.",
+    )
+    p_bench.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative slowdown when comparing (default: 0.10).",
+    )
+
     return parser
 
 
@@ -132,6 +499,8 @@ def _make_progress_cb(
 ) -> tuple[ProgressCallback | None, callable | None]:
     if not enabled or not sys.stderr.isatty():
         return None, None
+    from tqdm import tqdm
+
     if total_s is None:
         bar = tqdm(total=None, unit="s", dynamic_ncols=True)
         last = 0.0
@@ -161,63 +530,581 @@ def main(argv: list[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.command == "bench":
+        _run_bench_command(
+            args,
+            backend=str(getattr(args, "backend", "faster-whisper")),
+        )
+        return
+
+    if args.command == "worker":
+        _run_worker_command(args)
+        return
+
+    from .backends import TranscribeOptions
+    from .cache import TranscriptCache, default_transcript_cache
+    from .core import run_transcription
+    from .media import get_audio_duration_s
+    from .metrics import collect_stages
+    from .youtube import default_youtube_cache, download_youtube_audio
+
     prompt: str | None = None
     if getattr(args, "prompt_file", None) is not None:
         prompt_file: Path = args.prompt_file
         prompt = prompt_file.read_text(encoding="utf-8").strip() or None
 
+    backend = str(getattr(args, "backend", "faster-whisper"))
     options = TranscribeOptions(
         model=getattr(args, "model", "large-v3"),
         language=getattr(args, "language", None),
         translate=bool(getattr(args, "translate", False)),
         device=getattr(args, "device", "cpu"),
-        compute_type=getattr(args, "compute_type", "int8"),
         vad_filter=not bool(getattr(args, "no_vad", False)),
-        beam_size=int(getattr(args, "beam_size", 5)),
         initial_prompt=prompt,
+        batch_size=getattr(args, "batch_size", None),
+        draft_model=getattr(args, "draft_model", None),
     )
 
+    if args.command == "tune":
+        _run_tune_command(args, backend=backend, options=options)
+        return
+
+    options = _tuned_options(args, backend=backend, options=options)
+
     outdir = Path(getattr(args, "outdir", Path("out")))
     pdf = bool(getattr(args, "pdf", False))
-    backend = str(getattr(args, "backend", "faster-whisper"))
+    formats: tuple[str, ...] = tuple(getattr(args, "formats", ()))
     progress_enabled = not bool(getattr(args, "no_progress", False))
+    parallel_chunks = int(getattr(args, "parallel_chunks", 1))
 
-    try:
-        if args.command == "url":
-            audio_path = download_youtube_audio(
-                url=args.youtube_url,
-                outdir=outdir,
+    if args.command == "live":
+        _run_live_command(
+            args,
+            outdir=outdir,
+            pdf=pdf,
+            formats=formats,
+            backend=backend,
+            options=options,
+        )
+        return
+
+    cache: TranscriptCache | None = None
+    if not bool(getattr(args, "no_cache", False)):
+        cache_dir = getattr(args, "cache_dir", None)
+        cache = (
+            default_transcript_cache()
+            if cache_dir is None
+            else TranscriptCache(Path(cache_dir))
+        )
+
+    if args.command == "detect-language":
+        _run_detect_language_command(
+            args,
+            backend=backend,
+            options=options,
+            use_cache=cache is not None,
+        )
+        return
+
+    if args.command == "batch":
+        _run_batch_command(
+            args,
+            outdir=outdir,
+            pdf=pdf,
+            formats=formats,
+            backend=backend,
+            options=options,
+            cache=cache,
+            progress_enabled=progress_enabled,
+        )
+        return
+
+    # Collect the download and probe into the same run as decoding.
+    with collect_stages():
+        try:
+            if args.command == "url":
+                audio_path = download_youtube_audio(
+                    url=args.youtube_url,
+                    outdir=outdir,
+                    cache=None if cache is None else default_youtube_cache(),
+                )
+                title = args.youtube_url
+            else:
+                audio_path = args.path
+                title = audio_path.name
+
+            total_s = get_audio_duration_s(audio_path)
+            progress_cb, progress_close = _make_progress_cb(
+                total_s=total_s,
+                enabled=progress_enabled,
             )
-            title = args.youtube_url
-        else:
-            audio_path = args.path
-            title = audio_path.name
 
-        total_s = get_audio_duration_s(audio_path)
-        progress_cb, progress_close = _make_progress_cb(
-            total_s=total_s,
-            enabled=progress_enabled,
+            try:
+                result = run_transcription(
+                    audio_path=audio_path,
+                    outdir=outdir,
+                    pdf=pdf,
+                    backend=backend,
+                    options=options,
+                    title=title,
+                    progress_cb=progress_cb,
+                    parallel_chunks=parallel_chunks,
+                    audio_duration_s=total_s,
+                    cache=cache,
+                    formats=formats,
+                    language_id=bool(getattr(args, "language_id", False)),
+                )
+            finally:
+                if progress_close is not None:
+                    progress_close()
+
+        except (ScribeboxError, PipelineError) as exc:
+            raise SystemExit(str(exc)) from exc
+
+    for fmt, path in result.outputs.items():
+        print(f"{fmt.upper()}: {path}")
+    if result.detected_language is not None:
+        print(f"Detected language: {result.detected_language}")
+    if result.cache_hit:
+        print("Cache: hit (decoding skipped)")
+    if result.language_id is not None:
+        guess = result.language_id
+        print(
+            f"Language ID: {guess.language} (p={guess.probability:.2f} over "
+            f"{guess.windows} windows)"
+        )
+    if result.resumed_from_s is not None:
+        print(f"Resumed from checkpoint at {result.resumed_from_s:.1f}s")
+    rtf = result.real_time_factor
+    if rtf is not None:
+        print(
+            f"Real-time factor: {rtf:.3f} "
+            f"({result.audio_duration_s:.1f}s audio in "
+            f"{result.elapsed_s:.1f}s)"
+        )
+    if result.vad_skipped_fraction is not None:
+        print(
+            f"VAD: skipped {result.vad_skipped_fraction:.1%} of the audio "
+            "as non-speech"
+        )
+    if result.refine is not None:
+        print(_refine_summary(result.refine))
+    if result.stage_timings:
+        print(
+            "Stages: "
+            + "  ".join(
+                f"{stage}={seconds:.2f}s"
+                for stage, seconds in result.stage_timings.items()
+            )
+        )
+
+
+def _refine_summary(stats: RefineStats) -> str:
+    fraction = stats.redecoded_fraction or 0.0
+    text = (
+        f"Refine: re-decoded {fraction:.1%} of the audio in "
+        f"{stats.regions} region(s); draft {stats.draft_s:.1f}s, "
+        f"refine {stats.refine_s:.1f}s"
+    )
+    bound = stats.speedup_upper_bound
+    if bound is not None:
+        text += f"; at most {bound:.2f}x faster than --model alone"
+    return text
+
+
+def _run_batch_command(
+    args: argparse.Namespace,
+    *,
+    outdir: Path,
+    pdf: bool,
+    formats: tuple[str, ...],
+    backend: str,
+    options: TranscribeOptions,
+    cache: TranscriptCache | None,
+    progress_enabled: bool,
+) -> None:
+    from .batch import (
+        MANIFEST_NAME,
+        BatchItem,
+        BatchManifest,
+        collect_inputs,
+        run_batch,
+    )
+
+    source: Path = args.source
+    if not source.exists():
+        raise SystemExit(f"Batch source does not exist: {source}")
+
+    manifest_path: Path = args.manifest or outdir / MANIFEST_NAME
+    if source.suffix.lower() == ".json" and args.manifest is None:
+        manifest_path = source
+    manifest = BatchManifest.load(manifest_path)
+    pairs = collect_inputs(source, outdir)
+
+    bar = None
+    if progress_enabled and sys.stderr.isatty():
+        from tqdm import tqdm
+
+        bar = tqdm(total=len(pairs), unit="file", dynamic_ncols=True)
+
+    def on_item(item: BatchItem) -> None:
+        if bar is not None:
+            bar.update(1)
+
+    try:
+        summary = run_batch(
+            pairs,
+            manifest=manifest,
+            backend=backend,
+            options=options,
+            pdf=pdf,
+            formats=formats,
+            concurrency=max(1, int(args.concurrency)),
+            cache=cache,
+            on_item=on_item,
+        )
+    finally:
+        if bar is not None:
+            bar.close()
+
+    print(f"Manifest: {manifest.path}")
+    print(
+        f"Processed: {summary.processed}  Skipped (up to date): "
+        f"{summary.skipped}  Failed: {len(summary.failures)}"
+    )
+    print(
+        f"Audio: {summary.audio_s / 3600.0:.2f} h in "
+        f"{summary.wall_s / 3600.0:.2f} h wall-clock"
+    )
+    if summary.throughput is not None:
+        print(
+            f"Throughput: {summary.throughput:.2f} audio hours per "
+            "wall-clock hour"
         )
+    for input_path, error in summary.failures:
+        print(f"FAILED {input_path}: {error}", file=sys.stderr)
+    if summary.failures:
+        raise SystemExit(1)
+
+
+def _run_detect_language_command(
+    args: argparse.Namespace,
+    *,
+    backend: str,
+    options: TranscribeOptions,
+    use_cache: bool,
+) -> None:
+    import json
+
+    from .batch import collect_inputs
+    from .langid import default_language_cache, identify_language
+
+    paths: list[Path] = []
+    for source in args.paths:
+        if source.is_dir():
+            paths.extend(path for path, _ in collect_inputs(source, source))
+        else:
+            paths.append(source)
 
+    cache = default_language_cache() if use_cache else None
+    failed = False
+    for path in paths:
         try:
-            result = run_transcription(
-                audio_path=audio_path,
-                outdir=outdir,
-                pdf=pdf,
+            guess = identify_language(
+                path,
                 backend=backend,
                 options=options,
-                title=title,
-                progress_cb=progress_cb,
+                windows=max(1, int(args.windows)),
+                cache=cache,
             )
-        finally:
-            if progress_close is not None:
-                progress_close()
+        except (ScribeboxError, PipelineError, OSError) as exc:
+            print(f"FAILED {path}: {exc}", file=sys.stderr)
+            failed = True
+            continue
+        if args.json:
+            data: dict[str, object] = {"path": str(path)}
+            data.update(guess.to_dict() if guess else {"language": None})
+            print(json.dumps(data))
+        elif guess is None:
+            print(f"-\t-\t{path}")
+        else:
+            print(f"{guess.language}\t{guess.probability:.2f}\t{path}")
+    if failed:
+        raise SystemExit(1)
+
+
+def _tuned_options(
+    args: argparse.Namespace,
+    *,
+    backend: str,
+    options: TranscribeOptions,
+) -> TranscribeOptions:
+    """Apply the tuning profile, then any explicit compute flags."""
+    from dataclasses import replace
 
-    except ScribeboxError as exc:
+    from .tuning import load_profile
+
+    if not bool(getattr(args, "no_tuning", False)):
+        profile = load_profile(
+            backend=backend,
+            model=options.model,
+            device=options.device,
+        )
+        if profile is not None:
+            options = profile.apply(options)
+
+    explicit = {
+        "compute_type": getattr(args, "compute_type", None),
+        "beam_size": getattr(args, "beam_size", None),
+        "cpu_threads": getattr(args, "cpu_threads", None),
+        "num_workers": getattr(args, "num_workers", None),
+    }
+    given = {k: v for k, v in explicit.items() if v is not None}
+    return replace(options, **given)
+
+
+def _int_list(value: str | None, flag: str) -> tuple[int, ...] | None:
+    if value is None:
+        return None
+    try:
+        return tuple(int(v) for v in value.split(",") if v.strip())
+    except ValueError as exc:
+        raise SystemExit(f"Invalid {flag}: {value}") from exc
+
+
+def _run_tune_command(
+    args: argparse.Namespace,
+    *,
+    backend: str,
+    options: TranscribeOptions,
+) -> None:
+    from .tuning import TuningTrial, save_profile, tune
+
+    compute_types = None
+    if args.compute_types is not None:
+        compute_types = tuple(
+            v.strip() for v in args.compute_types.split(",") if v.strip()
+        )
+    max_rss = (
+        None
+        if args.max_memory_mb is None
+        else int(args.max_memory_mb * 1024 * 1024)
+    )
+
+    def report(trial: TuningTrial) -> None:
+        setting = (
+            f"compute_type={trial.compute_type:<13} "
+            f"threads={trial.cpu_threads:<3} beam={trial.beam_size:<2}"
+        )
+        if trial.error is not None:
+            print(f"{setting} FAILED: {trial.error}")
+            return
+        rss = trial.peak_rss_bytes
+        rss_text = "n/a" if rss is None else f"{rss / (1024 * 1024):.0f} MiB"
+        print(
+            f"{setting} rtf={trial.real_time_factor:.3f} "
+            f"wer={trial.word_error_rate or 0.0:.3f} peak_rss={rss_text}"
+        )
+
+    try:
+        profile, _ = tune(
+            args.path,
+            backend=backend,
+            options=options,
+            compute_types=compute_types,
+            thread_counts=_int_list(args.threads, "--threads"),
+            beam_sizes=_int_list(args.beam_sizes, "--beam-sizes") or (5,),
+            num_workers=max(1, int(getattr(args, "num_workers", None) or 1)),
+            calibration_s=args.calibration_s,
+            max_word_error_rate=args.max_wer,
+            max_rss_bytes=max_rss,
+            on_trial=report,
+        )
+    except (ScribeboxError, PipelineError, ImportError) as exc:
         raise SystemExit(str(exc)) from exc
 
-    print(f"TXT: {result.text_path}")
-    if result.pdf_path is not None:
-        print(f"PDF: {result.pdf_path}")
-    if result.detected_language is not None:
-        print(f"Detected language: {result.detected_language}")
+    if profile is None:
+        raise SystemExit("No setting ran within the accuracy/memory budget.")
+    path = save_profile(profile, args.profile)
+    print(
+        f"Selected: compute_type={profile.compute_type} "
+        f"cpu_threads={profile.cpu_threads} beam_size={profile.beam_size} "
+        f"(rtf {profile.real_time_factor:.3f})"
+    )
+    print(f"Profile: {path}")
+
+
+def _run_live_command(
+    args: argparse.Namespace,
+    *,
+    outdir: Path,
+    pdf: bool,
+    formats: tuple[str, ...],
+    backend: str,
+    options: TranscribeOptions,
+) -> None:
+    from .ffmpeg import PcmStream
+    from .live import run_live, window_decoder
+    from .types import TranscriptSegment
+    from .writers import OutputWriter, format_timestamp, parse_formats
+
+    def show(segment: TranscriptSegment, latency: float | None) -> None:
+        writer.write(segment)
+        writer.flush()
+        lag = "" if latency is None else f" (+{latency:.1f}s)"
+        print(
+            f"[{format_timestamp(segment.start_s, decimal='.')} --> "
+            f"{format_timestamp(segment.end_s, decimal='.')}]{lag} "
+            f"{segment.text}",
+            flush=True,
+        )
+
+    try:
+        with (
+            PcmStream(
+                args.source,
+                input_format=args.input_format,
+                realtime=args.realtime,
+            ) as source,
+            OutputWriter(
+                outdir,
+                args.name,
+                parse_formats(formats, pdf=pdf),
+                title=args.source,
+            ) as writer,
+        ):
+            stats = run_live(
+                source.chunks(),
+                decode=window_decoder(backend=backend, options=options),
+                on_segment=show,
+                language=options.language,
+                step_s=args.step_s,
+                max_window_s=args.max_window_s,
+            )
+            writer.close(language=stats.language)
+    except (ScribeboxError, PipelineError) as exc:
+        raise SystemExit(str(exc)) from exc
+
+    for fmt, path in writer.paths.items():
+        print(f"{fmt.upper()}: {path}", file=sys.stderr)
+    latency = stats.latency
+    if latency.count:
+        print(
+            f"Latency: mean {latency.mean_s:.2f}s, "
+            f"p50 {latency.percentile(50):.2f}s, "
+            f"p95 {latency.percentile(95):.2f}s, "
+            f"max {latency.max_s:.2f}s over {latency.count} segment(s)",
+            file=sys.stderr,
+        )
+    rtf = stats.real_time_factor
+    if rtf is not None:
+        print(
+            f"Real-time factor: {rtf:.3f} ({stats.audio_s:.1f}s audio, "
+            f"{stats.decodes} decode(s))",
+            file=sys.stderr,
+        )
+
+
+def _run_worker_command(args: argparse.Namespace) -> None:
+    from .jobstore import ClaimedJob, open_job_store
+    from .worker import run_worker, worker_id
+
+    location = args.store or os.environ.get("SCRIBEBOX_JOB_STORE", "")
+    if not location.strip():
+        raise SystemExit("Set --store or SCRIBEBOX_JOB_STORE.")
+    try:
+        store = open_job_store(location.strip())
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    worker = worker_id()
+
+    def report(claimed: ClaimedJob, message: str) -> None:
+        title = claimed.spec.title or claimed.id
+        print(f"[{worker}] {claimed.id} {title}: {message}", flush=True)
+
+    print(f"[{worker}] Waiting for jobs in {location}", flush=True)
+    try:
+        ran = run_worker(
+            store,
+            worker=worker,
+            lease_s=args.lease_s,
+            poll_s=args.poll_s,
+            max_jobs=args.max_jobs,
+            exit_when_idle=args.exit_when_idle,
+            on_event=report,
+        )
+    except KeyboardInterrupt:
+        # Jobs in flight are retried by another worker once their lease
+        # expires.
+        raise SystemExit(130) from None
+    print(f"[{worker}] Ran {ran} job(s).")
+
+
+def _run_bench_command(args: argparse.Namespace, *, backend: str) -> None:
+    from .bench import compare_results, load_results, run_bench, save_results
+    from .config import TranscribeOptions as PipelineOptions
+    from .transcribe.base import Transcriber
+
+    try:
+        durations = [float(v) for v in args.durations.split(",") if v]
+    except ValueError as exc:
+        raise SystemExit(f"Invalid --durations: {args.durations}") from exc
+
+    transcriber: Transcriber | None = None
+    options = PipelineOptions(language="en")
+    label = "fake"
+    if args.real_model:
+        from .transcribe.factory import build_transcriber
+
+        try:
+            transcriber = build_transcriber(backend)
+        except PipelineError as exc:
+            raise SystemExit(str(exc)) from exc
+        options = PipelineOptions(language="en", model=args.real_model)
+        label = f"{backend}:{args.real_model}"
+
+    try:
+        runs = run_bench(
+            durations_s=durations,
+            transcriber=transcriber,
+            options=options,
+            pdf=not args.no_pdf,
+            repeat=args.repeat,
+        )
+    except PipelineError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    for run in runs:
+        stages = "  ".join(
+            f"{name}={secs:.3f}s" for name, secs in run.stages.items()
+        )
+        rss = run.peak_rss_bytes
+        rss_text = "n/a" if rss is None else f"{rss / (1024 * 1024):.0f} MiB"
+        print(f"audio={run.audio_s:.0f}s  {stages}")
+        print(
+            f"  pipeline={run.pipeline_s:.3f}s  "
+            f"rtf={run.real_time_factor:.4f}  "
+            f"throughput={run.throughput:.1f}x  peak_rss={rss_text}"
+        )
+
+    if args.output is not None:
+        save_results(args.output, runs, transcriber=label)
+        print(f"Results: {args.output}")
+
+    if args.compare is not None:
+        regressions = compare_results(
+            load_results(args.compare),
+            runs,
+            threshold=args.threshold,
+        )
+        for reg in regressions:
+            print(
+                f"REGRESSION audio={reg.audio_s:.0f}s {reg.metric}: "
+                f"{reg.baseline_s:.3f}s -> {reg.current_s:.3f}s "
+                f"(x{reg.ratio:.2f})",
+                file=sys.stderr,
+            )
+        if regressions:
+            raise SystemExit(1)
+        print("No regressions.")
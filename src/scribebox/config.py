@@ -21,12 +21,17 @@ class TranscribeOptions:
         Model identifier to pass to the transcriber implementation.
     device:
         Device hint for the transcriber (e.g., ``"cpu"``, ``"cuda"``).
+    vad:
+        If ``True`` (the default), detect speech before transcribing and
+        pass only the speech regions to the transcriber, whatever its
+        backend.
     """
 
     language: str | None = None
     translate_to_english: bool = False
     model: str = "base"
     device: str = "cpu"
+    vad: bool = True
 
 
 @dataclass(frozen=True, slots=True)
@@ -39,7 +44,16 @@ class OutputOptions:
         Directory where outputs will be written.
     write_pdf:
         If ``True``, also write a PDF.
+    keep_wav:
+        If ``True``, write the normalized 16kHz WAV next to the outputs and
+        transcribe from it. By default audio is decoded in memory and no
+        WAV is written.
+    formats:
+        Additional output formats (``srt``, ``vtt``, ``json``, ``pdf``);
+        the TXT transcript is always written.
     """
 
     outdir: Path
     write_pdf: bool = False
+    keep_wav: bool = False
+    formats: tuple[str, ...] = ()
@@ -2,21 +2,134 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from typing import Any
 
 import scribebox.backends as backends
 from scribebox.backends import ProgressCallback, TranscribeOptions
-from scribebox.pdf import write_pdf
+from scribebox.cache import TranscriptCache, hash_file, transcript_cache_key
+from scribebox.checkpoint import (
+    Checkpoint,
+    CheckpointBusyError,
+    checkpoint_key,
+    checkpoint_path,
+)
+from scribebox.exceptions import RunCancelledError
+from scribebox.langid import (
+    LanguageGuess,
+    default_language_cache,
+    identify_language,
+)
+from scribebox.media import get_audio_duration_s
+from scribebox.metrics import (
+    CACHE_LOOKUPS,
+    collect_stages,
+    observe_run,
+    timed_iter,
+    timed_stage,
+)
+from scribebox.refine import RefineStats
+from scribebox.types import SegmentTable
+from scribebox.writers import OutputFormat, OutputWriter, parse_formats
+
+# Buffered outputs are flushed at most this often while decoding, so
+# partial transcripts show up without a write per segment.
+FLUSH_INTERVAL_S = 1.0
 
 
 @dataclass(frozen=True, slots=True)
 class RunResult:
-    """Result of a run."""
+    """Result of a run.
+
+    ``stage_timings`` maps pipeline stages (``download``, ``probe``,
+    ``model_load``, ``transcribe``, ``write_pdf``, ...) to seconds and
+    ``outputs`` maps every written format to its path.
+    ``resumed_from_s`` is set when decoding resumed from a checkpoint,
+    ``language_id`` when the language was identified before decoding and
+    ``refine`` when a draft model decoded first (see
+    :mod:`scribebox.refine`).
+    """
 
     text_path: Path
     pdf_path: Path | None
     detected_language: str | None
+    audio_duration_s: float | None = None
+    elapsed_s: float | None = None
+    cache_hit: bool = False
+    stage_timings: dict[str, float] = field(default_factory=dict)
+    vad_skipped_fraction: float | None = None
+    outputs: dict[OutputFormat, Path] = field(default_factory=dict)
+    resumed_from_s: float | None = None
+    language_id: LanguageGuess | None = None
+    refine: RefineStats | None = None
+
+    def __post_init__(self) -> None:
+        if self.outputs:
+            return
+        outputs = {OutputFormat.TXT: self.text_path}
+        if self.pdf_path is not None:
+            outputs[OutputFormat.PDF] = self.pdf_path
+        object.__setattr__(self, "outputs", outputs)
+
+    @property
+    def real_time_factor(self) -> float | None:
+        """Processing time divided by audio duration (lower is faster)."""
+        if not self.audio_duration_s or self.elapsed_s is None:
+            return None
+        return self.elapsed_s / self.audio_duration_s
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view (see :meth:`from_dict`)."""
+        return {
+            "text_path": str(self.text_path),
+            "pdf_path": None if self.pdf_path is None else str(self.pdf_path),
+            "detected_language": self.detected_language,
+            "audio_duration_s": self.audio_duration_s,
+            "elapsed_s": self.elapsed_s,
+            "cache_hit": self.cache_hit,
+            "stage_timings": dict(self.stage_timings),
+            "vad_skipped_fraction": self.vad_skipped_fraction,
+            "outputs": {
+                str(fmt): str(path) for fmt, path in self.outputs.items()
+            },
+            "resumed_from_s": self.resumed_from_s,
+            "language_id": (
+                None
+                if self.language_id is None
+                else self.language_id.to_dict()
+            ),
+            "refine": None if self.refine is None else self.refine.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RunResult:
+        """Rebuild a result written by :meth:`to_dict`."""
+        pdf_path = data.get("pdf_path")
+        language_id = data.get("language_id")
+        refine = data.get("refine")
+        return cls(
+            text_path=Path(data["text_path"]),
+            pdf_path=None if pdf_path is None else Path(pdf_path),
+            detected_language=data.get("detected_language"),
+            audio_duration_s=data.get("audio_duration_s"),
+            elapsed_s=data.get("elapsed_s"),
+            cache_hit=bool(data.get("cache_hit", False)),
+            stage_timings=dict(data.get("stage_timings") or {}),
+            vad_skipped_fraction=data.get("vad_skipped_fraction"),
+            outputs={
+                OutputFormat(fmt): Path(path)
+                for fmt, path in (data.get("outputs") or {}).items()
+            },
+            resumed_from_s=data.get("resumed_from_s"),
+            language_id=(
+                None if language_id is None else LanguageGuess(**language_id)
+            ),
+            refine=None if refine is None else RefineStats.from_dict(refine),
+        )
 
 
 def run_transcription(
@@ -28,27 +141,227 @@ def run_transcription(
     options: TranscribeOptions,
     title: str | None = None,
     progress_cb: ProgressCallback | None = None,
+    parallel_chunks: int = 1,
+    audio_duration_s: float | None = None,
+    cache: TranscriptCache | None = None,
+    formats: Iterable[str] = (),
+    checkpoint: bool = True,
+    checkpoint_dir: Path | None = None,
+    language_id: bool = False,
+    cancel: threading.Event | None = None,
 ) -> RunResult:
-    """Transcribe an audio file and write TXT/PDF outputs."""
+    """Transcribe an audio file and write TXT plus the requested outputs.
+
+    Segments are streamed from the backend and handed to every output
+    writer (TXT, SRT, VTT, JSON, PDF) as they are decoded, so all formats
+    are produced in one pass. With ``parallel_chunks > 1`` the audio is split
+    at silences and the chunks are decoded concurrently in that many
+    worker processes.
+
+    When a ``cache`` is given, the transcript is looked up by a hash of the
+    input bytes and the decode options; a hit skips decoding entirely.
+
+    With ``checkpoint`` (the default), sequential runs commit every
+    segment to a ``<stem>.checkpoint.jsonl`` sidecar in ``outdir``. If a
+    run is interrupted, re-running the same input with the same options
+    rebuilds the outputs from the committed segments and resumes decoding
+    at the end of the last one. The sidecar is removed on success. Pass
+    ``checkpoint_dir`` to keep sidecars in a shared directory, named by
+    the run instead of the output stem (e.g. for per-request output
+    directories); with a ``cache`` the run is identified by content, so
+    a re-uploaded file resumes too.
+
+    Without a forced language, ``language_id`` (always on with
+    ``parallel_chunks > 1``) identifies the language once from a few
+    sampled speech windows and decodes with it fixed, instead of letting
+    the backend detect it from the opening seconds (or once per chunk).
+
+    Once ``cancel`` is set, the run stops before writing the next segment
+    and raises :class:`~scribebox.exceptions.RunCancelledError`, keeping
+    its checkpoint.
+    """
     outdir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    wanted = parse_formats(formats, pdf=pdf)
 
-    transcript = backends.transcribe_file(
-        audio_path=audio_path,
-        backend=backend,
-        options=options,
-        progress_cb=progress_cb,
-    )
+    with collect_stages() as timer:
+        cache_key: str | None = None
+        cached = None
+        sidecar: Checkpoint | None = None
+        resumed = SegmentTable()
+        if cache is not None:
+            with timed_stage("cache_lookup"):
+                cache_key = transcript_cache_key(
+                    hash_file(audio_path),
+                    _cache_fields(backend, options),
+                )
+                cached = cache.get(cache_key)
+            CACHE_LOOKUPS.inc(
+                cache="transcript",
+                result="miss" if cached is None else "hit",
+            )
+
+        if cached is None and audio_duration_s is None:
+            # Probed once here; later stages reuse the cached result.
+            audio_duration_s = get_audio_duration_s(audio_path)
+
+        guess: LanguageGuess | None = None
+        if (
+            cached is None
+            and options.language is None
+            and (language_id or parallel_chunks > 1)
+        ):
+            guess = identify_language(
+                audio_path,
+                backend=backend,
+                options=options,
+                cache=None if cache is None else default_language_cache(),
+            )
+            if guess is not None and guess.confident:
+                options = replace(options, language=guess.language)
+
+        if cached is not None:
+            stream = backends.SegmentStream(
+                cached.segments,
+                language=cached.language,
+            )
+        elif parallel_chunks > 1:
+            from scribebox.parallel import transcribe_parallel
+
+            with timed_stage("transcribe"):
+                transcript, audio_duration_s = transcribe_parallel(
+                    audio_path=audio_path,
+                    backend=backend,
+                    options=options,
+                    workers=parallel_chunks,
+                    progress_cb=progress_cb,
+                )
+            stream = backends.SegmentStream(
+                transcript.segments,
+                language=transcript.language,
+            )
+        else:
+            if checkpoint:
+                key = cache_key or checkpoint_key(
+                    audio_path,
+                    _cache_fields(backend, options),
+                )
+                try:
+                    sidecar = Checkpoint(
+                        checkpoint_path(checkpoint_dir, key)
+                        if checkpoint_dir is not None
+                        else checkpoint_path(outdir, audio_path.stem),
+                        key=key,
+                    )
+                except CheckpointBusyError:
+                    # Another run of the same source owns the checkpoint;
+                    # decode from the start without one.
+                    sidecar = None
+            if sidecar is not None:
+                resumed = sidecar.segments[:]
+                if sidecar.language and options.language is None:
+                    # Keep the language detected before the interruption.
+                    options = replace(options, language=sidecar.language)
+                if resumed and progress_cb is not None:
+                    progress_cb(sidecar.resume_s)
+            try:
+                with timed_stage("transcribe"):
+                    stream = backends.iter_segments(
+                        audio_path=audio_path,
+                        backend=backend,
+                        options=options,
+                        progress_cb=progress_cb,
+                        start_s=sidecar.resume_s if sidecar else 0.0,
+                    )
+            except BaseException:
+                if sidecar is not None:
+                    sidecar.close()
+                raise
+            if sidecar is not None:
+                sidecar.set_language(stream.language)
 
-    txt_path = outdir / f"{audio_path.stem}.txt"
-    txt_path.write_text(transcript.text + "\n", encoding="utf-8")
+        to_cache: SegmentTable | None = None
+        if cache_key is not None and cached is None:
+            to_cache = SegmentTable(resumed)
+        # Every format is written as segments arrive; time spent waiting
+        # on the backend is accounted as "transcribe".
+        try:
+            with OutputWriter(
+                outdir,
+                audio_path.stem,
+                wanted,
+                title=title,
+            ) as writer:
+                writer.write_all(resumed)
+                flushed = time.monotonic()
+                for segment in timed_iter(stream, "transcribe"):
+                    if cancel is not None and cancel.is_set():
+                        raise RunCancelledError("Run cancelled.")
+                    writer.write(segment)
+                    if time.monotonic() - flushed >= FLUSH_INTERVAL_S:
+                        writer.flush()
+                        flushed = time.monotonic()
+                    if sidecar is not None:
+                        sidecar.append(segment)
+                    if to_cache is not None:
+                        to_cache.append(
+                            segment.start_s, segment.end_s, segment.text
+                        )
+                writer.close(language=stream.language)
+        except BaseException:
+            if sidecar is not None:
+                sidecar.close()
+            raise
+        if sidecar is not None:
+            sidecar.discard()
 
-    pdf_path: Path | None = None
-    if pdf:
-        pdf_path = outdir / f"{audio_path.stem}.pdf"
-        write_pdf(text=transcript.text, output_path=pdf_path, title=title)
+        if (
+            cache is not None
+            and cache_key is not None
+            and to_cache is not None
+        ):
+            with timed_stage("cache_store"):
+                cache.put(cache_key, to_cache, stream.language)
+
+    elapsed_s = time.perf_counter() - started
+    if cached is None:
+        observe_run(audio_s=audio_duration_s, elapsed_s=elapsed_s)
 
     return RunResult(
-        text_path=txt_path,
-        pdf_path=pdf_path,
-        detected_language=transcript.language,
+        text_path=writer.paths[OutputFormat.TXT],
+        pdf_path=writer.paths.get(OutputFormat.PDF),
+        detected_language=stream.language,
+        audio_duration_s=audio_duration_s,
+        elapsed_s=elapsed_s,
+        cache_hit=cached is not None,
+        stage_timings=dict(timer.timings),
+        vad_skipped_fraction=stream.vad_skipped_fraction,
+        outputs=dict(writer.paths),
+        resumed_from_s=resumed.ends[-1] if resumed else None,
+        language_id=guess,
+        refine=stream.refine,
     )
+
+
+def _cache_fields(
+    backend: str,
+    options: TranscribeOptions,
+) -> dict[str, object]:
+    fields: dict[str, object] = {
+        "backend": backend,
+        "model": options.model,
+        "language": options.language,
+        "translate": options.translate,
+        "beam_size": options.beam_size,
+        "vad_filter": options.vad_filter,
+        "initial_prompt": options.initial_prompt,
+    }
+    if backend == "faster-whisper":
+        # Quantization changes the decoded text.
+        fields["compute_type"] = options.compute_type
+    if options.draft_model is not None:
+        fields["draft_model"] = options.draft_model
+    # Batched decoding can change the text; sequential keys stay as-is.
+    if options.batch_size and options.batch_size > 1:
+        fields["batch_size"] = options.batch_size
+    return fields
@@ -17,3 +17,7 @@ class ExternalToolError(ScribeboxError):
 
 class InvalidInputError(ScribeboxError):
     """Raised when input parameters are invalid."""
+
+
+class RunCancelledError(ScribeboxError):
+    """Raised when a run is cancelled before it completes."""
@@ -2,10 +2,30 @@
 
 from __future__ import annotations
 
+import contextlib
+import shutil
 import subprocess
+import tempfile
+import wave
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from .exceptions import ExternalToolError
+from .exceptions import DependencyMissingError, ExternalToolError
+from .media import cached_probe
+from .metrics import timed_stage
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def _is_model_ready(input_path: Path) -> bool:
+    # Only trust a probe an earlier stage already paid for; probing here
+    # would cost as much as the ffmpeg call it saves on small files.
+    info = cached_probe(input_path)
+    return info is not None and info.is_pcm_wav(sample_rate=SAMPLE_RATE)
 
 
 def convert_to_wav_16k_mono(
@@ -33,8 +53,19 @@ def convert_to_wav_16k_mono(
     ------
     ExternalToolError
         If `ffmpeg` fails.
+
+    Notes
+    -----
+    If :func:`scribebox.media.probe_media` already found the input to be a
+    16kHz mono s16le WAV, it is copied instead of re-encoded.
     """
 
+    if _is_model_ready(input_path):
+        # Converting a file onto itself leaves it as it is.
+        with timed_stage("convert"), contextlib.suppress(shutil.SameFileError):
+            shutil.copyfile(input_path, output_path)
+        return output_path
+
     cmd = [
         "ffmpeg",
         "-y",
@@ -50,6 +81,194 @@ def convert_to_wav_16k_mono(
         str(output_path),
     ]
 
+    with timed_stage("convert"):
+        proc = subprocess.run(
+            cmd,
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+
+    if proc.returncode != 0:
+        raise ExternalToolError(
+            "ffmpeg failed. Ensure ffmpeg is installed and "
+            f"readable. stderr: {proc.stderr.strip()}"
+        )
+
+    return output_path
+
+
+def decode_pcm_16k_mono(
+    input_path: Path,
+    *,
+    start_s: float | None = None,
+    duration_s: float | None = None,
+) -> np.ndarray[Any, Any]:
+    """Decode media straight into a 16kHz mono float32 sample buffer.
+
+    ffmpeg writes raw s16le PCM to a pipe, which is converted in memory to
+    the normalized ``[-1, 1]`` float32 array Whisper-family models take as
+    input. No intermediate file is written. Inputs already probed as 16kHz
+    mono s16le WAV are read directly, without starting ffmpeg.
+
+    Parameters
+    ----------
+    input_path:
+        Path to the input media file.
+    start_s:
+        Optional offset (seconds) to start decoding from.
+    duration_s:
+        Optional maximum duration (seconds) to decode.
+
+    Returns
+    -------
+    numpy.ndarray
+        1-D float32 array sampled at 16kHz.
+
+    Raises
+    ------
+    DependencyMissingError
+        If NumPy is not installed.
+    ExternalToolError
+        If `ffmpeg` fails.
+    """
+
+    try:
+        import numpy as np
+    except Exception as exc:  # pragma: no cover
+        raise DependencyMissingError(
+            "In-memory audio decoding requires 'numpy' (installed with "
+            "either transcription backend)."
+        ) from exc
+
+    if _is_model_ready(input_path):
+        with timed_stage("decode_audio"):
+            frames = _read_wav_frames(input_path, start_s, duration_s)
+        samples = np.frombuffer(frames, dtype=np.int16)
+        return samples.astype(np.float32) / 32768.0
+
+    cmd = ["ffmpeg", "-nostdin", "-hide_banner"]
+    if start_s is not None:
+        cmd += ["-ss", f"{start_s:.3f}"]
+    cmd += ["-i", str(input_path)]
+    if duration_s is not None:
+        cmd += ["-t", f"{duration_s:.3f}"]
+    cmd += [
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-vn",
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "pipe:1",
+    ]
+
+    with timed_stage("decode_audio"):
+        proc = subprocess.run(
+            cmd,
+            check=False,
+            capture_output=True,
+        )
+
+    if proc.returncode != 0:
+        stderr = proc.stderr.decode("utf-8", errors="replace").strip()
+        raise ExternalToolError(
+            "ffmpeg failed. Ensure ffmpeg is installed and "
+            f"readable. stderr: {stderr}"
+        )
+
+    pcm = np.frombuffer(proc.stdout, dtype=np.int16)
+    return pcm.astype(np.float32) / 32768.0
+
+
+def read_wav_16k_mono(wav_path: Path) -> np.ndarray[Any, Any]:
+    """Load a WAV written by :func:`convert_to_wav_16k_mono` into memory.
+
+    The file is already 16kHz mono s16le, so it is read without ffmpeg.
+
+    Raises
+    ------
+    DependencyMissingError
+        If NumPy is not installed.
+    ExternalToolError
+        If the file cannot be read.
+    """
+    try:
+        import numpy as np
+    except Exception as exc:  # pragma: no cover
+        raise DependencyMissingError(
+            "In-memory audio decoding requires 'numpy' (installed with "
+            "either transcription backend)."
+        ) from exc
+
+    frames = _read_wav_frames(wav_path, None, None)
+    samples: np.ndarray[Any, Any] = np.frombuffer(frames, dtype=np.int16)
+    return samples.astype(np.float32) / 32768.0
+
+
+def _read_wav_frames(
+    input_path: Path,
+    start_s: float | None,
+    duration_s: float | None,
+) -> bytes:
+    try:
+        with wave.open(str(input_path), "rb") as wav:
+            if start_s:
+                first = min(round(start_s * SAMPLE_RATE), wav.getnframes())
+                wav.setpos(first)
+            frames = wav.getnframes() - wav.tell()
+            if duration_s is not None:
+                frames = min(frames, round(duration_s * SAMPLE_RATE))
+            return wav.readframes(frames)
+    except (OSError, EOFError, wave.Error) as exc:
+        raise ExternalToolError(f"Could not read WAV file: {exc}") from exc
+
+
+def detect_silences(
+    input_path: Path,
+    *,
+    noise_db: float = -35.0,
+    min_silence_s: float = 0.5,
+) -> list[tuple[float, float]]:
+    """Detect silent stretches with ffmpeg's ``silencedetect`` filter.
+
+    Parameters
+    ----------
+    input_path:
+        Path to the input media file.
+    noise_db:
+        Level (dBFS) below which audio counts as silence.
+    min_silence_s:
+        Minimum silence length in seconds.
+
+    Returns
+    -------
+    list[tuple[float, float]]
+        ``(start_s, end_s)`` pairs in ascending order. A silence that runs
+        until the end of the input is reported with ``end_s == inf``.
+
+    Raises
+    ------
+    ExternalToolError
+        If `ffmpeg` fails.
+    """
+
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(input_path),
+        "-af",
+        f"silencedetect=noise={noise_db}dB:d={min_silence_s}",
+        "-f",
+        "null",
+        "-",
+    ]
+
     proc = subprocess.run(
         cmd,
         check=False,
@@ -63,4 +282,235 @@ def convert_to_wav_16k_mono(
             f"readable. stderr: {proc.stderr.strip()}"
         )
 
-    return output_path
+    return _parse_silencedetect(proc.stderr)
+
+
+def _parse_silencedetect(stderr: str) -> list[tuple[float, float]]:
+    silences: list[tuple[float, float]] = []
+    start: float | None = None
+    for line in stderr.splitlines():
+        if "silence_start:" in line:
+            value = line.split("silence_start:", 1)[1].split()[0]
+            start = float(value)
+        elif "silence_end:" in line and start is not None:
+            value = line.split("silence_end:", 1)[1].split()[0]
+            silences.append((max(0.0, start), float(value)))
+            start = None
+    if start is not None:
+        silences.append((max(0.0, start), float("inf")))
+    return silences
+
+
+class StreamingWavConverter:
+    """Feed media bytes to ffmpeg's stdin while it writes a 16kHz WAV.
+
+    Conversion runs concurrently with the producer (e.g. an upload), so by
+    the time the last chunk arrives most of the file is already decoded.
+    Containers that need seeking (such as MP4 files with the index at the
+    end) cannot be decoded from a pipe; store those to disk first.
+
+    Parameters
+    ----------
+    output_path:
+        Target path for the WAV output.
+    """
+
+    def __init__(self, output_path: Path) -> None:
+        self.output_path = output_path
+        # Outlives __init__: closed by close() or abort().
+        self._stderr = tempfile.TemporaryFile()  # noqa: SIM115
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            "-ac",
+            "1",
+            "-ar",
+            str(SAMPLE_RATE),
+            "-vn",
+            "-f",
+            "wav",
+            str(output_path),
+        ]
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr,
+            )
+        except OSError as exc:
+            self._stderr.close()
+            raise ExternalToolError(
+                f"ffmpeg could not be started: {exc}"
+            ) from exc
+
+    def write(self, chunk: bytes) -> None:
+        """Send a chunk of the input media to ffmpeg."""
+        assert self._proc.stdin is not None
+        try:
+            self._proc.stdin.write(chunk)
+        except BrokenPipeError as exc:
+            raise ExternalToolError(
+                "ffmpeg stopped reading its input. "
+                f"stderr: {self._read_stderr()}"
+            ) from exc
+
+    def close(self) -> Path:
+        """Signal end of input and wait for the WAV file.
+
+        Raises
+        ------
+        ExternalToolError
+            If `ffmpeg` fails.
+        """
+        assert self._proc.stdin is not None
+        with contextlib.suppress(BrokenPipeError):
+            self._proc.stdin.close()
+        returncode = self._proc.wait()
+        stderr = self._read_stderr()
+        self._stderr.close()
+        if returncode != 0:
+            raise ExternalToolError(
+                "ffmpeg failed. Ensure ffmpeg is installed and "
+                f"readable. stderr: {stderr}"
+            )
+        return self.output_path
+
+    def abort(self) -> None:
+        """Stop ffmpeg and discard partial output."""
+        self._proc.kill()
+        if self._proc.stdin is not None:
+            with contextlib.suppress(BrokenPipeError):
+                self._proc.stdin.close()
+        self._proc.wait()
+        self._stderr.close()
+        self.output_path.unlink(missing_ok=True)
+
+    def _read_stderr(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode("utf-8", errors="replace").strip()
+
+
+class PcmStream:
+    """Decode a live source into 16kHz mono float32 chunks with ffmpeg.
+
+    The source is read as it is produced: ``-`` is this process's stdin
+    (any container ffmpeg can read from a pipe), anything else is passed
+    to ffmpeg as its input, such as a stream URL (``http://``,
+    ``rtmp://``, ``srt://``, ``udp://``) or, with ``input_format``, a
+    capture device (``-f alsa default``, ``-f pulse default``,
+    ``-f avfoundation :0``, ``-f dshow audio=...``).
+
+    Parameters
+    ----------
+    source:
+        ``-`` for stdin, a URL, a device name or a file.
+    input_format:
+        ffmpeg input format (``-f``), required for devices and raw PCM.
+    realtime:
+        Read the input at its native rate (``-re``), to replay a file as
+        if it were live.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        *,
+        input_format: str | None = None,
+        realtime: bool = False,
+    ) -> None:
+        # Outlives __init__: closed by close().
+        self._stderr = tempfile.TemporaryFile()  # noqa: SIM115
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+        if source != "-":
+            cmd.append("-nostdin")
+        if realtime:
+            cmd.append("-re")
+        if input_format is not None:
+            cmd += ["-f", input_format]
+        cmd += [
+            "-i",
+            "pipe:0" if source == "-" else source,
+            "-ac",
+            "1",
+            "-ar",
+            str(SAMPLE_RATE),
+            "-vn",
+            "-f",
+            "s16le",
+            "-acodec",
+            "pcm_s16le",
+            "pipe:1",
+        ]
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=None if source == "-" else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=self._stderr,
+                # Ctrl-C is for scribebox, which drains what ffmpeg has
+                # produced so far and then stops it.
+                start_new_session=True,
+            )
+        except OSError as exc:
+            self._stderr.close()
+            raise ExternalToolError(
+                f"ffmpeg could not be started: {exc}"
+            ) from exc
+
+    def chunks(self, chunk_s: float = 0.1) -> Iterator[np.ndarray[Any, Any]]:
+        """Yield samples as ffmpeg produces them, about ``chunk_s`` each.
+
+        Raises
+        ------
+        ExternalToolError
+            If `ffmpeg` fails before the source ends.
+        """
+        import numpy as np
+
+        assert self._proc.stdout is not None
+        size = max(2, int(chunk_s * SAMPLE_RATE) * 2)
+        pending = b""
+        while True:
+            data = self._proc.stdout.read1(size)  # type: ignore[attr-defined]
+            if not data:
+                break
+            pending += data
+            usable = len(pending) - len(pending) % 2
+            if usable:
+                pcm = np.frombuffer(pending[:usable], dtype=np.int16)
+                pending = pending[usable:]
+                yield pcm.astype(np.float32) / 32768.0
+        if self._proc.wait() != 0:
+            raise ExternalToolError(
+                f"ffmpeg failed reading the live source. stderr: "
+                f"{self._read_stderr()}"
+            )
+
+    def close(self) -> None:
+        """Stop ffmpeg."""
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        if self._proc.stdout is not None:
+            self._proc.stdout.close()
+        self._stderr.close()
+
+    def __enter__(self) -> PcmStream:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _read_stderr(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode("utf-8", errors="replace").strip()
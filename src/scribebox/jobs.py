@@ -0,0 +1,245 @@
+"""Background transcription jobs."""
+
+from __future__ import annotations
+
+import queue
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from .core import RunResult
+from .metrics import JOBS, JOBS_FINISHED
+
+JobFn = Callable[[], RunResult]
+
+# Finished jobs are forgotten (and their work directories removed) after
+# this long, or once more than MAX_FINISHED_JOBS have piled up.
+JOB_TTL_S = 24 * 3600.0
+MAX_FINISHED_JOBS = 1000
+
+
+class JobStatus(StrEnum):
+    """Lifecycle state of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class Job:
+    """A unit of work processed by a :class:`JobQueue`.
+
+    Parameters
+    ----------
+    id:
+        Opaque job identifier.
+    title:
+        Human-readable label (e.g. the URL or uploaded file name).
+    status:
+        Current lifecycle state.
+    created_at:
+        Submission time (UNIX seconds).
+    started_at:
+        Time a worker picked the job up, if it has.
+    finished_at:
+        Completion time, if finished.
+    result:
+        Output paths once the job is done.
+    error:
+        Error message if the job failed.
+    info:
+        Extra JSON-serializable details reported with the job status
+        (e.g. upload measurements).
+    workdir:
+        Scratch directory holding the job's inputs and outputs, removed
+        when the job is evicted.
+    """
+
+    id: str
+    title: str | None
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: RunResult | None = None
+    error: str | None = None
+    info: dict[str, Any] = field(default_factory=dict)
+    workdir: Path | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view of the job."""
+        data: dict[str, Any] = {
+            "id": self.id,
+            "title": self.title,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            **self.info,
+        }
+        if self.result is not None:
+            data["detected_language"] = self.result.detected_language
+            data["cache_hit"] = self.result.cache_hit
+            data["stage_timings"] = self.result.stage_timings
+            data["formats"] = [str(fmt) for fmt in self.result.outputs]
+            if self.result.refine is not None:
+                data["refine"] = self.result.refine.to_dict()
+        return data
+
+
+class JobQueue:
+    """FIFO job queue drained by a fixed pool of worker threads.
+
+    Workers run in the same process and share the process-wide model
+    cache, so the pool size bounds how many models decode concurrently
+    while models stay warm between jobs. Finished jobs are kept for
+    polling until they are ``ttl_s`` old or more than ``max_finished``
+    have accumulated, oldest first.
+
+    Parameters
+    ----------
+    workers:
+        Number of worker threads.
+    ttl_s:
+        How long a finished job stays available.
+    max_finished:
+        How many finished jobs are kept at most.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 1,
+        ttl_s: float = JOB_TTL_S,
+        max_finished: int = MAX_FINISHED_JOBS,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1.")
+        self.ttl_s = ttl_s
+        self.max_finished = max_finished
+        self._queue: queue.Queue[tuple[Job, JobFn] | None] = queue.Queue()
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(
+                target=self._worker,
+                name=f"scribebox-worker-{i}",
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def workers(self) -> int:
+        """Number of worker threads."""
+        return len(self._threads)
+
+    def submit(
+        self,
+        fn: JobFn,
+        *,
+        title: str | None = None,
+        info: dict[str, Any] | None = None,
+        workdir: Path | None = None,
+    ) -> Job:
+        """Queue ``fn`` for execution and return its job record.
+
+        Parameters
+        ----------
+        fn:
+            Zero-argument callable that performs the transcription.
+        title:
+            Optional label stored on the job.
+        info:
+            Optional extra details reported with the job status.
+        workdir:
+            Directory to remove once the job is evicted.
+
+        Returns
+        -------
+        Job
+            The queued job.
+        """
+        job = Job(
+            id=uuid.uuid4().hex,
+            title=title,
+            info=dict(info or {}),
+            workdir=workdir,
+        )
+        with self._lock:
+            evicted = self._evict()
+            self._jobs[job.id] = job
+        for old in evicted:
+            if old.workdir is not None:
+                shutil.rmtree(old.workdir, ignore_errors=True)
+        JOBS.inc(state=JobStatus.QUEUED)
+        self._queue.put((job, fn))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return the job with ``job_id``, if known."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _evict(self) -> list[Job]:
+        # Called with the lock held.
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_at),
+            key=lambda job: job.finished_at or 0.0,
+        )
+        cutoff = time.time() - self.ttl_s
+        excess = len(finished) - self.max_finished
+        evicted = [
+            job
+            for i, job in enumerate(finished)
+            if i < excess or (job.finished_at or 0.0) < cutoff
+        ]
+        for job in evicted:
+            del self._jobs[job.id]
+        return evicted
+
+    def pending(self) -> int:
+        """Return the number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop the workers once queued jobs are drained."""
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            job, fn = item
+            job.started_at = time.time()
+            job.status = JobStatus.RUNNING
+            JOBS.dec(state=JobStatus.QUEUED)
+            JOBS.inc(state=JobStatus.RUNNING)
+            try:
+                result = fn()
+            except Exception as exc:
+                job.error = str(exc) or type(exc).__name__
+                job.finished_at = time.time()
+                job.status = JobStatus.FAILED
+            else:
+                job.result = result
+                job.finished_at = time.time()
+                job.status = JobStatus.DONE
+            JOBS.dec(state=JobStatus.RUNNING)
+            JOBS_FINISHED.inc(status=job.status)
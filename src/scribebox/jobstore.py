@@ -0,0 +1,512 @@
+"""Durable job store shared by worker processes on one or many hosts."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+import uuid
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from .core import RunResult
+from .jobs import Job, JobStatus
+
+STORE_FILENAME = "jobs.sqlite3"
+DEFAULT_LEASE_S = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_DELAY_S = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    spec TEXT NOT NULL,
+    info TEXT NOT NULL,
+    status TEXT NOT NULL,
+    audio_s REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status
+    ON jobs (status, available_at, created_at);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class JobSpec:
+    """What a worker should transcribe.
+
+    Paths must be reachable from every worker (e.g. under the store's
+    shared directory).
+
+    Parameters
+    ----------
+    outdir:
+        Output directory.
+    url:
+        YouTube URL to download, or ``None`` for a local file.
+    audio_path:
+        Local media file, or ``None`` for a URL.
+    pdf:
+        Also export a PDF.
+    language:
+        Forced language, or ``None`` to detect it.
+    formats:
+        Additional output formats.
+    title:
+        Label used as the PDF title.
+    """
+
+    outdir: Path
+    url: str | None = None
+    audio_path: Path | None = None
+    pdf: bool = False
+    language: str | None = None
+    formats: tuple[str, ...] = ()
+    title: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view (see :meth:`from_dict`)."""
+        return {
+            "outdir": str(self.outdir),
+            "url": self.url,
+            "audio_path": (
+                None if self.audio_path is None else str(self.audio_path)
+            ),
+            "pdf": self.pdf,
+            "language": self.language,
+            "formats": list(self.formats),
+            "title": self.title,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> JobSpec:
+        """Rebuild a spec written by :meth:`to_dict`."""
+        audio_path = data.get("audio_path")
+        return cls(
+            outdir=Path(data["outdir"]),
+            url=data.get("url"),
+            audio_path=None if audio_path is None else Path(audio_path),
+            pdf=bool(data.get("pdf", False)),
+            language=data.get("language"),
+            formats=tuple(data.get("formats") or ()),
+            title=data.get("title"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClaimedJob:
+    """A job leased to a worker.
+
+    Parameters
+    ----------
+    id:
+        Job identifier.
+    spec:
+        What to transcribe.
+    attempt:
+        1 for the first attempt, 2 for the first retry, ...
+    """
+
+    id: str
+    spec: JobSpec
+    attempt: int
+
+
+class JobStore(Protocol):
+    """Durable queue of :class:`JobSpec` drained by workers.
+
+    A claimed job is leased to one worker until ``lease_expires_at``;
+    the worker renews the lease with :meth:`heartbeat` while it runs. A
+    job whose lease expires (the worker died or lost its host) is handed
+    to the next worker that asks, until ``max_attempts`` is reached.
+    """
+
+    root: Path
+
+    def job_dir(self, job_id: str) -> Path:
+        """Return the shared directory for a job's inputs and outputs."""
+
+    def submit(
+        self,
+        spec: JobSpec,
+        *,
+        job_id: str | None = None,
+        audio_s: float | None = None,
+        info: Mapping[str, Any] | None = None,
+    ) -> Job:
+        """Queue ``spec`` and return the job record."""
+
+    def get(self, job_id: str) -> Job | None:
+        """Return the job with ``job_id``, if known."""
+
+    def claim(self, worker_id: str, *, lease_s: float) -> ClaimedJob | None:
+        """Lease the oldest runnable job to ``worker_id``."""
+
+    def heartbeat(
+        self,
+        job_id: str,
+        worker_id: str,
+        *,
+        lease_s: float,
+    ) -> bool:
+        """Extend a lease; ``False`` if the worker no longer holds it."""
+
+    def complete(self, job_id: str, worker_id: str, result: RunResult) -> bool:
+        """Publish the result; ``False`` if the lease was lost."""
+
+    def fail(
+        self,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        *,
+        retry: bool = True,
+    ) -> JobStatus | None:
+        """Record a failure and requeue the job if attempts remain."""
+
+    def outstanding_audio_s(self) -> float:
+        """Return the audio seconds of queued and running jobs."""
+
+
+def new_job_id() -> str:
+    """Return a new opaque job identifier."""
+    return uuid.uuid4().hex
+
+
+class SqliteJobStore:
+    """:class:`JobStore` in a SQLite database under a shared directory.
+
+    Every operation opens its own connection and state changes run in
+    ``BEGIN IMMEDIATE`` transactions, so any number of processes can
+    share the store. The rollback journal (not WAL) is used so the
+    database also works from several hosts on a shared filesystem with
+    working POSIX locks; lease times assume roughly synchronized clocks.
+
+    Parameters
+    ----------
+    root:
+        Shared directory holding the database and per-job directories.
+    max_attempts:
+        Attempts per job before it is marked failed.
+    retry_delay_s:
+        Delay before a failed attempt is retried, multiplied by the
+        number of attempts so far.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay_s: float = RETRY_DELAY_S,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1.")
+        self.root = root
+        self.path = root / STORE_FILENAME
+        self.max_attempts = max_attempts
+        self.retry_delay_s = retry_delay_s
+        root.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=30.0,
+            isolation_level=None,
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def job_dir(self, job_id: str) -> Path:
+        """Return the shared directory for a job's inputs and outputs."""
+        return self.root / "jobs" / job_id
+
+    def submit(
+        self,
+        spec: JobSpec,
+        *,
+        job_id: str | None = None,
+        audio_s: float | None = None,
+        info: Mapping[str, Any] | None = None,
+    ) -> Job:
+        """Queue ``spec`` and return the job record.
+
+        Parameters
+        ----------
+        spec:
+            What to transcribe.
+        job_id:
+            Identifier chosen by the caller (e.g. to name the job
+            directory an upload was written to); a new one by default.
+        audio_s:
+            Probed duration, counted by :meth:`outstanding_audio_s`.
+        info:
+            Extra JSON-serializable details reported with the job.
+        """
+        job_id = job_id or new_job_id()
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, title, spec, info, status, audio_s,"
+                " max_attempts, available_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    spec.title,
+                    json.dumps(spec.to_dict()),
+                    json.dumps(info or {}),
+                    JobStatus.QUEUED.value,
+                    audio_s,
+                    self.max_attempts,
+                    now,
+                    now,
+                ),
+            )
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return the job with ``job_id``, if known.
+
+        ``info`` carries the attempt count and the worker holding the
+        lease besides the details given on submission.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        info = json.loads(row["info"])
+        info["attempts"] = row["attempts"]
+        info["worker"] = row["lease_owner"]
+        return Job(
+            id=row["id"],
+            title=row["title"],
+            status=JobStatus(row["status"]),
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            result=(
+                None
+                if row["result"] is None
+                else RunResult.from_dict(json.loads(row["result"]))
+            ),
+            error=row["error"],
+            info=info,
+        )
+
+    def claim(self, worker_id: str, *, lease_s: float) -> ClaimedJob | None:
+        """Lease the oldest runnable job to ``worker_id``.
+
+        Queued jobs whose retry delay has passed and running jobs whose
+        lease expired are runnable. Expired jobs without attempts left
+        are marked failed instead.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?,"
+                " error = 'Lease expired: the worker stopped responding.',"
+                " lease_owner = NULL, lease_expires_at = NULL"
+                " WHERE status = ? AND lease_expires_at < ?"
+                " AND attempts >= max_attempts",
+                (JobStatus.FAILED.value, now, JobStatus.RUNNING.value, now),
+            )
+            row = conn.execute(
+                "SELECT id, spec, attempts FROM jobs"
+                " WHERE (status = ? AND available_at <= ?)"
+                " OR (status = ? AND lease_expires_at < ?)"
+                " ORDER BY created_at LIMIT 1",
+                (
+                    JobStatus.QUEUED.value,
+                    now,
+                    JobStatus.RUNNING.value,
+                    now,
+                ),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1,"
+                " lease_owner = ?, lease_expires_at = ?, heartbeat_at = ?,"
+                " started_at = ? WHERE id = ?",
+                (
+                    JobStatus.RUNNING.value,
+                    worker_id,
+                    now + lease_s,
+                    now,
+                    now,
+                    row["id"],
+                ),
+            )
+        return ClaimedJob(
+            id=row["id"],
+            spec=JobSpec.from_dict(json.loads(row["spec"])),
+            attempt=row["attempts"] + 1,
+        )
+
+    def heartbeat(
+        self,
+        job_id: str,
+        worker_id: str,
+        *,
+        lease_s: float,
+    ) -> bool:
+        """Extend a lease; ``False`` if the worker no longer holds it."""
+        now = time.time()
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ?"
+                " WHERE id = ? AND lease_owner = ? AND status = ?",
+                (
+                    now + lease_s,
+                    now,
+                    job_id,
+                    worker_id,
+                    JobStatus.RUNNING.value,
+                ),
+            )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: RunResult) -> bool:
+        """Publish the result; ``False`` if the lease was lost."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished_at = ?,"
+                " error = NULL, lease_owner = NULL, lease_expires_at = NULL"
+                " WHERE id = ? AND lease_owner = ? AND status = ?",
+                (
+                    JobStatus.DONE.value,
+                    json.dumps(result.to_dict()),
+                    time.time(),
+                    job_id,
+                    worker_id,
+                    JobStatus.RUNNING.value,
+                ),
+            )
+        return cur.rowcount == 1
+
+    def fail(
+        self,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        *,
+        retry: bool = True,
+    ) -> JobStatus | None:
+        """Record a failure and requeue the job if attempts remain.
+
+        Returns
+        -------
+        JobStatus | None
+            ``QUEUED`` if the job will be retried, ``FAILED`` if not, or
+            ``None`` if the worker no longer held the lease.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs"
+                " WHERE id = ? AND lease_owner = ? AND status = ?",
+                (job_id, worker_id, JobStatus.RUNNING.value),
+            ).fetchone()
+            if row is None:
+                return None
+            attempts = row["attempts"]
+            if retry and attempts < row["max_attempts"]:
+                status = JobStatus.QUEUED
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?,"
+                    " available_at = ?, lease_owner = NULL,"
+                    " lease_expires_at = NULL WHERE id = ?",
+                    (
+                        status.value,
+                        error,
+                        now + self.retry_delay_s * attempts,
+                        job_id,
+                    ),
+                )
+            else:
+                status = JobStatus.FAILED
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?,"
+                    " finished_at = ?, lease_owner = NULL,"
+                    " lease_expires_at = NULL WHERE id = ?",
+                    (status.value, error, now, job_id),
+                )
+        return status
+
+    def outstanding_audio_s(self) -> float:
+        """Return the audio seconds of queued and running jobs."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(audio_s), 0.0) FROM jobs"
+                " WHERE status IN (?, ?)",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            ).fetchone()
+        return float(row[0])
+
+
+JobStoreFactory = Callable[[str], JobStore]
+
+_BACKENDS: dict[str, JobStoreFactory] = {
+    "sqlite": lambda location: SqliteJobStore(Path(location).expanduser()),
+}
+
+
+def register_job_store(scheme: str, factory: JobStoreFactory) -> None:
+    """Make ``scheme://location`` open a store built by ``factory``."""
+    _BACKENDS[scheme] = factory
+
+
+def open_job_store(location: str) -> JobStore:
+    """Open a job store from ``scheme://location`` or a plain directory.
+
+    A plain path (or ``sqlite://PATH``) opens a :class:`SqliteJobStore`;
+    other schemes must be registered with :func:`register_job_store`.
+
+    Raises
+    ------
+    ValueError
+        If the scheme is unknown.
+    """
+    scheme, sep, rest = location.partition("://")
+    if not sep:
+        scheme, rest = "sqlite", location
+    factory = _BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(f"Unsupported job store: {location}")
+    return factory(rest)
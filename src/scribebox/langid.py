@@ -0,0 +1,266 @@
+"""Language identification over sampled speech windows."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .cache import default_cache_dir, source_key
+from .ffmpeg import SAMPLE_RATE, decode_pcm_16k_mono
+from .media import get_audio_duration_s
+from .metrics import CACHE_LOOKUPS, timed_stage
+from .model_cache import load_faster_whisper_model, load_whisper_model
+from .vad import SpeechTimeline
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .backends import TranscribeOptions
+
+WINDOWS = 3
+WINDOW_S = 30.0
+MIN_SPEECH_S = 5.0
+MIN_PROBABILITY = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageGuess:
+    """Outcome of :func:`identify_language`.
+
+    Parameters
+    ----------
+    language:
+        Most likely language code.
+    probability:
+        Mean probability of ``language`` over the sampled windows.
+    windows:
+        Number of windows that contributed.
+    """
+
+    language: str
+    probability: float
+    windows: int
+
+    @property
+    def confident(self) -> bool:
+        """Whether the guess is reliable enough to fix the language."""
+        return self.probability >= MIN_PROBABILITY
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view."""
+        return asdict(self)
+
+
+class LanguageCache:
+    """Small on-disk cache of language guesses, one JSON file per key.
+
+    Parameters
+    ----------
+    root:
+        Cache directory.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def get(self, key: str) -> LanguageGuess | None:
+        """Return the guess stored under ``key``, if any."""
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+            return LanguageGuess(
+                language=str(data["language"]),
+                probability=float(data["probability"]),
+                windows=int(data["windows"]),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, guess: LanguageGuess) -> None:
+        """Store ``guess`` under ``key``."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(guess.to_dict()), encoding="utf-8")
+        tmp.replace(path)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+
+def default_language_cache() -> LanguageCache:
+    """Return the language cache under :func:`default_cache_dir`."""
+    return LanguageCache(default_cache_dir() / "languages")
+
+
+def sample_offsets(
+    duration_s: float | None,
+    *,
+    windows: int = WINDOWS,
+    window_s: float = WINDOW_S,
+) -> list[float]:
+    """Spread ``windows`` window starts evenly over the audio.
+
+    The first window starts after the opening rather than at zero, so an
+    intro jingle or silence does not decide the language on its own.
+    """
+    if duration_s is None or duration_s <= window_s:
+        return [0.0]
+    span = duration_s - window_s
+    return [span * (i + 1) / (windows + 1) for i in range(windows)]
+
+
+def identify_language(
+    audio_path: Path,
+    *,
+    backend: str,
+    options: TranscribeOptions,
+    windows: int = WINDOWS,
+    window_s: float = WINDOW_S,
+    cache: LanguageCache | None = None,
+) -> LanguageGuess | None:
+    """Identify the spoken language from a few sampled speech windows.
+
+    Up to ``windows`` windows of ``window_s`` seconds are decoded with
+    ffmpeg seeking (the rest of the file is never decoded), reduced to
+    their speech with :mod:`scribebox.vad`, and scored by the model's
+    language head. Per-language probabilities are averaged across
+    windows, and the result is cached per source file and model.
+
+    Parameters
+    ----------
+    audio_path:
+        Local media file.
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    options:
+        Decode options; the model, device and compute type are used.
+    windows:
+        Number of windows to sample.
+    window_s:
+        Window length in seconds.
+    cache:
+        Optional cache of previous guesses.
+
+    Returns
+    -------
+    LanguageGuess | None
+        The guess, or ``None`` if the file has no usable speech.
+    """
+    key: str | None = None
+    if cache is not None:
+        key = source_key(
+            audio_path,
+            {
+                "backend": backend,
+                "model": options.model,
+                "windows": windows,
+                "window_s": window_s,
+            },
+        )
+        cached = cache.get(key)
+        CACHE_LOOKUPS.inc(
+            cache="language",
+            result="miss" if cached is None else "hit",
+        )
+        if cached is not None:
+            return cached
+
+    with timed_stage("language_id"):
+        clips = _speech_windows(
+            audio_path,
+            offsets=sample_offsets(
+                get_audio_duration_s(audio_path),
+                windows=windows,
+                window_s=window_s,
+            ),
+            window_s=window_s,
+        )
+        if not clips:
+            return None
+        totals: dict[str, float] = {}
+        for clip in clips:
+            for language, prob in window_probs(
+                clip,
+                backend=backend,
+                options=options,
+            ).items():
+                totals[language] = totals.get(language, 0.0) + prob
+
+    language = max(totals, key=totals.__getitem__)
+    guess = LanguageGuess(
+        language=language,
+        probability=totals[language] / len(clips),
+        windows=len(clips),
+    )
+    if cache is not None and key is not None:
+        cache.put(key, guess)
+    return guess
+
+
+def _speech_windows(
+    audio_path: Path,
+    *,
+    offsets: list[float],
+    window_s: float,
+) -> list[np.ndarray[Any, Any]]:
+    speech: list[np.ndarray[Any, Any]] = []
+    fallback: np.ndarray[Any, Any] | None = None
+    for offset in offsets:
+        samples = decode_pcm_16k_mono(
+            audio_path,
+            start_s=offset or None,
+            duration_s=window_s,
+        )
+        timeline = SpeechTimeline.detect(samples)
+        if timeline.speech_s >= MIN_SPEECH_S:
+            speech.append(timeline.compact(samples))
+        elif fallback is None and len(samples) >= SAMPLE_RATE:
+            fallback = samples
+    # With no clear speech anywhere, let the model judge the raw audio.
+    if not speech and fallback is not None:
+        speech.append(fallback)
+    return speech
+
+
+def window_probs(
+    samples: np.ndarray[Any, Any],
+    *,
+    backend: str,
+    options: TranscribeOptions,
+) -> Mapping[str, float]:
+    """Return language probabilities for one window of 16 kHz samples."""
+    if backend == "faster-whisper":
+        model = load_faster_whisper_model(
+            options.model,
+            device=options.device,
+            compute_type=options.compute_type,
+            cpu_threads=options.cpu_threads,
+            num_workers=options.num_workers,
+        )
+        # Language detection runs when the generator is created; no
+        # segment is decoded because the generator is never consumed.
+        _, info = model.transcribe(samples, beam_size=1, vad_filter=False)
+        probs = getattr(info, "all_language_probs", None)
+        if probs:
+            return dict(probs)
+        return {info.language: float(info.language_probability)}
+    if backend == "whisper":
+        import whisper
+
+        model = load_whisper_model(
+            options.model,
+            device=options.device,
+            cpu_threads=options.cpu_threads,
+        )
+        audio = whisper.pad_or_trim(samples)
+        mel = whisper.log_mel_spectrogram(
+            audio,
+            n_mels=model.dims.n_mels,
+        ).to(model.device)
+        _, probs = model.detect_language(mel)
+        return dict(probs)
+    raise ValueError(f"Unsupported backend: {backend}")
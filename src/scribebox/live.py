@@ -0,0 +1,450 @@
+"""Live transcription with a rolling decode window.
+
+Audio is decoded repeatedly over a window that starts at the end of the
+last committed segment and grows as audio arrives. A segment is
+committed (emitted) once two consecutive decodes agree on it and it ends
+at least ``holdback_s`` before the newest audio, where words may still
+be cut off. When the window reaches ``max_window_s`` (Whisper's 30 s
+context), everything but the tail is committed regardless, which bounds
+the latency.
+"""
+
+from __future__ import annotations
+
+import math
+import queue
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
+from itertools import takewhile
+from typing import Any, Protocol
+
+from .backends import TranscribeOptions, iter_sample_segments
+from .ffmpeg import SAMPLE_RATE
+from .metrics import LIVE_LATENCY, timed_stage
+from .types import TranscriptSegment
+
+# Decode again once this much new audio has arrived.
+STEP_S = 1.0
+# Segments ending this close to the newest audio may still change.
+HOLDBACK_S = 2.0
+# Whisper's context; older audio is committed even without agreement.
+MAX_WINDOW_S = 30.0
+# Trailing committed text passed as the prompt of the next window.
+PROMPT_CHARS = 200
+
+_WORD = re.compile(r"\w+")
+
+OnSegment = Callable[[TranscriptSegment, float | None], None]
+
+
+class WindowDecoder(Protocol):
+    """Decodes one window of 16kHz mono samples."""
+
+    def __call__(
+        self,
+        samples: Any,
+        *,
+        prompt: str | None,
+        language: str | None,
+    ) -> tuple[list[TranscriptSegment], str | None]:
+        """Return window-relative segments and the language."""
+
+
+def window_decoder(
+    *,
+    backend: str,
+    options: TranscribeOptions,
+) -> WindowDecoder:
+    """Return a :class:`WindowDecoder` running ``options.model``.
+
+    The model is loaded once into the process-wide cache and reused for
+    every window; the prompt is used only without ``initial_prompt``.
+    """
+
+    def decode(
+        samples: Any,
+        *,
+        prompt: str | None,
+        language: str | None,
+    ) -> tuple[list[TranscriptSegment], str | None]:
+        stream = iter_sample_segments(
+            samples,
+            backend=backend,
+            options=replace(
+                options,
+                language=options.language or language,
+                initial_prompt=options.initial_prompt or prompt,
+            ),
+        )
+        return list(stream), stream.language
+
+    return decode
+
+
+@dataclass(slots=True)
+class LatencyStats:
+    """Emission latencies in seconds.
+
+    Latency is measured from the arrival of a segment's last audio to
+    the moment the segment is emitted.
+    """
+
+    values: list[float] = field(default_factory=list)
+
+    def observe(self, seconds: float) -> None:
+        """Record one emission."""
+        self.values.append(seconds)
+
+    @property
+    def count(self) -> int:
+        """Number of emissions recorded."""
+        return len(self.values)
+
+    @property
+    def mean_s(self) -> float | None:
+        """Mean latency."""
+        return sum(self.values) / len(self.values) if self.values else None
+
+    @property
+    def max_s(self) -> float | None:
+        """Worst latency."""
+        return max(self.values, default=None)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the ``q``-th percentile (nearest rank), ``0 < q <= 100``."""
+        if not self.values:
+            return None
+        ordered = sorted(self.values)
+        rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary."""
+        return {
+            "count": self.count,
+            "mean_s": self.mean_s,
+            "p50_s": self.percentile(50),
+            "p95_s": self.percentile(95),
+            "max_s": self.max_s,
+        }
+
+
+@dataclass(slots=True)
+class LiveStats:
+    """Summary of a live session.
+
+    Parameters
+    ----------
+    audio_s:
+        Audio seconds received.
+    decode_s:
+        Wall-clock seconds spent decoding windows.
+    decodes:
+        Number of window decodes.
+    segments:
+        Segments emitted.
+    latency:
+        Emission latencies.
+    language:
+        Language of the session, forced or detected.
+    """
+
+    audio_s: float = 0.0
+    decode_s: float = 0.0
+    decodes: int = 0
+    segments: int = 0
+    latency: LatencyStats = field(default_factory=LatencyStats)
+    language: str | None = None
+
+    @property
+    def real_time_factor(self) -> float | None:
+        """Decode time divided by audio received (must stay below 1)."""
+        if self.audio_s <= 0.0:
+            return None
+        return self.decode_s / self.audio_s
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary."""
+        return {
+            "audio_s": self.audio_s,
+            "decode_s": self.decode_s,
+            "decodes": self.decodes,
+            "segments": self.segments,
+            "real_time_factor": self.real_time_factor,
+            "latency": self.latency.to_dict(),
+            "language": self.language,
+        }
+
+
+class RollingDecoder:
+    """Rolling-window decoding of an unbounded sample stream.
+
+    Parameters
+    ----------
+    decode:
+        Decodes one window.
+    language:
+        Forced language; otherwise the language of the first committed
+        window is kept for the rest of the session.
+    holdback_s:
+        Segments ending this close to the newest audio are not committed
+        unless the stream has ended.
+    max_window_s:
+        Window length after which segments are committed without
+        agreement.
+    """
+
+    def __init__(
+        self,
+        decode: WindowDecoder,
+        *,
+        language: str | None = None,
+        holdback_s: float = HOLDBACK_S,
+        max_window_s: float = MAX_WINDOW_S,
+    ) -> None:
+        import numpy as np
+
+        self._np = np
+        self._decode = decode
+        self.language = language
+        self.holdback_s = holdback_s
+        self.max_window_s = max_window_s
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._chunks: list[Any] = []
+        # Sample positions on the session timeline.
+        self._start = 0
+        self._received = 0
+        self._decoded = 0
+        self._previous: list[TranscriptSegment] = []
+        self._recent: deque[str] = deque(maxlen=16)
+
+    @property
+    def start_s(self) -> float:
+        """Timeline position of the window start (last commit)."""
+        return self._start / SAMPLE_RATE
+
+    @property
+    def end_s(self) -> float:
+        """Timeline position of the newest audio."""
+        return self._received / SAMPLE_RATE
+
+    @property
+    def pending_s(self) -> float:
+        """Audio received since the last decode."""
+        return (self._received - self._decoded) / SAMPLE_RATE
+
+    def feed(self, samples: Any) -> None:
+        """Append 16kHz mono float32 samples."""
+        if len(samples):
+            self._chunks.append(samples)
+            self._received += len(samples)
+
+    def step(self, *, final: bool = False) -> list[TranscriptSegment]:
+        """Decode the window and return the segments committed by it.
+
+        With ``final``, every decoded segment is committed.
+        """
+        if self._chunks:
+            self._buffer = self._np.concatenate([self._buffer, *self._chunks])
+            self._chunks = []
+        self._decoded = self._received
+        if not len(self._buffer):
+            return []
+
+        window_start, window_end = self.start_s, self.end_s
+        relative, language = self._decode(
+            self._buffer,
+            prompt=" ".join(self._recent)[-PROMPT_CHARS:].strip() or None,
+            language=self.language,
+        )
+        segments = [
+            TranscriptSegment(
+                start_s=min(window_end, window_start + max(0.0, s.start_s)),
+                end_s=min(window_end, window_start + max(0.0, s.end_s)),
+                text=s.text,
+            )
+            for s in relative
+        ]
+
+        if final:
+            stable = segments
+        else:
+            cutoff = window_end - self.holdback_s
+            ready = list(takewhile(lambda s: s.end_s <= cutoff, segments))
+            if window_end - window_start >= self.max_window_s:
+                stable = ready or segments[:-1] or segments
+            else:
+                stable = _agreed_prefix(ready, self._previous)
+        self._previous = segments[len(stable) :]
+
+        if stable:
+            if self.language is None:
+                self.language = language
+            self._recent.extend(s.text for s in stable if s.text)
+            self._commit(stable[-1].end_s)
+        elif not segments:
+            # Nothing but silence: keep only the tail a word may start in.
+            self._commit(window_end - self.holdback_s)
+        return stable
+
+    def _commit(self, until_s: float) -> None:
+        until = round(until_s * SAMPLE_RATE)
+        drop = min(max(0, until - self._start), len(self._buffer))
+        self._buffer = self._buffer[drop:]
+        self._start += drop
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _agreed_prefix(
+    current: list[TranscriptSegment],
+    previous: list[TranscriptSegment],
+) -> list[TranscriptSegment]:
+    agreed = 0
+    for ours, theirs in zip(current, previous, strict=False):
+        if _words(ours.text) != _words(theirs.text):
+            break
+        agreed += 1
+    return current[:agreed]
+
+
+def run_live(
+    chunks: Iterable[Any],
+    *,
+    decode: WindowDecoder,
+    on_segment: OnSegment,
+    language: str | None = None,
+    step_s: float = STEP_S,
+    holdback_s: float = HOLDBACK_S,
+    max_window_s: float = MAX_WINDOW_S,
+) -> LiveStats:
+    """Transcribe ``chunks`` as they arrive until the source ends.
+
+    Chunks are read on a background thread so the source keeps being
+    drained while a window is decoded; audio that arrives meanwhile is
+    picked up by the next decode. Ctrl-C ends the session like the end
+    of the source: the remaining audio is decoded and emitted.
+
+    Parameters
+    ----------
+    chunks:
+        16kHz mono float32 sample arrays, e.g. from
+        :meth:`scribebox.ffmpeg.PcmStream.chunks`.
+    decode:
+        Decodes one window (see :func:`window_decoder`).
+    on_segment:
+        Called with each committed segment and its latency in seconds.
+    language:
+        Forced language.
+    step_s:
+        Decode again once this much new audio has arrived.
+    holdback_s:
+        See :class:`RollingDecoder`.
+    max_window_s:
+        See :class:`RollingDecoder`.
+
+    Returns
+    -------
+    LiveStats
+        Session summary, including latency percentiles.
+    """
+    rolling = RollingDecoder(
+        decode,
+        language=language,
+        holdback_s=holdback_s,
+        max_window_s=max_window_s,
+    )
+    stats = LiveStats()
+    # (timeline position of the chunk end, arrival time) per chunk.
+    arrivals: deque[tuple[float, float]] = deque()
+    items: queue.Queue[Any] = queue.Queue()
+    reader = threading.Thread(
+        target=_read_chunks,
+        args=(chunks, items),
+        name="scribebox-live-reader",
+        daemon=True,
+    )
+    reader.start()
+
+    def emit(segments: list[TranscriptSegment]) -> None:
+        now = time.monotonic()
+        for segment in segments:
+            arrived = next(
+                (t for end_s, t in arrivals if end_s >= segment.end_s),
+                None,
+            )
+            latency = None if arrived is None else max(0.0, now - arrived)
+            if latency is not None:
+                stats.latency.observe(latency)
+                LIVE_LATENCY.observe(latency)
+            stats.segments += 1
+            on_segment(segment, latency)
+        while len(arrivals) > 1 and arrivals[0][0] < rolling.start_s:
+            arrivals.popleft()
+
+    def decode_window(*, final: bool) -> None:
+        started = time.perf_counter()
+        with timed_stage("live_decode"):
+            segments = rolling.step(final=final)
+        stats.decode_s += time.perf_counter() - started
+        stats.decodes += 1
+        emit(segments)
+
+    def drain(batch: deque[Any]) -> None:
+        while True:
+            try:
+                batch.append(items.get_nowait())
+            except queue.Empty:
+                return
+
+    def feed(item: Any) -> bool:
+        """Feed one item from the reader; return True at the end."""
+        if item is None:
+            return True
+        if isinstance(item, BaseException):
+            raise item
+        samples, arrived = item
+        rolling.feed(samples)
+        arrivals.append((rolling.end_s, arrived))
+        return False
+
+    batch: deque[Any] = deque()
+    ended = False
+    try:
+        while not ended:
+            try:
+                batch.append(items.get(timeout=0.5))
+            except queue.Empty:
+                continue
+            drain(batch)
+            while batch and not ended:
+                ended = feed(batch.popleft())
+            if not ended and rolling.pending_s >= step_s:
+                decode_window(final=False)
+    except KeyboardInterrupt:
+        # Keep the audio read so far: the rest of the batch and whatever
+        # the reader queued since. A source error now is not reported.
+        drain(batch)
+        while batch and not ended:
+            item = batch.popleft()
+            ended = isinstance(item, BaseException) or feed(item)
+    stats.audio_s = rolling.end_s
+    decode_window(final=True)
+    stats.language = rolling.language
+    return stats
+
+
+def _read_chunks(chunks: Iterable[Any], items: queue.Queue[Any]) -> None:
+    try:
+        for samples in chunks:
+            items.put((samples, time.monotonic()))
+    except Exception as exc:
+        items.put(exc)
+        return
+    items.put(None)
@@ -2,59 +2,259 @@
 
 from __future__ import annotations
 
+import json
 import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
+from .metrics import CACHE_LOOKUPS, timed_stage
 
-def get_audio_duration_s(audio_path: Path) -> float | None:
-    """Return media duration in seconds using ffprobe.
+PROBE_CACHE_SIZE = 1024
+
+_ProbeKey = tuple[str, int, int]
+
+_probe_cache: OrderedDict[_ProbeKey, MediaInfo] = OrderedDict()
+_probe_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class StreamInfo:
+    """One stream of a media file.
 
     Parameters
     ----------
-    audio_path:
+    index:
+        Stream index in the container.
+    codec_type:
+        ``audio``, ``video``, ``subtitle``, ...
+    codec_name:
+        Codec (e.g. ``aac``, ``pcm_s16le``).
+    sample_rate:
+        Audio sample rate in Hz.
+    channels:
+        Number of audio channels.
+    channel_layout:
+        Audio channel layout (e.g. ``stereo``).
+    duration_s:
+        Stream duration in seconds, if reported.
+    """
+
+    index: int
+    codec_type: str
+    codec_name: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    channel_layout: str | None = None
+    duration_s: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class MediaInfo:
+    """Result of a single ffprobe call.
+
+    Parameters
+    ----------
+    format_name:
+        Container format(s) as reported by ffprobe (e.g. ``wav``).
+    duration_s:
+        Media duration in seconds.
+    size_bytes:
+        File size in bytes.
+    bit_rate:
+        Overall bit rate in bits per second.
+    streams:
+        All streams of the file.
+    """
+
+    format_name: str | None
+    duration_s: float | None
+    size_bytes: int | None
+    bit_rate: int | None
+    streams: tuple[StreamInfo, ...] = ()
+
+    @property
+    def audio(self) -> StreamInfo | None:
+        """First audio stream, if any."""
+        for stream in self.streams:
+            if stream.codec_type == "audio":
+                return stream
+        return None
+
+    @property
+    def has_video(self) -> bool:
+        """Whether the file has a video stream."""
+        return any(s.codec_type == "video" for s in self.streams)
+
+    def is_pcm_wav(self, *, sample_rate: int, channels: int = 1) -> bool:
+        """Whether the file is a 16-bit PCM WAV with this layout.
+
+        Such files need no ffmpeg conversion.
+        """
+        audio = self.audio
+        return (
+            self.format_name == "wav"
+            and len(self.streams) == 1
+            and audio is not None
+            and audio.codec_name == "pcm_s16le"
+            and audio.sample_rate == sample_rate
+            and audio.channels == channels
+        )
+
+
+def _float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_probe(data: dict[str, Any]) -> MediaInfo:
+    """Build a :class:`MediaInfo` from ffprobe's JSON output."""
+    fmt = data.get("format") or {}
+    streams = tuple(
+        StreamInfo(
+            index=_int(raw.get("index")) or 0,
+            codec_type=str(raw.get("codec_type") or ""),
+            codec_name=raw.get("codec_name"),
+            sample_rate=_int(raw.get("sample_rate")),
+            channels=_int(raw.get("channels")),
+            channel_layout=raw.get("channel_layout"),
+            duration_s=_float(raw.get("duration")),
+        )
+        for raw in data.get("streams") or []
+    )
+    duration = _float(fmt.get("duration"))
+    if duration is None:
+        durations = [s.duration_s for s in streams if s.duration_s]
+        duration = max(durations) if durations else None
+    if duration is not None and duration <= 0.0:
+        duration = None
+    return MediaInfo(
+        format_name=fmt.get("format_name"),
+        duration_s=duration,
+        size_bytes=_int(fmt.get("size")),
+        bit_rate=_int(fmt.get("bit_rate")),
+        streams=streams,
+    )
+
+
+def _probe_key(path: Path) -> _ProbeKey | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def cached_probe(path: Path) -> MediaInfo | None:
+    """Return the cached probe of ``path`` without running ffprobe.
+
+    Later stages use this to take fast paths when an earlier stage has
+    already probed the file.
+    """
+    key = _probe_key(path)
+    if key is None:
+        return None
+    with _probe_lock:
+        info = _probe_cache.get(key)
+        if info is not None:
+            _probe_cache.move_to_end(key)
+        return info
+
+
+def probe_media(path: Path) -> MediaInfo | None:
+    """Probe a media file once and cache the result.
+
+    Duration, container, codecs, sample rates, channels and stream layout
+    come from a single ``ffprobe`` JSON call. Results are cached in
+    process by (resolved path, size, mtime), so every stage of a job (and
+    every job on the same unchanged file) shares one probe.
+
+    Parameters
+    ----------
+    path:
         Path to a local media file supported by ffprobe.
 
     Returns
     -------
-    float | None
-        Duration in seconds if available; otherwise None.
+    MediaInfo | None
+        Probe result, or ``None`` if ffprobe is unavailable or fails.
 
     Notes
     -----
     This function relies on the `ffprobe` executable being available in PATH.
     """
+    info = cached_probe(path)
+    CACHE_LOOKUPS.inc(
+        cache="probe",
+        result="miss" if info is None else "hit",
+    )
+    if info is not None:
+        return info
+
+    key = _probe_key(path)
     cmd = [
         "ffprobe",
         "-v",
         "error",
-        "-show_entries",
-        "format=duration",
+        "-show_format",
+        "-show_streams",
         "-of",
-        "default=noprint_wrappers=1:nokey=1",
-        str(audio_path),
+        "json",
+        str(path),
     ]
     try:
-        proc = subprocess.run(
-            cmd,
-            check=False,
-            capture_output=True,
-            text=True,
-        )
+        with timed_stage("probe"):
+            proc = subprocess.run(
+                cmd,
+                check=False,
+                capture_output=True,
+                text=True,
+            )
     except OSError:
         return None
 
     if proc.returncode != 0:
         return None
 
-    val = (proc.stdout or "").strip()
-    if not val:
-        return None
-
     try:
-        dur = float(val)
+        data = json.loads(proc.stdout or "")
     except ValueError:
         return None
-
-    if dur <= 0.0:
+    if not isinstance(data, dict):
         return None
-    return dur
+
+    info = parse_probe(data)
+    if key is not None:
+        with _probe_lock:
+            _probe_cache[key] = info
+            while len(_probe_cache) > PROBE_CACHE_SIZE:
+                _probe_cache.popitem(last=False)
+    return info
+
+
+def get_audio_duration_s(audio_path: Path) -> float | None:
+    """Return media duration in seconds using the shared probe.
+
+    Parameters
+    ----------
+    audio_path:
+        Path to a local media file supported by ffprobe.
+
+    Returns
+    -------
+    float | None
+        Duration in seconds if available; otherwise None.
+    """
+    info = probe_media(audio_path)
+    return None if info is None else info.duration_s
@@ -0,0 +1,413 @@
+"""Per-stage timings and Prometheus metrics."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+_T = TypeVar("_T")
+_M = TypeVar("_M", bound="_Metric")
+
+LabelValues = tuple[str, ...]
+
+STAGE_BUCKETS = (
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+    1800.0,
+    3600.0,
+)
+RTF_BUCKETS = (0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+LATENCY_BUCKETS = (0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"'
+        for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        *,
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, "
+                f"got {tuple(labels)}."
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Return the series in Prometheus text format."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        *,
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(name, help_text, labelnames=labelnames)
+        self._values: dict[LabelValues, float] = {}
+        if not labelnames:
+            self._values[()] = 0.0
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add ``amount`` to the series selected by ``labels``."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current value of a series."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        """Return the series in Prometheus text format."""
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Subtract ``amount`` from the series selected by ``labels``."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets.
+
+    Parameters
+    ----------
+    name:
+        Metric name.
+    help_text:
+        Description shown in ``# HELP``.
+    buckets:
+        Upper bounds of the buckets, ascending.
+    labelnames:
+        Names of the labels distinguishing series.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        *,
+        buckets: tuple[float, ...] = STAGE_BUCKETS,
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(name, help_text, labelnames=labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations of a series."""
+        with self._lock:
+            counts = self._counts.get(self._key(labels))
+            return counts[-1] if counts else 0
+
+    def render(self) -> list[str]:
+        """Return the series in Prometheus text format."""
+        lines = self._header()
+        names = (*self.labelnames, "le")
+        with self._lock:
+            for key, counts in sorted(self._counts.items()):
+                for bound, count in zip(self.buckets, counts, strict=True):
+                    labels = _format_labels(
+                        names, (*key, _format_value(bound))
+                    )
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key)
+                total = _format_value(self._sums[key])
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _M) -> _M:
+        """Add ``metric`` and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "scribebox_stage_seconds",
+        "Wall-clock time spent per pipeline stage and run.",
+        labelnames=("stage",),
+    )
+)
+AUDIO_SECONDS = REGISTRY.register(
+    Counter(
+        "scribebox_audio_seconds_total",
+        "Seconds of audio transcribed (cache hits excluded).",
+    )
+)
+REAL_TIME_FACTOR = REGISTRY.register(
+    Histogram(
+        "scribebox_real_time_factor",
+        "Processing time divided by audio duration per run.",
+        buckets=RTF_BUCKETS,
+    )
+)
+MODEL_LOADS = REGISTRY.register(
+    Counter(
+        "scribebox_model_loads_total",
+        "Models loaded into memory.",
+        labelnames=("backend", "model"),
+    )
+)
+CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "scribebox_cache_lookups_total",
+        "Cache lookups by cache and result (hit or miss).",
+        labelnames=("cache", "result"),
+    )
+)
+VAD_SKIPPED_SECONDS = REGISTRY.register(
+    Counter(
+        "scribebox_vad_skipped_seconds_total",
+        "Seconds of non-speech audio cut out before decoding.",
+    )
+)
+REFINE_AUDIO_SECONDS = REGISTRY.register(
+    Counter(
+        "scribebox_refine_audio_seconds_total",
+        "Audio seconds decoded by draft-and-refine runs, by pass "
+        "(draft or refine).",
+        labelnames=("decode",),
+    )
+)
+LIVE_LATENCY = REGISTRY.register(
+    Histogram(
+        "scribebox_live_latency_seconds",
+        "Live transcription latency from a segment's last audio arriving "
+        "to the segment being emitted.",
+        buckets=LATENCY_BUCKETS,
+    )
+)
+JOBS = REGISTRY.register(
+    Gauge(
+        "scribebox_jobs",
+        "Jobs currently queued or running.",
+        labelnames=("state",),
+    )
+)
+JOBS_FINISHED = REGISTRY.register(
+    Counter(
+        "scribebox_jobs_finished_total",
+        "Jobs finished, by final status.",
+        labelnames=("status",),
+    )
+)
+ADMISSION_DECODES = REGISTRY.register(
+    Gauge(
+        "scribebox_admission_decodes",
+        "Decodes currently holding an admission slot.",
+    )
+)
+ADMISSION_OUTSTANDING_AUDIO = REGISTRY.register(
+    Gauge(
+        "scribebox_admission_outstanding_audio_seconds",
+        "Audio seconds admitted (queued or running) and not finished.",
+    )
+)
+ADMISSION_REJECTIONS = REGISTRY.register(
+    Counter(
+        "scribebox_admission_rejections_total",
+        "Requests turned away by admission control, by limit.",
+        labelnames=("reason",),
+    )
+)
+
+
+class StageTimer:
+    """Accumulated wall-clock time per stage for one run."""
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add ``seconds`` to ``stage``."""
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+
+_current: ContextVar[StageTimer | None] = ContextVar(
+    "scribebox_stage_timer",
+    default=None,
+)
+
+
+# Seconds spent in stages nested inside the innermost running one.
+_nested: ContextVar[list[float] | None] = ContextVar(
+    "scribebox_nested_stage_seconds",
+    default=None,
+)
+
+
+@contextmanager
+def collect_stages() -> Iterator[StageTimer]:
+    """Collect stage timings for the enclosed run.
+
+    Nested calls share the outermost timer, so a caller can wrap work
+    done before the pipeline (e.g. a download) into the same run. When
+    the outermost block exits, each stage is observed once in
+    ``scribebox_stage_seconds``.
+    """
+    timer = _current.get()
+    if timer is not None:
+        yield timer
+        return
+
+    timer = StageTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+        for stage, seconds in timer.timings.items():
+            STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """Time the enclosed block as ``stage``.
+
+    The time is added to the active :func:`collect_stages` timer, or
+    observed directly when no run is being collected. Stages are
+    exclusive: time spent in a stage nested inside this one (e.g. a
+    model load during ``transcribe``) counts only for the inner stage,
+    so the stages of a run add up to its elapsed time.
+    """
+    parent = _nested.get()
+    nested = [0.0]
+    token = _nested.set(nested)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        total = time.perf_counter() - started
+        _nested.reset(token)
+        if parent is not None:
+            parent[0] += total
+        elapsed = max(0.0, total - nested[0])
+        timer = _current.get()
+        if timer is not None:
+            timer.add(stage, elapsed)
+        else:
+            STAGE_SECONDS.observe(elapsed, stage=stage)
+
+
+def timed_iter(items: Iterable[_T], stage: str) -> Iterator[_T]:
+    """Yield from ``items``, timing only the time spent producing them."""
+    iterator = iter(items)
+    while True:
+        with timed_stage(stage):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def observe_run(*, audio_s: float | None, elapsed_s: float) -> None:
+    """Record audio processed and the real-time factor of a decoded run."""
+    if audio_s is None or audio_s <= 0.0:
+        return
+    AUDIO_SECONDS.inc(audio_s)
+    REAL_TIME_FACTOR.observe(elapsed_s / audio_s)
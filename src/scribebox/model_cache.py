@@ -0,0 +1,368 @@
+"""Process-wide cache of loaded speech models."""
+
+from __future__ import annotations
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .metrics import MODEL_LOADS, timed_stage
+
+ModelLoader = Callable[[], Any]
+
+_ENV_MAX_MODELS = "SCRIBEBOX_MODEL_CACHE_SIZE"
+_ENV_MAX_RSS_MB = "SCRIBEBOX_MODEL_CACHE_MAX_RSS_MB"
+
+
+@dataclass(frozen=True, slots=True)
+class ModelKey:
+    """Identity of a loaded model.
+
+    Parameters
+    ----------
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    model:
+        Model name or path.
+    device:
+        Inference device (e.g. ``cpu``, ``cuda``).
+    compute_type:
+        Quantization/compute type, when the backend supports it.
+    cpu_threads:
+        Intra-op CPU threads the model was created with (0: default).
+    num_workers:
+        Concurrent decodes the model was created for.
+    """
+
+    backend: str
+    model: str
+    device: str
+    compute_type: str | None = None
+    cpu_threads: int = 0
+    num_workers: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class ModelCacheStats:
+    """Counters describing cache effectiveness.
+
+    Parameters
+    ----------
+    hits:
+        Number of requests served by an already loaded model.
+    misses:
+        Number of requests that required loading a model.
+    evictions:
+        Number of models dropped to stay within budget.
+    load_time_s:
+        Total wall-clock time spent loading models (seconds).
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    load_time_s: float = 0.0
+
+
+class ModelCache:
+    """LRU cache of loaded models bounded by count and process RSS.
+
+    Parameters
+    ----------
+    max_models:
+        Maximum number of models kept warm at the same time.
+    max_rss_bytes:
+        Optional resident-memory budget for the whole process. When the
+        process exceeds it, least recently used models are evicted (the
+        most recently used model is always kept).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_models: int = 1,
+        max_rss_bytes: int | None = None,
+    ) -> None:
+        if max_models < 1:
+            raise ValueError("max_models must be >= 1.")
+        self._max_models = max_models
+        self._max_rss_bytes = max_rss_bytes
+        self._models: OrderedDict[ModelKey, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[ModelKey, threading.Lock] = {}
+        self._stats = ModelCacheStats()
+
+    @property
+    def max_models(self) -> int:
+        """Maximum number of warm models."""
+        return self._max_models
+
+    @property
+    def max_rss_bytes(self) -> int | None:
+        """Resident-memory budget in bytes, if any."""
+        return self._max_rss_bytes
+
+    def get(self, key: ModelKey, loader: ModelLoader) -> Any:
+        """Return a warm model for ``key``, loading it on a miss.
+
+        Parameters
+        ----------
+        key:
+            Model identity.
+        loader:
+            Zero-argument callable that loads the model.
+
+        Returns
+        -------
+        Any
+            The loaded model instance.
+        """
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self._stats = replace(self._stats, hits=self._stats.hits + 1)
+                return model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    self._stats = replace(
+                        self._stats, hits=self._stats.hits + 1
+                    )
+                    return model
+                self._evict_locked(reserve=1)
+
+            start = time.perf_counter()
+            try:
+                with timed_stage("model_load"):
+                    model = loader()
+            except BaseException:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                raise
+            elapsed = time.perf_counter() - start
+            MODEL_LOADS.inc(backend=key.backend, model=key.model)
+
+            with self._lock:
+                self._models[key] = model
+                self._stats = replace(
+                    self._stats,
+                    misses=self._stats.misses + 1,
+                    load_time_s=self._stats.load_time_s + elapsed,
+                )
+                self._evict_locked(reserve=0)
+                self._key_locks.pop(key, None)
+            return model
+
+    def stats(self) -> ModelCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return self._stats
+
+    def keys(self) -> list[ModelKey]:
+        """Return cached keys, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def clear(self) -> None:
+        """Drop every cached model."""
+        with self._lock:
+            self._models.clear()
+        gc.collect()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def _evict_locked(self, *, reserve: int) -> None:
+        evicted = 0
+        while self._models and (
+            len(self._models) + reserve > self._max_models
+        ):
+            self._models.popitem(last=False)
+            evicted += 1
+
+        if self._max_rss_bytes is not None:
+            # Always keep the most recently used model when it was just
+            # loaded; when making room before a load, everything may go.
+            keep = 0 if reserve else 1
+            while len(self._models) > keep:
+                rss = current_rss_bytes()
+                if rss is None or rss <= self._max_rss_bytes:
+                    break
+                self._models.popitem(last=False)
+                evicted += 1
+                gc.collect()
+
+        if evicted:
+            gc.collect()
+            self._stats = replace(
+                self._stats, evictions=self._stats.evictions + evicted
+            )
+
+
+def current_rss_bytes() -> int | None:
+    """Return the current resident memory of this process in bytes."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            fields = fh.read().split()
+    except OSError:
+        return None
+    try:
+        return int(fields[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IndexError, ValueError, OSError):
+        return None
+
+
+_default_cache: ModelCache | None = None
+_default_lock = threading.Lock()
+
+
+def _cache_from_env() -> ModelCache:
+    max_models = 1
+    raw_models = os.environ.get(_ENV_MAX_MODELS, "").strip()
+    if raw_models:
+        max_models = max(1, int(raw_models))
+
+    max_rss: int | None = None
+    raw_rss = os.environ.get(_ENV_MAX_RSS_MB, "").strip()
+    if raw_rss:
+        max_rss = int(float(raw_rss) * 1024 * 1024)
+
+    return ModelCache(max_models=max_models, max_rss_bytes=max_rss)
+
+
+def get_model_cache() -> ModelCache:
+    """Return the process-wide model cache.
+
+    The cache is created on first use. Its budget can be set with the
+    ``SCRIBEBOX_MODEL_CACHE_SIZE`` (model count) and
+    ``SCRIBEBOX_MODEL_CACHE_MAX_RSS_MB`` environment variables, or replaced
+    with :func:`configure_model_cache`.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = _cache_from_env()
+        return _default_cache
+
+
+def configure_model_cache(
+    *,
+    max_models: int = 1,
+    max_rss_bytes: int | None = None,
+) -> ModelCache:
+    """Replace the process-wide model cache with a new budget.
+
+    Parameters
+    ----------
+    max_models:
+        Maximum number of warm models.
+    max_rss_bytes:
+        Optional process resident-memory budget in bytes.
+
+    Returns
+    -------
+    ModelCache
+        The new process-wide cache.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is not None:
+            _default_cache.clear()
+        _default_cache = ModelCache(
+            max_models=max_models,
+            max_rss_bytes=max_rss_bytes,
+        )
+        return _default_cache
+
+
+def load_faster_whisper_model(
+    model: str,
+    *,
+    device: str,
+    compute_type: str = "default",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+) -> Any:
+    """Return a warm ``faster_whisper.WhisperModel``.
+
+    ``cpu_threads`` and ``num_workers`` are fixed when the model is
+    created, so they are part of its cache key.
+
+    Raises
+    ------
+    ImportError
+        If faster-whisper is not installed.
+    """
+    key = ModelKey(
+        backend="faster-whisper",
+        model=model,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+    def _load() -> Any:
+        try:
+            from faster_whisper import WhisperModel
+        except Exception as exc:  # pragma: no cover
+            raise ImportError(
+                "faster-whisper is not installed. "
+                "Install with: pip install -e '.[faster-whisper]'"
+            ) from exc
+        return WhisperModel(
+            model,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+        )
+
+    return get_model_cache().get(key, _load)
+
+
+def load_whisper_model(
+    model: str,
+    *,
+    device: str,
+    cpu_threads: int = 0,
+) -> Any:
+    """Return a warm openai-whisper model.
+
+    PyTorch's thread pool is process-wide, so a non-zero ``cpu_threads``
+    is applied on every call rather than stored with the model.
+
+    Raises
+    ------
+    ImportError
+        If openai-whisper is not installed.
+    """
+    key = ModelKey(backend="whisper", model=model, device=device)
+
+    def _load() -> Any:
+        try:
+            import whisper
+        except Exception as exc:  # pragma: no cover
+            raise ImportError(
+                "openai-whisper is not installed. "
+                "Install with: pip install -e '.[whisper]'"
+            ) from exc
+        return whisper.load_model(model, device=device)
+
+    loaded = get_model_cache().get(key, _load)
+    if cpu_threads > 0:
+        import torch
+
+        torch.set_num_threads(cpu_threads)
+    return loaded
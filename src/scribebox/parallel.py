@@ -0,0 +1,309 @@
+"""Chunked parallel transcription of long audio."""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import tempfile
+import wave
+from collections import Counter
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .backends import ProgressCallback, TranscribeOptions
+from .ffmpeg import convert_to_wav_16k_mono, detect_silences
+from .types import SegmentTable, Transcript, TranscriptSegment
+
+MAX_CHUNK_S = 600.0
+MIN_CHUNK_S = 30.0
+OVERLAP_S = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class AudioChunk:
+    """A slice of the input audio assigned to one worker.
+
+    Parameters
+    ----------
+    index:
+        Position of the chunk in the timeline.
+    start_s:
+        Start of the region this chunk owns (seconds).
+    end_s:
+        End of the region this chunk owns (seconds).
+    window_start_s:
+        Start of the decoded window, including leading overlap.
+    window_end_s:
+        End of the decoded window, including trailing overlap.
+    """
+
+    index: int
+    start_s: float
+    end_s: float
+    window_start_s: float
+    window_end_s: float
+
+
+def plan_chunks(
+    *,
+    duration_s: float,
+    silences: list[tuple[float, float]],
+    num_chunks: int,
+    overlap_s: float = OVERLAP_S,
+    min_chunk_s: float = MIN_CHUNK_S,
+) -> list[AudioChunk]:
+    """Split a timeline into chunks cut at silence boundaries.
+
+    Each ideal cut point (an even split of the timeline) is moved to the
+    middle of the nearest silence within half a chunk; when no silence is
+    close enough the cut stays at the ideal point and the overlap takes
+    care of words straddling it.
+
+    Parameters
+    ----------
+    duration_s:
+        Total audio duration in seconds.
+    silences:
+        ``(start_s, end_s)`` silent stretches, as from
+        :func:`scribebox.ffmpeg.detect_silences`.
+    num_chunks:
+        Desired number of chunks.
+    overlap_s:
+        Extra audio decoded on each side of a cut.
+    min_chunk_s:
+        Chunks are never shorter than this (except a single short input).
+
+    Returns
+    -------
+    list[AudioChunk]
+        Chunks in timeline order.
+    """
+    num_chunks = max(1, min(num_chunks, int(duration_s // min_chunk_s)))
+    step = duration_s / num_chunks
+
+    mids = [
+        (start + min(end, duration_s)) / 2.0
+        for start, end in silences
+        if start < duration_s
+    ]
+
+    cuts: list[float] = []
+    prev = 0.0
+    for k in range(1, num_chunks):
+        ideal = k * step
+        near = [m for m in mids if abs(m - ideal) <= step / 2.0]
+        cut = min(near, key=lambda m: abs(m - ideal)) if near else ideal
+        if cut - prev < min_chunk_s or duration_s - cut < min_chunk_s:
+            continue
+        cuts.append(cut)
+        prev = cut
+
+    bounds = [0.0, *cuts, duration_s]
+    chunks: list[AudioChunk] = []
+    for i in range(len(bounds) - 1):
+        start, end = bounds[i], bounds[i + 1]
+        chunks.append(
+            AudioChunk(
+                index=i,
+                start_s=start,
+                end_s=end,
+                window_start_s=max(0.0, start - overlap_s),
+                window_end_s=min(duration_s, end + overlap_s),
+            )
+        )
+    return chunks
+
+
+def stitch_segments(
+    chunks: list[AudioChunk],
+    results: Sequence[Sequence[TranscriptSegment]],
+) -> SegmentTable:
+    """Merge per-chunk segments into one timeline.
+
+    Segment timestamps must already be offset to the original timeline.
+    A segment is kept by the chunk that owns its midpoint, and an
+    identical segment repeated across a boundary is dropped.
+
+    Parameters
+    ----------
+    chunks:
+        Chunks in timeline order.
+    results:
+        Offset segments for each chunk, in the same order.
+
+    Returns
+    -------
+    SegmentTable
+        Ordered, de-duplicated segments.
+    """
+    merged = SegmentTable()
+    last = len(chunks) - 1
+    for chunk, segments in zip(chunks, results, strict=True):
+        for seg in segments:
+            mid = (seg.start_s + seg.end_s) / 2.0
+            if mid < chunk.start_s and chunk.index > 0:
+                continue
+            if mid >= chunk.end_s and chunk.index < last:
+                continue
+            if merged and _is_duplicate(merged[-1], seg):
+                continue
+            merged.append(seg.start_s, seg.end_s, seg.text)
+    return merged
+
+
+def _is_duplicate(prev: TranscriptSegment, seg: TranscriptSegment) -> bool:
+    return (
+        seg.text.strip().lower() == prev.text.strip().lower()
+        and seg.start_s < prev.end_s
+    )
+
+
+def transcribe_parallel(
+    *,
+    audio_path: Path,
+    backend: str,
+    options: TranscribeOptions,
+    workers: int,
+    progress_cb: ProgressCallback | None = None,
+    overlap_s: float = OVERLAP_S,
+    max_chunk_s: float = MAX_CHUNK_S,
+) -> tuple[Transcript, float]:
+    """Transcribe long audio as concurrent chunks in a process pool.
+
+    The input is converted once to 16 kHz mono WAV, split at silences and
+    each chunk is decoded in a separate process with its own model and an
+    even share of the CPU threads.
+
+    Parameters
+    ----------
+    audio_path:
+        Path to a local media file.
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    options:
+        Transcription options.
+    workers:
+        Number of worker processes.
+    progress_cb:
+        Optional callback receiving the seconds of audio completed.
+    overlap_s:
+        Extra audio decoded on each side of a cut.
+    max_chunk_s:
+        Upper bound on chunk length; long inputs get more chunks than
+        workers so the pool stays balanced.
+
+    Returns
+    -------
+    tuple[Transcript, float]
+        The stitched transcript and the audio duration in seconds.
+    """
+    with tempfile.TemporaryDirectory(prefix="scribebox_chunks_") as tmpdir:
+        tmp = Path(tmpdir)
+        wav_path = convert_to_wav_16k_mono(audio_path, tmp / "audio.wav")
+
+        with wave.open(str(wav_path), "rb") as wf:
+            duration_s = wf.getnframes() / float(wf.getframerate())
+
+        num_chunks = max(workers, math.ceil(duration_s / max_chunk_s))
+        chunks = plan_chunks(
+            duration_s=duration_s,
+            silences=detect_silences(wav_path),
+            num_chunks=num_chunks,
+            overlap_s=overlap_s,
+        )
+        chunk_paths = _write_chunks(wav_path, chunks, tmp)
+
+        threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+        # A tuned thread count is for one decode owning the host.
+        options = replace(
+            options,
+            cpu_threads=min(options.cpu_threads or threads, threads),
+        )
+        results: list[SegmentTable] = [SegmentTable() for _ in chunks]
+        languages: Counter[str] = Counter()
+        done_s = 0.0
+
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(backend, threads),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _transcribe_chunk,
+                    chunk_path=path,
+                    offset_s=chunk.window_start_s,
+                    backend=backend,
+                    options=options,
+                ): chunk
+                for chunk, path in zip(chunks, chunk_paths, strict=True)
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                segments, language = future.result()
+                results[chunk.index] = segments
+                if language:
+                    languages[language] += 1
+                done_s += chunk.end_s - chunk.start_s
+                if progress_cb is not None:
+                    progress_cb(done_s)
+
+    segments = stitch_segments(chunks, results)
+    language = languages.most_common(1)[0][0] if languages else None
+    transcript = Transcript(segments=segments, language=language)
+    return transcript, duration_s
+
+
+def _write_chunks(
+    wav_path: Path,
+    chunks: list[AudioChunk],
+    outdir: Path,
+) -> list[Path]:
+    paths: list[Path] = []
+    with wave.open(str(wav_path), "rb") as src:
+        rate = src.getframerate()
+        params = src.getparams()
+        for chunk in chunks:
+            first = int(chunk.window_start_s * rate)
+            count = int(chunk.window_end_s * rate) - first
+            src.setpos(first)
+            frames = src.readframes(count)
+
+            path = outdir / f"chunk_{chunk.index:05d}.wav"
+            with wave.open(str(path), "wb") as dst:
+                dst.setparams(params)
+                dst.writeframes(frames)
+            paths.append(path)
+    return paths
+
+
+def _init_worker(backend: str, threads: int) -> None:
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    if backend == "whisper":
+        try:
+            import torch
+        except Exception:  # pragma: no cover
+            return
+        torch.set_num_threads(threads)
+
+
+def _transcribe_chunk(
+    *,
+    chunk_path: Path,
+    offset_s: float,
+    backend: str,
+    options: TranscribeOptions,
+) -> tuple[SegmentTable, str | None]:
+    from . import backends
+
+    transcript = backends.transcribe_file(
+        audio_path=chunk_path,
+        backend=backend,
+        options=options,
+    )
+    return transcript.segments.shifted(offset_s), transcript.language
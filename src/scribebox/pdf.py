@@ -2,31 +2,157 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from functools import lru_cache
 from pathlib import Path
+from types import TracebackType
 
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
 from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen.canvas import Canvas
 
+from .types import Segment, SegmentTable
+
+
+class PdfWriter:
+    """Lay out a plain-text PDF incrementally.
+
+    Lines are wrapped and drawn as they are written, so callers can feed
+    transcript segments while they are decoded instead of building the
+    whole text first. Pages are not streamed to disk: ReportLab keeps
+    every finished (compressed) page in memory until :meth:`close`, so
+    memory still grows with the length of the transcript.
+
+    Parameters
+    ----------
+    output_path:
+        Destination PDF path.
+    title:
+        Optional title shown at the top.
+    font_name:
+        ReportLab font name.
+    font_size:
+        Base font size for body text.
+    margin_in:
+        Page margins in inches.
+    compress:
+        Deflate page content streams.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        *,
+        title: str | None = None,
+        font_name: str = "Helvetica",
+        font_size: int = 11,
+        margin_in: float = 0.75,
+        compress: bool = True,
+    ) -> None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = output_path
+        self.pages = 1
+        self._font_name = font_name
+        self._font_size = font_size
+        self._canvas = Canvas(
+            str(output_path),
+            pagesize=LETTER,
+            pageCompression=1 if compress else 0,
+        )
+        width, self._height = LETTER
+        self._margin = margin_in * inch
+        self._usable_width = width - 2 * self._margin
+        self._line_height = font_size * 1.35
+        self._y = self._height - self._margin
+        self._closed = False
+
+        if title:
+            self._canvas.setFont(font_name, font_size + 3)
+            self._draw_wrapped(title, font_size + 3)
+            self._y -= self._line_height * 0.25
+        self._canvas.setFont(font_name, font_size)
+
+    def __enter__(self) -> PdfWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write(self, text: str) -> None:
+        """Append ``text``; each of its lines starts a new paragraph."""
+        for raw in text.splitlines() or [""]:
+            if not raw.strip():
+                self._y -= self._line_height
+                self._ensure_page()
+                continue
+            self._draw_wrapped(raw, self._font_size)
+
+    def write_segments(
+        self,
+        segments: SegmentTable | Iterable[Segment],
+    ) -> None:
+        """Append the non-empty text of each segment as a paragraph."""
+        texts = (
+            segments.texts()
+            if isinstance(segments, SegmentTable)
+            else (seg.text for seg in segments)
+        )
+        for text in texts:
+            text = text.strip()
+            if text:
+                self.write(text)
+
+    def close(self) -> None:
+        """Finish the last page and write the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._canvas.save()
+
+    def _ensure_page(self) -> None:
+        if self._y >= self._margin:
+            return
+        self._canvas.showPage()
+        self._canvas.setFont(self._font_name, self._font_size)
+        self._y = self._height - self._margin
+        self.pages += 1
+
+    def _draw_wrapped(self, line: str, size: int) -> None:
+        for wrapped in _wrap_line(
+            line=line,
+            usable_width=self._usable_width,
+            font_name=self._font_name,
+            font_size=size,
+        ):
+            self._ensure_page()
+            self._canvas.drawString(self._margin, self._y, wrapped)
+            self._y -= self._line_height
+
 
 def write_pdf(
+    output_path: Path,
     *,
     text: str,
-    output_path: Path,
     title: str | None = None,
     font_name: str = "Helvetica",
     font_size: int = 11,
     margin_in: float = 0.75,
+    compress: bool = True,
 ) -> None:
     """Write a plain-text PDF.
 
     Parameters
     ----------
-    text:
-        Text to write.
     output_path:
         Destination PDF path.
+    text:
+        Text to write.
     title:
         Optional title shown at the top.
     font_name:
@@ -35,53 +161,24 @@ def write_pdf(
         Base font size for body text.
     margin_in:
         Page margins in inches.
+    compress:
+        Deflate page content streams.
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with PdfWriter(
+        output_path,
+        title=title,
+        font_name=font_name,
+        font_size=font_size,
+        margin_in=margin_in,
+        compress=compress,
+    ) as writer:
+        for raw in text.splitlines():
+            writer.write(raw)
 
-    canvas = Canvas(str(output_path), pagesize=LETTER)
-    width, height = LETTER
 
-    margin = margin_in * inch
-    usable_width = width - 2 * margin
-    y = height - margin
-    line_height = font_size * 1.35
-
-    def ensure_page(ypos: float) -> float:
-        if ypos >= margin:
-            return ypos
-        canvas.showPage()
-        canvas.setFont(font_name, font_size)
-        _, h = LETTER
-        return h - margin
-
-    def draw_wrapped(ypos: float, line: str, size: int) -> float:
-        for wrapped in _wrap_line(
-            line=line,
-            usable_width=usable_width,
-            font_name=font_name,
-            font_size=size,
-        ):
-            ypos = ensure_page(ypos)
-            canvas.drawString(margin, ypos, wrapped)
-            ypos -= line_height
-        return ypos
-
-    canvas.setFont(font_name, font_size)
-
-    if title:
-        canvas.setFont(font_name, font_size + 3)
-        y = draw_wrapped(y, title, font_size + 3)
-        y -= line_height * 0.25
-        canvas.setFont(font_name, font_size)
-
-    for raw in text.splitlines():
-        if not raw.strip():
-            y -= line_height
-            y = ensure_page(y)
-            continue
-        y = draw_wrapped(y, raw, font_size)
-
-    canvas.save()
+@lru_cache(maxsize=65536)
+def _text_width(text: str, font_name: str, font_size: int) -> float:
+    return float(stringWidth(text, font_name, font_size))
 
 
 def _wrap_line(
@@ -95,21 +192,28 @@ def _wrap_line(
     if not words:
         return [""]
 
+    # Each word is measured once (and cached across lines); the running
+    # width of the current line is extended instead of re-measured.
+    space = _text_width(" ", font_name, font_size)
     out: list[str] = []
     cur: list[str] = []
+    cur_width = 0.0
 
     for word in words:
-        trial = " ".join([*cur, word])
-        if stringWidth(trial, font_name, font_size) <= usable_width:
+        width = _text_width(word, font_name, font_size)
+        if cur and cur_width + space + width <= usable_width:
             cur.append(word)
+            cur_width += space + width
             continue
 
         if cur:
             out.append(" ".join(cur))
+            cur = []
+        if width <= usable_width:
             cur = [word]
-            continue
-
-        out.append(word)
+            cur_width = width
+        else:
+            out.append(word)
 
     if cur:
         out.append(" ".join(cur))
@@ -0,0 +1,358 @@
+"""Two-pass draft-and-refine decoding.
+
+A small model transcribes everything; segments it is unsure about are
+re-decoded with the large model and spliced back into the timeline.
+Most speech comes out the same with both models, so only a fraction of
+the audio pays for the large one.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from . import backends
+from .backends import (
+    ProgressCallback,
+    SegmentConfidence,
+    SegmentStream,
+    TranscribeOptions,
+)
+from .media import get_audio_duration_s
+from .metrics import REFINE_AUDIO_SECONDS, timed_stage
+from .types import TranscriptSegment
+
+# Whisper's own temperature-fallback thresholds.
+MIN_AVG_LOGPROB = -1.0
+MAX_COMPRESSION_RATIO = 2.4
+MAX_NO_SPEECH_PROB = 0.6
+# Audio decoded on each side of a region for context; the large model's
+# output there is dropped.
+REGION_PAD_S = 1.0
+# Low-confidence segments closer than this are re-decoded as one region.
+MERGE_GAP_S = 2.0
+# Trailing transcript text passed as the prompt of a region.
+PROMPT_CHARS = 200
+
+
+@dataclass(frozen=True, slots=True)
+class RefineThresholds:
+    """When a draft segment is re-decoded.
+
+    Parameters
+    ----------
+    min_avg_logprob:
+        Re-decode below this average token log probability.
+    max_compression_ratio:
+        Re-decode above this compression ratio (repetitive text).
+    max_no_speech_prob:
+        Re-decode text the model itself thinks may not be speech.
+    """
+
+    min_avg_logprob: float = MIN_AVG_LOGPROB
+    max_compression_ratio: float = MAX_COMPRESSION_RATIO
+    max_no_speech_prob: float = MAX_NO_SPEECH_PROB
+
+    def is_low(self, confidence: SegmentConfidence | None) -> bool:
+        """Return whether a segment should be re-decoded.
+
+        Segments without signals (``None``) are kept as drafted.
+        """
+        if confidence is None:
+            return False
+        logprob = confidence.avg_logprob
+        ratio = confidence.compression_ratio
+        no_speech = confidence.no_speech_prob
+        return (
+            (logprob is not None and logprob < self.min_avg_logprob)
+            or (ratio is not None and ratio > self.max_compression_ratio)
+            or (no_speech is not None and no_speech > self.max_no_speech_prob)
+        )
+
+
+@dataclass(slots=True)
+class RefineStats:
+    """What a draft-and-refine decode did, updated as it runs.
+
+    Parameters
+    ----------
+    audio_s:
+        Audio seconds covered by the draft pass.
+    draft_s:
+        Wall-clock seconds spent in the draft pass.
+    refine_s:
+        Wall-clock seconds spent re-decoding regions (model load
+        excluded).
+    redecoded_s:
+        Audio seconds re-decoded with the large model, padding included.
+    regions:
+        Number of regions re-decoded.
+    """
+
+    audio_s: float = 0.0
+    draft_s: float = 0.0
+    refine_s: float = 0.0
+    redecoded_s: float = 0.0
+    regions: int = 0
+
+    @property
+    def redecoded_fraction(self) -> float | None:
+        """Fraction of the audio re-decoded with the large model."""
+        if self.audio_s <= 0.0:
+            return None
+        return min(1.0, self.redecoded_s / self.audio_s)
+
+    @property
+    def elapsed_s(self) -> float:
+        """Measured wall-clock seconds of both passes."""
+        return self.draft_s + self.refine_s
+
+    @property
+    def speedup_upper_bound(self) -> float | None:
+        """Upper bound on the speedup over the large model alone.
+
+        Not a measurement: the large model's real-time factor is taken
+        from the re-decoded regions, where every short region pays its
+        own audio decode and a full padded encoder pass, so its cost per
+        audio second is overstated. ``None`` when nothing was re-decoded,
+        as there is nothing to extrapolate from.
+        """
+        elapsed = self.elapsed_s
+        if self.redecoded_s <= 0.0 or self.audio_s <= 0.0 or elapsed <= 0:
+            return None
+        full_s = self.refine_s / self.redecoded_s * self.audio_s
+        return full_s / elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view (see :meth:`from_dict`)."""
+        return {
+            "audio_s": self.audio_s,
+            "draft_s": self.draft_s,
+            "refine_s": self.refine_s,
+            "redecoded_s": self.redecoded_s,
+            "regions": self.regions,
+            "redecoded_fraction": self.redecoded_fraction,
+            "elapsed_s": self.elapsed_s,
+            "speedup_upper_bound": self.speedup_upper_bound,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RefineStats:
+        """Rebuild statistics written by :meth:`to_dict`."""
+        return cls(
+            audio_s=float(data.get("audio_s", 0.0)),
+            draft_s=float(data.get("draft_s", 0.0)),
+            refine_s=float(data.get("refine_s", 0.0)),
+            redecoded_s=float(data.get("redecoded_s", 0.0)),
+            regions=int(data.get("regions", 0)),
+        )
+
+
+def iter_refined_segments(
+    *,
+    audio_path: Path,
+    backend: str,
+    options: TranscribeOptions,
+    progress_cb: ProgressCallback | None = None,
+    start_s: float = 0.0,
+    end_s: float | None = None,
+    thresholds: RefineThresholds | None = None,
+) -> SegmentStream:
+    """Open a draft-and-refine transcription of a local audio file.
+
+    ``options.draft_model`` decodes the audio first; low-confidence
+    segments (see :class:`RefineThresholds`) are re-decoded with
+    ``options.model`` in the detected language, prompted with the
+    preceding text, and their output replaces the draft's. Regions are
+    re-decoded as soon as the draft has moved past them, so segments are
+    still streamed in timeline order.
+
+    Parameters
+    ----------
+    audio_path:
+        Path to a local audio file.
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    options:
+        Transcription options with ``draft_model`` set.
+    progress_cb:
+        Optional callback receiving the draft pass's processed time.
+    start_s:
+        Seek to this offset before decoding.
+    end_s:
+        Stop decoding at this offset.
+    thresholds:
+        When to re-decode (default: Whisper's own fallback thresholds).
+
+    Returns
+    -------
+    SegmentStream
+        Spliced segments; ``refine`` holds the statistics.
+    """
+    if options.draft_model is None:
+        raise ValueError("iter_refined_segments() needs a draft_model.")
+    thresholds = thresholds or RefineThresholds()
+    stats = RefineStats()
+    draft_options = replace(
+        options,
+        model=options.draft_model,
+        draft_model=None,
+    )
+
+    started = time.perf_counter()
+    with timed_stage("draft"):
+        draft = backends.iter_segments(
+            audio_path=audio_path,
+            backend=backend,
+            options=draft_options,
+            progress_cb=progress_cb,
+            start_s=start_s,
+            end_s=end_s,
+        )
+    stats.draft_s += time.perf_counter() - started
+
+    final_options = replace(
+        options,
+        draft_model=None,
+        language=options.language or draft.language,
+    )
+    splicer = _Splicer(
+        audio_path=audio_path,
+        backend=backend,
+        options=final_options,
+        stats=stats,
+        end_s=end_s if end_s is not None else get_audio_duration_s(audio_path),
+    )
+    return SegmentStream(
+        splicer.run(draft, thresholds, start_s=start_s),
+        language=draft.language,
+        vad_skipped_fraction=draft.vad_skipped_fraction,
+        refine=stats,
+    )
+
+
+class _Splicer:
+    """Re-decode low-confidence runs of a draft stream and splice them."""
+
+    def __init__(
+        self,
+        *,
+        audio_path: Path,
+        backend: str,
+        options: TranscribeOptions,
+        stats: RefineStats,
+        end_s: float | None,
+    ) -> None:
+        self._audio_path = audio_path
+        self._backend = backend
+        self._options = options
+        self._stats = stats
+        self._end_s = end_s
+        self._warm = False
+        self._recent: deque[str] = deque(maxlen=16)
+
+    def run(
+        self,
+        draft: SegmentStream,
+        thresholds: RefineThresholds,
+        *,
+        start_s: float,
+    ) -> Iterator[TranscriptSegment]:
+        # ``pending`` is the run to re-decode (confident segments caught
+        # between two low ones included); ``held`` are confident segments
+        # after it that may still be merged into it.
+        pending: list[TranscriptSegment] = []
+        held: list[TranscriptSegment] = []
+        last_end = start_s
+        for index, segment in enumerate(self._drafted(draft)):
+            last_end = max(last_end, segment.end_s)
+            confidences = draft.confidences or ()
+            confidence = (
+                confidences[index] if index < len(confidences) else None
+            )
+            if thresholds.is_low(confidence):
+                pending.extend(held)
+                held.clear()
+                pending.append(segment)
+                continue
+            if not pending:
+                yield self._emit(segment)
+                continue
+            held.append(segment)
+            if segment.end_s - pending[-1].end_s > MERGE_GAP_S:
+                yield from self._redecode(pending)
+                yield from (self._emit(s) for s in held)
+                pending.clear()
+                held.clear()
+        if pending:
+            yield from self._redecode(pending)
+        yield from (self._emit(s) for s in held)
+
+        end_s = self._end_s if self._end_s is not None else last_end
+        self._stats.audio_s = max(0.0, end_s - start_s)
+        REFINE_AUDIO_SECONDS.inc(self._stats.audio_s, decode="draft")
+
+    def _drafted(self, draft: SegmentStream) -> Iterator[TranscriptSegment]:
+        iterator = iter(draft)
+        while True:
+            started = time.perf_counter()
+            with timed_stage("draft"):
+                segment = next(iterator, None)
+            self._stats.draft_s += time.perf_counter() - started
+            if segment is None:
+                return
+            yield segment
+
+    def _emit(self, segment: TranscriptSegment) -> TranscriptSegment:
+        if segment.text:
+            self._recent.append(segment.text)
+        return segment
+
+    def _prompt(self) -> str | None:
+        if self._options.initial_prompt:
+            return self._options.initial_prompt
+        return " ".join(self._recent)[-PROMPT_CHARS:].strip() or None
+
+    def _redecode(
+        self,
+        run: list[TranscriptSegment],
+    ) -> Iterator[TranscriptSegment]:
+        start_s, end_s = run[0].start_s, run[-1].end_s
+        lo = max(0.0, start_s - REGION_PAD_S)
+        hi = end_s + REGION_PAD_S
+        if self._end_s is not None:
+            hi = min(hi, self._end_s)
+        options = replace(self._options, initial_prompt=self._prompt())
+        with timed_stage("refine"):
+            if not self._warm:
+                # Keep the model load out of the measured real-time factor.
+                backends.preload_model(backend=self._backend, options=options)
+                self._warm = True
+            started = time.perf_counter()
+            stream = backends.iter_segments(
+                audio_path=self._audio_path,
+                backend=self._backend,
+                options=options,
+                start_s=lo,
+                end_s=hi,
+            )
+            # Keep what falls inside the run; the padding is context.
+            refined = [
+                replace(
+                    segment,
+                    start_s=max(segment.start_s, start_s),
+                    end_s=min(segment.end_s, end_s),
+                )
+                for segment in stream
+                if start_s <= (segment.start_s + segment.end_s) / 2 <= end_s
+            ]
+            self._stats.refine_s += time.perf_counter() - started
+        self._stats.redecoded_s += hi - lo
+        self._stats.regions += 1
+        REFINE_AUDIO_SECONDS.inc(hi - lo, decode="refine")
+        for segment in refined:
+            yield self._emit(segment)
@@ -4,15 +4,31 @@ from __future__ import annotations
 
 import hashlib
 import tempfile
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
+from .cache import TranscriptCache, hash_file, transcript_cache_key
 from .config import OutputOptions, TranscribeOptions
 from .exceptions import InvalidInputError
-from .ffmpeg import convert_to_wav_16k_mono
-from .pdf import write_pdf
-from .transcribe.base import Transcriber, TranscriptionResult
-from .transcript import format_transcript, write_text
+from .ffmpeg import (
+    SAMPLE_RATE,
+    convert_to_wav_16k_mono,
+    decode_pcm_16k_mono,
+    read_wav_16k_mono,
+)
+from .media import probe_media
+from .metrics import (
+    CACHE_LOOKUPS,
+    VAD_SKIPPED_SECONDS,
+    collect_stages,
+    observe_run,
+    timed_stage,
+)
+from .transcribe.base import AudioInput, Transcriber, TranscriptionResult
+from .types import SegmentTable
+from .vad import SpeechTimeline
+from .writers import OutputFormat, OutputWriter, parse_formats
 from .youtube import download_youtube_audio
 
 
@@ -28,11 +44,28 @@ class PipelineOutputs:
         Path to the generated PDF transcript, if requested.
     language:
         Detected or used language.
+    cache_hit:
+        Whether the transcript came from the transcript cache.
+    stage_timings:
+        Seconds spent per pipeline stage.
+    vad_skipped_fraction:
+        Fraction of the audio cut out as non-speech, if VAD ran.
+    paths:
+        Path of every written output, by format.
     """
 
     text_path: Path
     pdf_path: Path | None
     language: str | None
+    cache_hit: bool = False
+    stage_timings: dict[str, float] = field(default_factory=dict)
+    vad_skipped_fraction: float | None = None
+    paths: dict[OutputFormat, Path] = field(default_factory=dict)
+
+
+def _backend_name(transcriber: Transcriber) -> str:
+    name = getattr(transcriber, "name", None)
+    return name if isinstance(name, str) else type(transcriber).__name__
 
 
 def _hash_source_id(source_id: str) -> str:
@@ -69,9 +102,12 @@ def transcribe_youtube_url(
     if not url.strip():
         raise InvalidInputError("YouTube URL cannot be empty.")
 
-    with tempfile.TemporaryDirectory(prefix="scribebox_") as tmpdir:
+    with (
+        collect_stages(),
+        tempfile.TemporaryDirectory(prefix="scribebox_") as tmpdir,
+    ):
         tmp = Path(tmpdir)
-        downloaded = download_youtube_audio(url, tmp)
+        downloaded = download_youtube_audio(url=url, outdir=tmp)
         return transcribe_local_file(
             downloaded,
             source_id=url,
@@ -88,9 +124,14 @@ def transcribe_local_file(
     transcriber: Transcriber,
     options: TranscribeOptions,
     outputs: OutputOptions,
+    cache: TranscriptCache | None = None,
 ) -> PipelineOutputs:
     """Transcribe a local media file.
 
+    ffmpeg decodes the input once into an in-memory 16kHz sample buffer
+    that is handed straight to the transcriber; the WAV intermediate is
+    only written when ``outputs.keep_wav`` is set.
+
     Parameters
     ----------
     input_path:
@@ -103,6 +144,9 @@ def transcribe_local_file(
         Transcription options.
     outputs:
         Output options.
+    cache:
+        Optional transcript cache. A hit (same input bytes and options)
+        skips conversion and transcription.
 
     Returns
     -------
@@ -113,35 +157,128 @@ def transcribe_local_file(
     if not input_path.exists():
         raise InvalidInputError(f"File does not exist: {input_path}")
 
+    started = time.perf_counter()
+    with collect_stages() as timer:
+        out, audio_s = _transcribe_local_file(
+            input_path,
+            source_id=source_id,
+            transcriber=transcriber,
+            options=options,
+            outputs=outputs,
+            cache=cache,
+        )
+    if not out.cache_hit:
+        observe_run(
+            audio_s=audio_s,
+            elapsed_s=time.perf_counter() - started,
+        )
+    return replace(out, stage_timings=dict(timer.timings))
+
+
+def _transcribe_local_file(
+    input_path: Path,
+    *,
+    source_id: str | None,
+    transcriber: Transcriber,
+    options: TranscribeOptions,
+    outputs: OutputOptions,
+    cache: TranscriptCache | None,
+) -> tuple[PipelineOutputs, float | None]:
     source = source_id or str(input_path.resolve())
     stem = _hash_source_id(source)
 
     outdir = outputs.outdir
     outdir.mkdir(parents=True, exist_ok=True)
 
-    wav_path = outdir / f"{stem}.wav"
-    txt_path = outdir / f"{stem}.txt"
-    pdf_path = outdir / f"{stem}.pdf" if outputs.write_pdf else None
+    formats = parse_formats(outputs.formats, pdf=outputs.write_pdf)
+
+    cache_key: str | None = None
+    result: TranscriptionResult | None = None
+    if cache is not None:
+        with timed_stage("cache_lookup"):
+            fields: dict[str, object] = {
+                # Backends (and devices) do not produce identical text.
+                "backend": _backend_name(transcriber),
+                "device": options.device,
+                "model": options.model,
+                "language": options.language,
+                "translate": options.translate_to_english,
+            }
+            if options.vad:
+                fields["vad"] = True
+            cache_key = transcript_cache_key(hash_file(input_path), fields)
+            cached = cache.get(cache_key)
+        CACHE_LOOKUPS.inc(
+            cache="transcript",
+            result="miss" if cached is None else "hit",
+        )
+        if cached is not None:
+            result = TranscriptionResult(
+                segments=cached.segments,
+                language=cached.language,
+            )
 
-    convert_to_wav_16k_mono(input_path, wav_path)
+    cache_hit = result is not None
+    audio_s: float | None = None
+    timeline: SpeechTimeline | None = None
+    vad_skipped: float | None = None
+    if result is None:
+        # Probe once: the duration is known before decoding, and a 16kHz
+        # mono WAV input is then read without re-encoding it.
+        info = probe_media(input_path)
+        if info is not None:
+            audio_s = info.duration_s
+        audio: AudioInput
+        if outputs.keep_wav:
+            audio = convert_to_wav_16k_mono(input_path, outdir / f"{stem}.wav")
+        else:
+            audio = decode_pcm_16k_mono(input_path)
+            audio_s = len(audio) / float(SAMPLE_RATE)
 
-    result = transcriber.transcribe(
-        wav_path,
-        language=options.language,
-        translate_to_english=options.translate_to_english,
-        model=options.model,
-        device=options.device,
-    )
+        if options.vad:
+            if isinstance(audio, Path):
+                # Already decoded once; read the WAV back, not the source.
+                audio = read_wav_16k_mono(audio)
+            with timed_stage("vad"):
+                timeline = SpeechTimeline.detect(audio)
+                audio = timeline.compact(audio)
+            vad_skipped = timeline.skipped_fraction
+            VAD_SKIPPED_SECONDS.inc(timeline.duration_s - timeline.speech_s)
 
-    transcript = format_transcript(result.segments)
-    write_text(txt_path, transcript)
+        if timeline is not None and not timeline.regions:
+            result = TranscriptionResult(
+                segments=SegmentTable(),
+                language=options.language,
+            )
+        else:
+            with timed_stage("transcribe"):
+                result = transcriber.transcribe(
+                    audio,
+                    language=options.language,
+                    translate_to_english=options.translate_to_english,
+                    model=options.model,
+                    device=options.device,
+                )
+        if timeline is not None:
+            result = TranscriptionResult(
+                segments=timeline.remap(result.segments),
+                language=result.language,
+            )
+        if cache is not None and cache_key is not None:
+            with timed_stage("cache_store"):
+                cache.put(cache_key, result.segments, result.language)
 
-    if pdf_path is not None:
-        title = f"Scribebox transcript ({stem})"
-        write_pdf(pdf_path, title=title, text=transcript)
+    title = f"Scribebox transcript ({stem})"
+    with OutputWriter(outdir, stem, formats, title=title) as writer:
+        writer.write_all(result.segments)
+        writer.close(language=result.language)
 
-    return PipelineOutputs(
-        text_path=txt_path,
-        pdf_path=pdf_path,
+    produced = PipelineOutputs(
+        text_path=writer.paths[OutputFormat.TXT],
+        pdf_path=writer.paths.get(OutputFormat.PDF),
         language=result.language,
+        cache_hit=cache_hit,
+        vad_skipped_fraction=vad_skipped,
+        paths=dict(writer.paths),
     )
+    return produced, audio_s
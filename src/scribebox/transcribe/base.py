@@ -4,9 +4,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol
+from typing import TYPE_CHECKING, Any, Protocol, TypeAlias
 
-from ..types import Segment
+from ..types import SegmentTable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+AudioInput: TypeAlias = "Path | np.ndarray[Any, Any]"
+"""A WAV file path or a 16kHz mono float32 sample buffer."""
 
 
 @dataclass(frozen=True, slots=True)
@@ -16,25 +22,41 @@ class TranscriptionResult:
     Parameters
     ----------
     segments:
-        Ordered list of transcript segments.
+        Ordered transcript segments; other sequences are converted to a
+        :class:`~scribebox.types.SegmentTable`.
     language:
         Detected or used language code.
     """
 
-    segments: list[Segment]
+    segments: SegmentTable
     language: str | None = None
 
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "segments", SegmentTable.coerce(self.segments)
+        )
+
 
 class Transcriber(Protocol):
     """Transcriber protocol."""
 
     def transcribe(
         self,
-        audio_path: Path,
+        audio_path: AudioInput,
         *,
         language: str | None,
         translate_to_english: bool,
         model: str,
         device: str,
     ) -> TranscriptionResult:
-        """Transcribe a WAV file."""
+        """Transcribe a WAV file or an in-memory 16kHz sample buffer."""
+
+
+def as_model_input(audio: AudioInput) -> Any:
+    """Return ``audio`` in the form Whisper-family ``transcribe`` expects.
+
+    Paths are passed as strings; sample buffers are passed through.
+    """
+    if isinstance(audio, Path):
+        return str(audio)
+    return audio
@@ -2,23 +2,29 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-
-from ..types import Segment
-from .base import TranscriptionResult, Transcriber
+from ..model_cache import load_faster_whisper_model
+from ..types import SegmentTable
+from .base import (
+    AudioInput,
+    Transcriber,
+    TranscriptionResult,
+    as_model_input,
+)
 
 
 class FasterWhisperTranscriber(Transcriber):
     """Transcriber based on `faster-whisper`."""
 
-    def __init__(self) -> None:
-        from faster_whisper import WhisperModel  # type: ignore
+    name = "faster-whisper"
 
-        self._WhisperModel = WhisperModel
+    def __init__(self) -> None:
+        # Fail early (the factory falls back to openai-whisper); models
+        # themselves are loaded lazily through the shared model cache.
+        import faster_whisper  # type: ignore  # noqa: F401
 
     def transcribe(
         self,
-        audio_path: Path,
+        audio_path: AudioInput,
         *,
         language: str | None,
         translate_to_english: bool,
@@ -30,7 +36,7 @@ class FasterWhisperTranscriber(Transcriber):
         Parameters
         ----------
         audio_path:
-            Input WAV file.
+            Input WAV file or 16kHz mono float32 samples.
         language:
             Optional language code.
         translate_to_english:
@@ -47,21 +53,19 @@ class FasterWhisperTranscriber(Transcriber):
         """
 
         task = "translate" if translate_to_english else "transcribe"
-        fw_model = self._WhisperModel(model, device=device)
+        fw_model = load_faster_whisper_model(model, device=device)
         segments_iter, info = fw_model.transcribe(
-            str(audio_path),
+            as_model_input(audio_path),
             language=language,
             task=task,
         )
 
-        segments: list[Segment] = []
+        segments = SegmentTable()
         for seg in segments_iter:
             segments.append(
-                Segment(
-                    start_s=float(seg.start),
-                    end_s=float(seg.end),
-                    text=str(seg.text).strip(),
-                )
+                float(seg.start),
+                float(seg.end),
+                str(seg.text).strip(),
             )
 
         lang = getattr(info, "language", None)
@@ -2,23 +2,28 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-
-from ..types import Segment
-from .base import TranscriptionResult, Transcriber
+from ..model_cache import load_whisper_model
+from ..types import SegmentTable
+from .base import (
+    AudioInput,
+    Transcriber,
+    TranscriptionResult,
+    as_model_input,
+)
 
 
 class WhisperTranscriber(Transcriber):
     """Transcriber based on `openai-whisper`."""
 
-    def __init__(self) -> None:
-        import whisper  # type: ignore
+    name = "whisper"
 
-        self._whisper = whisper
+    def __init__(self) -> None:
+        # Fail early; models are loaded lazily through the model cache.
+        import whisper  # type: ignore  # noqa: F401
 
     def transcribe(
         self,
-        audio_path: Path,
+        audio_path: AudioInput,
         *,
         language: str | None,
         translate_to_english: bool,
@@ -30,7 +35,7 @@ class WhisperTranscriber(Transcriber):
         Parameters
         ----------
         audio_path:
-            Input WAV file.
+            Input WAV file or 16kHz mono float32 samples.
         language:
             Optional language code.
         translate_to_english:
@@ -47,17 +52,17 @@ class WhisperTranscriber(Transcriber):
         """
 
         task = "translate" if translate_to_english else "transcribe"
-        w_model = self._whisper.load_model(model, device=device)
+        w_model = load_whisper_model(model, device=device)
 
         kwargs: dict[str, object] = {"task": task}
         if language is not None:
             kwargs["language"] = language
 
-        result = w_model.transcribe(str(audio_path), **kwargs)
+        result = w_model.transcribe(as_model_input(audio_path), **kwargs)
         segments_raw = result.get("segments") or []
         detected_lang = result.get("language")
 
-        segments: list[Segment] = []
+        segments = SegmentTable()
         if isinstance(segments_raw, list):
             for item in segments_raw:
                 if not isinstance(item, dict):
@@ -66,7 +71,7 @@ class WhisperTranscriber(Transcriber):
                 start = float(item.get("start", 0.0))
                 end = float(item.get("end", 0.0))
                 if text:
-                    segments.append(Segment(start_s=start, end_s=end, text=text))
+                    segments.append(start, end, text)
 
         lang: str | None
         lang = detected_lang if isinstance(detected_lang, str) else None
@@ -2,18 +2,29 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import TextIO
 
-from .types import Segment
+from .types import Segment, SegmentTable
 
+BUFFER_SIZE = 1 << 16
 
-def format_transcript(segments: list[Segment]) -> str:
+
+def _texts(segments: SegmentTable | Iterable[Segment]) -> Iterator[str]:
+    if isinstance(segments, SegmentTable):
+        return segments.texts()
+    return (seg.text for seg in segments)
+
+
+def format_transcript(segments: SegmentTable | Iterable[Segment]) -> str:
     """Combine segments into a readable transcript.
 
     Parameters
     ----------
     segments:
-        Ordered segments.
+        Ordered segments; a :class:`~scribebox.types.SegmentTable` is
+        read column-wise without building segment objects.
 
     Returns
     -------
@@ -22,8 +33,8 @@ def format_transcript(segments: list[Segment]) -> str:
     """
 
     parts: list[str] = []
-    for seg in segments:
-        txt = seg.text.strip()
+    for txt in _texts(segments):
+        txt = txt.strip()
         if txt:
             parts.append(txt)
     return "\n".join(parts).strip() + "\n"
@@ -48,3 +59,64 @@ def write_text(path: Path, text: str) -> Path:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(text, encoding="utf-8")
     return path
+
+
+class TextWriter:
+    """Incrementally write segment text to a TXT file.
+
+    Each non-empty segment becomes one line. Writes are buffered; call
+    :meth:`flush` to make partial output visible while decoding
+    continues. The result matches :func:`format_transcript` for the same
+    segments.
+
+    Parameters
+    ----------
+    path:
+        Output file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.lines_written = 0
+        self._fh: TextIO = path.open(
+            "w",
+            encoding="utf-8",
+            buffering=BUFFER_SIZE,
+        )
+
+    def write(self, segment: Segment) -> None:
+        """Append one segment."""
+        self._write_text(segment.text)
+
+    def write_all(self, segments: SegmentTable | Iterable[Segment]) -> None:
+        """Append many segments."""
+        for txt in _texts(segments):
+            self._write_text(txt)
+
+    def flush(self) -> None:
+        """Push buffered output to the file."""
+        if not self._fh.closed:
+            self._fh.flush()
+
+    def _write_text(self, text: str) -> bool:
+        txt = text.strip()
+        if not txt:
+            return False
+        self._fh.write(txt + "\n")
+        self.lines_written += 1
+        return True
+
+    def close(self) -> None:
+        """Finish the file."""
+        if self._fh.closed:
+            return
+        if self.lines_written == 0:
+            self._fh.write("\n")
+        self._fh.close()
+
+    def __enter__(self) -> TextWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
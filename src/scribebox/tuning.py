@@ -0,0 +1,513 @@
+"""Host-specific compute settings chosen by benchmarking."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import platform
+import re
+import tempfile
+import threading
+import time
+import wave
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from . import backends
+from .backends import TranscribeOptions
+from .cache import default_cache_dir
+from .ffmpeg import SAMPLE_RATE, decode_pcm_16k_mono
+from .model_cache import current_rss_bytes, get_model_cache
+
+PROFILE_VERSION = 1
+CALIBRATION_S = 60.0
+MAX_WORD_ERROR_RATE = 0.05
+RSS_SAMPLE_S = 0.05
+
+_ENV_PROFILE = "SCRIBEBOX_TUNING_PROFILE"
+
+# Most precise first; the reference trial uses the most precise type.
+_PRECISION = (
+    "float32",
+    "float16",
+    "bfloat16",
+    "int8_float32",
+    "int16",
+    "int8_float16",
+    "int8_bfloat16",
+    "int8",
+)
+
+_WORD_RE = re.compile(r"[\w']+")
+
+TrialCallback = Callable[["TuningTrial"], None]
+
+
+@dataclass(frozen=True, slots=True)
+class TuningTrial:
+    """One measured configuration.
+
+    Parameters
+    ----------
+    compute_type:
+        Compute type of the model.
+    cpu_threads:
+        CPU threads per decode.
+    beam_size:
+        Beam size.
+    audio_s:
+        Length of the calibration clip in seconds.
+    elapsed_s:
+        Decode time of the clip (model load excluded).
+    peak_rss_bytes:
+        Highest resident memory seen while decoding, if measurable.
+    word_error_rate:
+        Word error rate against the reference trial.
+    error:
+        Why the configuration could not run (e.g. a compute type the
+        host does not support).
+    """
+
+    compute_type: str
+    cpu_threads: int
+    beam_size: int
+    audio_s: float
+    elapsed_s: float = 0.0
+    peak_rss_bytes: int | None = None
+    word_error_rate: float | None = None
+    error: str | None = None
+
+    @property
+    def real_time_factor(self) -> float:
+        """Decode time divided by audio duration."""
+        return self.elapsed_s / self.audio_s if self.audio_s else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class TuningProfile:
+    """Compute settings picked by :func:`tune` for one model on one host.
+
+    Parameters
+    ----------
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    model:
+        Model name or path.
+    device:
+        Inference device.
+    compute_type:
+        Chosen compute type.
+    cpu_threads:
+        Chosen CPU threads per decode.
+    num_workers:
+        Concurrent decodes the threads were budgeted for.
+    beam_size:
+        Chosen beam size.
+    real_time_factor:
+        Measured real-time factor of the chosen settings.
+    peak_rss_bytes:
+        Measured peak resident memory of the chosen settings.
+    host:
+        Host name the profile was measured on.
+    cpus:
+        CPU count of that host.
+    created_at:
+        Unix time of the measurement.
+    """
+
+    backend: str
+    model: str
+    device: str
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+    beam_size: int
+    real_time_factor: float
+    peak_rss_bytes: int | None
+    host: str
+    cpus: int
+    created_at: float
+
+    def matches(self, *, backend: str, model: str, device: str) -> bool:
+        """Whether the profile applies to this model on this host."""
+        return (self.backend, self.model, self.device) == (
+            backend,
+            model,
+            device,
+        ) and (self.host, self.cpus) == _host()
+
+    def apply(self, options: TranscribeOptions) -> TranscribeOptions:
+        """Return ``options`` with the tuned settings."""
+        return replace(
+            options,
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers,
+            beam_size=self.beam_size,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable view."""
+        return asdict(self)
+
+
+def _host() -> tuple[str, int]:
+    return platform.node(), os.cpu_count() or 1
+
+
+def default_profile_path() -> Path:
+    """Return the tuning profile path.
+
+    ``SCRIBEBOX_TUNING_PROFILE`` takes precedence, then ``tuning.json``
+    under :func:`scribebox.cache.default_cache_dir`.
+    """
+    env = os.environ.get(_ENV_PROFILE, "").strip()
+    if env:
+        return Path(env).expanduser()
+    return default_cache_dir() / "tuning.json"
+
+
+def _read_profiles(path: Path) -> list[TuningProfile]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != PROFILE_VERSION:
+            return []
+        return [TuningProfile(**raw) for raw in data["profiles"]]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return []
+
+
+def load_profile(
+    *,
+    backend: str,
+    model: str,
+    device: str,
+    path: Path | None = None,
+) -> TuningProfile | None:
+    """Return the stored profile for a model on this host, if any.
+
+    Profiles measured on another host (e.g. a shared home directory) are
+    ignored, as is an unreadable profile file.
+    """
+    for profile in _read_profiles(path or default_profile_path()):
+        if profile.matches(backend=backend, model=model, device=device):
+            return profile
+    return None
+
+
+def save_profile(profile: TuningProfile, path: Path | None = None) -> Path:
+    """Store ``profile``, replacing the one for the same model and host."""
+    path = path or default_profile_path()
+    kept = [
+        other
+        for other in _read_profiles(path)
+        if (other.backend, other.model, other.device, other.host)
+        != (profile.backend, profile.model, profile.device, profile.host)
+    ]
+    payload = {
+        "version": PROFILE_VERSION,
+        "profiles": [p.to_dict() for p in [*kept, profile]],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def default_thread_counts(num_workers: int = 1) -> tuple[int, ...]:
+    """Return powers of two up to this host's share per worker."""
+    budget = max(1, (os.cpu_count() or 1) // max(1, num_workers))
+    counts = {budget}
+    n = 1
+    while n < budget:
+        counts.add(n)
+        n *= 2
+    return tuple(sorted(counts))
+
+
+def default_compute_types(backend: str, device: str) -> tuple[str, ...]:
+    """Return the compute types worth trying on ``device``."""
+    if backend != "faster-whisper":
+        # openai-whisper has no compute types; threads and beams remain.
+        return ("default",)
+    if device.startswith("cuda"):
+        return ("float16", "int8_float16", "int8")
+    return ("int8", "int8_float32", "float32")
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Return the word-level edit distance divided by reference length.
+
+    Case and punctuation are ignored.
+    """
+    ref = _WORD_RE.findall(reference.lower())
+    hyp = _WORD_RE.findall(hypothesis.lower())
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    row = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, start=1):
+        prev, row[0] = row[0], i
+        for j, other in enumerate(hyp, start=1):
+            cur = min(row[j] + 1, row[j - 1] + 1, prev + (word != other))
+            prev, row[j] = row[j], cur
+    return row[-1] / len(ref)
+
+
+def write_calibration_clip(
+    source: Path,
+    path: Path,
+    *,
+    duration_s: float = CALIBRATION_S,
+) -> float:
+    """Cut the first ``duration_s`` seconds of ``source`` into a WAV.
+
+    Returns
+    -------
+    float
+        Length of the clip in seconds.
+    """
+    samples = decode_pcm_16k_mono(source, duration_s=duration_s)
+    pcm = (samples.clip(-1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm)
+    return len(samples) / float(SAMPLE_RATE)
+
+
+class _RssSampler:
+    """Track the highest resident memory while a block runs."""
+
+    def __init__(self) -> None:
+        self.peak = current_rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> _RssSampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_S):
+            self._sample()
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+
+def _warm_model(backend: str, options: TranscribeOptions) -> None:
+    # Drop the models of earlier trials first, so the peak RSS of this
+    # trial only counts its own model. Beam sizes share one model.
+    cache = get_model_cache()
+    loaded = cache.keys()
+    if any(
+        key.cpu_threads != options.cpu_threads
+        or key.compute_type not in (None, options.compute_type)
+        for key in loaded
+    ):
+        cache.clear()
+    backends.preload_model(backend=backend, options=options)
+
+
+def _run_trial(
+    clip: Path,
+    *,
+    backend: str,
+    options: TranscribeOptions,
+    audio_s: float,
+) -> tuple[TuningTrial, str]:
+    trial = TuningTrial(
+        compute_type=options.compute_type,
+        cpu_threads=options.cpu_threads,
+        beam_size=options.beam_size,
+        audio_s=audio_s,
+    )
+    try:
+        _warm_model(backend, options)
+        with _RssSampler() as rss:
+            started = time.perf_counter()
+            stream = backends.iter_segments(
+                audio_path=clip,
+                backend=backend,
+                options=options,
+            )
+            text = " ".join(segment.text for segment in stream)
+            elapsed = time.perf_counter() - started
+    except (RuntimeError, ValueError) as exc:
+        # CTranslate2 rejects compute types the host cannot run.
+        return replace(trial, error=str(exc) or type(exc).__name__), ""
+    return replace(trial, elapsed_s=elapsed, peak_rss_bytes=rss.peak), text
+
+
+def _precision_rank(compute_type: str) -> int:
+    try:
+        return _PRECISION.index(compute_type)
+    except ValueError:
+        return len(_PRECISION)
+
+
+def select_trial(
+    trials: Sequence[TuningTrial],
+    *,
+    max_word_error_rate: float = MAX_WORD_ERROR_RATE,
+    max_rss_bytes: int | None = None,
+) -> TuningTrial | None:
+    """Pick the fastest trial within the accuracy and memory budgets."""
+    usable = [
+        trial
+        for trial in trials
+        if trial.error is None
+        and (trial.word_error_rate or 0.0) <= max_word_error_rate
+        and (
+            max_rss_bytes is None
+            or trial.peak_rss_bytes is None
+            or trial.peak_rss_bytes <= max_rss_bytes
+        )
+    ]
+    if not usable:
+        return None
+    return min(usable, key=lambda trial: trial.real_time_factor)
+
+
+def tune(
+    audio_path: Path,
+    *,
+    backend: str,
+    options: TranscribeOptions,
+    compute_types: Iterable[str] | None = None,
+    thread_counts: Iterable[int] | None = None,
+    beam_sizes: Iterable[int] = (1, 5),
+    num_workers: int = 1,
+    calibration_s: float = CALIBRATION_S,
+    max_word_error_rate: float = MAX_WORD_ERROR_RATE,
+    max_rss_bytes: int | None = None,
+    on_trial: TrialCallback | None = None,
+) -> tuple[TuningProfile | None, list[TuningTrial]]:
+    """Benchmark compute settings on this host and pick the fastest.
+
+    The first ``calibration_s`` seconds of ``audio_path`` are decoded with
+    every combination of compute type, CPU threads and beam size, timing
+    the decode (model loads excluded) and sampling resident memory. The
+    process-wide model cache is cleared whenever the compute type or
+    thread count changes, so each peak only counts the model under test.
+    The transcript of the most precise, widest-beam configuration is the
+    reference: a faster configuration only wins if its word error rate
+    against it stays within ``max_word_error_rate`` and its memory within
+    ``max_rss_bytes``.
+
+    Parameters
+    ----------
+    audio_path:
+        Media file with representative speech.
+    backend:
+        ``faster-whisper`` or ``whisper``.
+    options:
+        Base decode options (model, device, language, VAD, ...).
+    compute_types:
+        Compute types to try; defaults depend on backend and device.
+    thread_counts:
+        CPU threads per decode to try; defaults to powers of two up to
+        the host's share per worker.
+    beam_sizes:
+        Beam sizes to try.
+    num_workers:
+        Concurrent decodes the settings are for (e.g. the web app's
+        ``SCRIBEBOX_WORKERS``); threads are budgeted per worker.
+    calibration_s:
+        Length of the calibration clip in seconds.
+    max_word_error_rate:
+        Allowed word error rate against the reference trial.
+    max_rss_bytes:
+        Optional resident-memory budget.
+    on_trial:
+        Optional callback receiving each trial as it completes.
+
+    Returns
+    -------
+    tuple[TuningProfile | None, list[TuningTrial]]
+        The chosen profile (``None`` if no trial ran) and every trial.
+    """
+    types = tuple(
+        compute_types or default_compute_types(backend, options.device)
+    )
+    threads = tuple(thread_counts or default_thread_counts(num_workers))
+    beams = tuple(beam_sizes)
+    # Reference first, so every later trial can be scored as it finishes;
+    # beam sizes of one model run back to back so it is loaded once.
+    grid = sorted(
+        itertools.product(types, threads, beams),
+        key=lambda combo: (
+            _precision_rank(combo[0]),
+            -combo[1],
+            -combo[2],
+        ),
+    )
+
+    trials: list[TuningTrial] = []
+    reference: str | None = None
+    with tempfile.TemporaryDirectory(prefix="scribebox_tune_") as tmp:
+        clip = Path(tmp) / "calibration.wav"
+        audio_s = write_calibration_clip(
+            audio_path,
+            clip,
+            duration_s=calibration_s,
+        )
+        for compute_type, cpu_threads, beam_size in grid:
+            trial, text = _run_trial(
+                clip,
+                backend=backend,
+                options=replace(
+                    options,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers,
+                    beam_size=beam_size,
+                ),
+                audio_s=audio_s,
+            )
+            if trial.error is None:
+                if reference is None:
+                    reference = text
+                trial = replace(
+                    trial,
+                    word_error_rate=word_error_rate(reference, text),
+                )
+            trials.append(trial)
+            if on_trial is not None:
+                on_trial(trial)
+
+    best = select_trial(
+        trials,
+        max_word_error_rate=max_word_error_rate,
+        max_rss_bytes=max_rss_bytes,
+    )
+    if best is None:
+        return None, trials
+    host, cpus = _host()
+    profile = TuningProfile(
+        backend=backend,
+        model=options.model,
+        device=options.device,
+        compute_type=best.compute_type,
+        cpu_threads=best.cpu_threads,
+        num_workers=num_workers,
+        beam_size=best.beam_size,
+        real_time_factor=best.real_time_factor,
+        peak_rss_bytes=best.peak_rss_bytes,
+        host=host,
+        cpus=cpus,
+        created_at=time.time(),
+    )
+    return profile, trials
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
+from typing import overload
 
 
 @dataclass(frozen=True, slots=True)
@@ -24,20 +28,219 @@ class TranscriptSegment:
     text: str
 
 
+Segment = TranscriptSegment
+"""Segment type used by the :mod:`scribebox.service` pipeline."""
+
+
+class SegmentTable(Sequence[TranscriptSegment]):
+    """Columnar, append-only storage for transcript segments.
+
+    Start and end times live in two ``array('d')`` columns and all text
+    in one UTF-8 buffer indexed by an offsets column, so a long
+    transcript costs a few bytes per segment plus its text instead of
+    one Python object (and one string) per segment. Indexing returns a
+    :class:`TranscriptSegment` built on demand; :meth:`rows` and
+    :meth:`texts` iterate without building them.
+
+    Segments are expected in timeline order, which :meth:`between`
+    relies on.
+
+    Parameters
+    ----------
+    segments:
+        Initial segments.
+    """
+
+    __slots__ = ("_starts", "_ends", "_offsets", "_buffer")
+
+    def __init__(self, segments: Iterable[TranscriptSegment] = ()) -> None:
+        self._starts = array("d")
+        self._ends = array("d")
+        self._offsets = array("q", [0])
+        self._buffer = bytearray()
+        for seg in segments:
+            self.append(seg.start_s, seg.end_s, seg.text)
+
+    @classmethod
+    def coerce(
+        cls,
+        segments: SegmentTable | Iterable[TranscriptSegment],
+    ) -> SegmentTable:
+        """Return ``segments`` as a table, converting only if needed."""
+        if isinstance(segments, SegmentTable):
+            return segments
+        return cls(segments)
+
+    def append(self, start_s: float, end_s: float, text: str) -> None:
+        """Add one segment at the end of the table."""
+        self._starts.append(start_s)
+        self._ends.append(end_s)
+        self._buffer += text.encode("utf-8")
+        self._offsets.append(len(self._buffer))
+
+    def extend(self, segments: Iterable[TranscriptSegment]) -> None:
+        """Add ``segments`` at the end of the table."""
+        for seg in segments:
+            self.append(seg.start_s, seg.end_s, seg.text)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, index: int) -> TranscriptSegment: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> SegmentTable: ...
+
+    def __getitem__(
+        self,
+        index: int | slice,
+    ) -> TranscriptSegment | SegmentTable:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return SegmentTable(self[i] for i in range(start, stop, step))
+            return self._take(start, max(start, stop))
+        i = index + len(self) if index < 0 else index
+        if not 0 <= i < len(self):
+            raise IndexError("segment index out of range")
+        return TranscriptSegment(
+            start_s=self._starts[i],
+            end_s=self._ends[i],
+            text=self.text_at(i),
+        )
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        for i in range(len(self)):
+            yield TranscriptSegment(
+                start_s=self._starts[i],
+                end_s=self._ends[i],
+                text=self.text_at(i),
+            )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SegmentTable):
+            return (
+                self._starts == other._starts
+                and self._ends == other._ends
+                and self._offsets == other._offsets
+                and self._buffer == other._buffer
+            )
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SegmentTable({len(self)} segments)"
+
+    @property
+    def starts(self) -> array[float]:
+        """Start times column (seconds)."""
+        return self._starts
+
+    @property
+    def ends(self) -> array[float]:
+        """End times column (seconds)."""
+        return self._ends
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and text buffer."""
+        return (
+            self._starts.itemsize * len(self._starts)
+            + self._ends.itemsize * len(self._ends)
+            + self._offsets.itemsize * len(self._offsets)
+            + len(self._buffer)
+        )
+
+    @property
+    def text(self) -> str:
+        """Non-empty segment texts joined by newlines."""
+        return "\n".join(t for t in self.texts() if t).strip()
+
+    def text_at(self, index: int) -> str:
+        """Return the text of segment ``index``."""
+        lo, hi = self._offsets[index], self._offsets[index + 1]
+        return self._buffer[lo:hi].decode("utf-8")
+
+    def texts(self) -> Iterator[str]:
+        """Iterate over segment texts."""
+        for i in range(len(self)):
+            yield self.text_at(i)
+
+    def rows(self) -> Iterator[tuple[float, float, str]]:
+        """Iterate over ``(start_s, end_s, text)`` tuples."""
+        for i in range(len(self)):
+            yield self._starts[i], self._ends[i], self.text_at(i)
+
+    def between(self, start_s: float, end_s: float) -> SegmentTable:
+        """Return the segments overlapping ``[start_s, end_s)``."""
+        hi = bisect_left(self._starts, end_s)
+        lo = bisect_left(self._ends, start_s, 0, hi)
+        while lo < hi and self._ends[lo] <= start_s:
+            lo += 1
+        return self._take(lo, hi)
+
+    def retimed(
+        self,
+        starts: Iterable[float],
+        ends: Iterable[float],
+    ) -> SegmentTable:
+        """Return a copy with new timestamps and the same texts."""
+        out = SegmentTable()
+        out._starts = array("d", starts)
+        out._ends = array("d", ends)
+        if not len(out._starts) == len(out._ends) == len(self):
+            raise ValueError("retimed() needs one timestamp per segment.")
+        out._offsets = array("q", self._offsets)
+        out._buffer = bytearray(self._buffer)
+        return out
+
+    def shifted(self, offset_s: float) -> SegmentTable:
+        """Return a copy with every timestamp moved by ``offset_s``."""
+        return self.retimed(
+            (t + offset_s for t in self._starts),
+            (t + offset_s for t in self._ends),
+        )
+
+    def _take(self, lo: int, hi: int) -> SegmentTable:
+        out = SegmentTable()
+        out._starts = self._starts[lo:hi]
+        out._ends = self._ends[lo:hi]
+        base = self._offsets[lo]
+        out._offsets = array(
+            "q", (off - base for off in self._offsets[lo : hi + 1])
+        )
+        out._buffer = self._buffer[base : self._offsets[hi]]
+        return out
+
+
 @dataclass(frozen=True, slots=True)
 class Transcript:
     """A full transcript.
 
     Parameters
     ----------
-    text:
-        Transcript full text.
     segments:
-        Segment-level transcript.
+        Segment-level transcript; other sequences are converted to a
+        :class:`SegmentTable`.
     language:
         Detected language (if provided by the backend).
     """
 
-    text: str
-    segments: list[TranscriptSegment]
+    segments: SegmentTable
     language: str | None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "segments", SegmentTable.coerce(self.segments)
+        )
+
+    @property
+    def text(self) -> str:
+        """Transcript full text, joined from the segments on demand."""
+        return self.segments.text
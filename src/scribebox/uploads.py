@@ -0,0 +1,190 @@
+"""Chunked upload handling."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+from .exceptions import InvalidInputError
+from .ffmpeg import StreamingWavConverter
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(InvalidInputError):
+    """Raised when an upload exceeds the configured size limit."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"Upload exceeds the limit of {limit} bytes.")
+        self.limit = limit
+
+
+@dataclass(slots=True)
+class UploadStats:
+    """Measurements taken while receiving an upload.
+
+    Parameters
+    ----------
+    bytes_received:
+        Total bytes received.
+    elapsed_s:
+        Wall-clock time spent receiving (and, when piping, converting).
+    max_chunk_bytes:
+        Largest chunk held in memory at once.
+    process_peak_rss_bytes:
+        Peak resident memory of the whole server process since it
+        started (``ru_maxrss``), if available. It is not specific to
+        this upload: only a value that stays flat across large uploads
+        shows they are streamed.
+    """
+
+    bytes_received: int = 0
+    elapsed_s: float = 0.0
+    max_chunk_bytes: int = 0
+    process_peak_rss_bytes: int | None = None
+
+    def to_dict(self) -> dict[str, float | int | None]:
+        """Return a JSON-serializable view."""
+        return {
+            "bytes_received": self.bytes_received,
+            "elapsed_s": self.elapsed_s,
+            "max_chunk_bytes": self.max_chunk_bytes,
+            "process_peak_rss_bytes": self.process_peak_rss_bytes,
+        }
+
+
+class UploadSink(Protocol):
+    """Destination for upload chunks."""
+
+    def write(self, chunk: bytes) -> None:
+        """Consume one chunk."""
+
+    def close(self) -> Path:
+        """Finish and return the resulting file."""
+
+    def abort(self) -> None:
+        """Discard partial output."""
+
+
+class FileSink:
+    """Write upload chunks to a file.
+
+    Parameters
+    ----------
+    path:
+        Destination file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._fh: BinaryIO = path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        """Append one chunk."""
+        self._fh.write(chunk)
+
+    def close(self) -> Path:
+        """Close the file and return its path."""
+        self._fh.close()
+        return self.path
+
+    def abort(self) -> None:
+        """Close and delete the partial file."""
+        self._fh.close()
+        self.path.unlink(missing_ok=True)
+
+
+class FfmpegSink:
+    """Pipe upload chunks into ffmpeg, producing a 16kHz WAV.
+
+    Parameters
+    ----------
+    wav_path:
+        Destination WAV file.
+    """
+
+    def __init__(self, wav_path: Path) -> None:
+        wav_path.parent.mkdir(parents=True, exist_ok=True)
+        self._converter = StreamingWavConverter(wav_path)
+
+    def write(self, chunk: bytes) -> None:
+        """Send one chunk to ffmpeg."""
+        self._converter.write(chunk)
+
+    def close(self) -> Path:
+        """Wait for ffmpeg and return the WAV path."""
+        return self._converter.close()
+
+    def abort(self) -> None:
+        """Stop ffmpeg and delete partial output."""
+        self._converter.abort()
+
+
+async def receive_upload(
+    chunks: AsyncIterator[bytes],
+    sink: UploadSink,
+    *,
+    max_bytes: int | None = None,
+) -> tuple[Path, UploadStats]:
+    """Copy an upload into ``sink`` one chunk at a time.
+
+    At most one chunk is held in memory, regardless of the upload size.
+    Sink writes run in a worker thread so a slow disk or a busy ffmpeg
+    does not stall the event loop.
+
+    Parameters
+    ----------
+    chunks:
+        Async iterator over the upload body.
+    sink:
+        Destination for the bytes.
+    max_bytes:
+        Optional size limit.
+
+    Returns
+    -------
+    tuple[pathlib.Path, UploadStats]
+        The file produced by the sink and upload measurements.
+
+    Raises
+    ------
+    UploadTooLargeError
+        If the upload exceeds ``max_bytes``. Partial output is removed.
+    """
+    stats = UploadStats()
+    started = time.perf_counter()
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            stats.bytes_received += len(chunk)
+            stats.max_chunk_bytes = max(stats.max_chunk_bytes, len(chunk))
+            if max_bytes is not None and stats.bytes_received > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            await asyncio.to_thread(sink.write, chunk)
+        path = await asyncio.to_thread(sink.close)
+    except BaseException:
+        sink.abort()
+        raise
+
+    stats.elapsed_s = time.perf_counter() - started
+    stats.process_peak_rss_bytes = peak_rss_bytes()
+    return path, stats
+
+
+def peak_rss_bytes() -> int | None:
+    """Return the peak resident memory of this process in bytes."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (ImportError, OSError, ValueError):
+        return None
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
@@ -0,0 +1,201 @@
+"""Backend-independent voice activity detection."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import DependencyMissingError
+from .ffmpeg import SAMPLE_RATE
+from .types import Segment, SegmentTable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+FRAME_S = 0.03
+THRESHOLD_DB = -45.0
+MIN_SPEECH_S = 0.25
+MIN_SILENCE_S = 0.6
+PAD_S = 0.2
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np
+    except Exception as exc:  # pragma: no cover
+        raise DependencyMissingError(
+            "Voice activity detection requires 'numpy' (installed with "
+            "either transcription backend)."
+        ) from exc
+    return np
+
+
+def detect_speech(
+    samples: np.ndarray[Any, Any],
+    *,
+    sample_rate: int = SAMPLE_RATE,
+    frame_s: float = FRAME_S,
+    threshold_db: float = THRESHOLD_DB,
+    min_speech_s: float = MIN_SPEECH_S,
+    min_silence_s: float = MIN_SILENCE_S,
+    pad_s: float = PAD_S,
+) -> list[tuple[float, float]]:
+    """Find speech regions by short-time energy.
+
+    Frames louder than ``threshold_db`` (dBFS) count as speech. Gaps
+    shorter than ``min_silence_s`` are bridged, blips shorter than
+    ``min_speech_s`` are dropped and every region is padded by ``pad_s``
+    so word onsets and tails are kept. This is an energy gate: it skips
+    silence and very quiet passages, not music or loud noise.
+
+    Parameters
+    ----------
+    samples:
+        Mono float samples in ``[-1, 1]``.
+    sample_rate:
+        Sample rate of ``samples``.
+    frame_s:
+        Analysis frame length in seconds.
+    threshold_db:
+        Frame energy above which a frame counts as speech.
+    min_speech_s:
+        Shortest region kept.
+    min_silence_s:
+        Shortest gap that splits two regions.
+    pad_s:
+        Padding added on both sides of each region.
+
+    Returns
+    -------
+    list[tuple[float, float]]
+        ``(start_s, end_s)`` speech regions in timeline order.
+    """
+    np = _numpy()
+    audio = np.asarray(samples, dtype=np.float32)
+    duration_s = len(audio) / float(sample_rate)
+    hop = max(1, int(frame_s * sample_rate))
+    frames = len(audio) // hop
+    if frames == 0:
+        return []
+
+    power = np.square(audio[: frames * hop].reshape(frames, hop)).mean(axis=1)
+    level_db = 10.0 * np.log10(power + 1e-12)
+    voiced = np.concatenate(([False], level_db > threshold_db, [False]))
+    edges = np.flatnonzero(np.diff(voiced.astype(np.int8)))
+    runs = [
+        (start * hop / sample_rate, end * hop / sample_rate)
+        for start, end in zip(edges[::2], edges[1::2], strict=True)
+    ]
+
+    merged: list[tuple[float, float]] = []
+    for start, end in runs:
+        if merged and start - merged[-1][1] < min_silence_s:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    regions: list[tuple[float, float]] = []
+    for start, end in merged:
+        if end - start < min_speech_s:
+            continue
+        start = max(0.0, start - pad_s)
+        end = min(duration_s, end + pad_s)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+@dataclass(frozen=True, slots=True)
+class SpeechTimeline:
+    """Mapping between the original audio and its speech-only version.
+
+    Parameters
+    ----------
+    regions:
+        ``(start_s, end_s)`` speech regions on the original timeline.
+    duration_s:
+        Duration of the original audio.
+    sample_rate:
+        Sample rate used to cut the audio.
+    """
+
+    regions: list[tuple[float, float]]
+    duration_s: float
+    sample_rate: int = SAMPLE_RATE
+    _offsets: list[float] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        offsets = [0.0]
+        for start, end in self.regions:
+            offsets.append(offsets[-1] + (end - start))
+        object.__setattr__(self, "_offsets", offsets)
+
+    @classmethod
+    def detect(
+        cls,
+        samples: np.ndarray[Any, Any],
+        *,
+        sample_rate: int = SAMPLE_RATE,
+    ) -> SpeechTimeline:
+        """Run :func:`detect_speech` on ``samples``."""
+        return cls(
+            regions=detect_speech(samples, sample_rate=sample_rate),
+            duration_s=len(samples) / float(sample_rate),
+            sample_rate=sample_rate,
+        )
+
+    @property
+    def speech_s(self) -> float:
+        """Seconds of audio kept."""
+        return self._offsets[-1]
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Fraction of the original audio that was cut out."""
+        if self.duration_s <= 0.0:
+            return 0.0
+        return max(0.0, 1.0 - self.speech_s / self.duration_s)
+
+    def compact(self, samples: np.ndarray[Any, Any]) -> np.ndarray[Any, Any]:
+        """Return only the speech regions of ``samples``, concatenated."""
+        numpy = _numpy()
+        audio: np.ndarray[Any, Any] = numpy.asarray(
+            samples,
+            dtype=numpy.float32,
+        )
+        if not self.regions:
+            return audio[:0]
+        rate = self.sample_rate
+        speech: np.ndarray[Any, Any] = numpy.concatenate(
+            [audio[int(s * rate) : int(e * rate)] for s, e in self.regions]
+        )
+        return speech
+
+    def to_original(self, t: float, *, end: bool = False) -> float:
+        """Map a time in the compacted audio back to the original.
+
+        A time exactly on the join of two regions belongs to the earlier
+        region when ``end`` is set (segment ends) and to the later one
+        otherwise (segment starts).
+        """
+        if not self.regions:
+            return t
+        find = bisect_left if end else bisect_right
+        idx = min(max(find(self._offsets, t) - 1, 0), len(self.regions) - 1)
+        start, region_end = self.regions[idx]
+        return min(start + (t - self._offsets[idx]), region_end)
+
+    def remap(
+        self,
+        segments: SegmentTable | Iterable[Segment],
+    ) -> SegmentTable:
+        """Move segment timestamps back onto the original timeline."""
+        table = SegmentTable.coerce(segments)
+        return table.retimed(
+            (self.to_original(t) for t in table.starts),
+            (self.to_original(t, end=True) for t in table.ends),
+        )
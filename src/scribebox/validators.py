@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from urllib.parse import urlparse
+import re
+from urllib.parse import parse_qs, urlparse
 
 from .exceptions import InvalidInputError
 
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_PATH_PREFIXES = ("embed", "shorts", "live", "v", "e")
+
 
 def validate_youtube_url(url: str) -> str:
     """Validate that a URL looks like a YouTube link.
@@ -39,3 +43,69 @@ def validate_youtube_url(url: str) -> str:
         "URL does not look like a YouTube URL "
         "(expected youtube.com or youtu.be)."
     )
+
+
+def extract_youtube_video_id(url: str) -> str:
+    """Return the 11-character video id referenced by a YouTube URL.
+
+    Handles ``watch?v=``, ``youtu.be/``, ``/shorts/``, ``/embed/``,
+    ``/live/`` and ``/v/`` links on any YouTube host, ignoring extra query
+    parameters such as ``t=`` or ``list=``.
+
+    Parameters
+    ----------
+    url:
+        Input URL.
+
+    Returns
+    -------
+    str
+        The video id.
+
+    Raises
+    ------
+    InvalidInputError
+        If the URL is not a YouTube video link.
+    """
+
+    validate_youtube_url(url)
+    parsed = urlparse(url.strip())
+    host = (parsed.netloc or "").lower().split(":", 1)[0]
+    parts = [p for p in parsed.path.split("/") if p]
+
+    candidate: str | None = None
+    if host.endswith("youtu.be"):
+        candidate = parts[0] if parts else None
+    elif parts[:1] == ["watch"]:
+        candidate = next(iter(parse_qs(parsed.query).get("v", [])), None)
+    elif len(parts) >= 2 and parts[0] in _PATH_PREFIXES:
+        candidate = parts[1]
+
+    if candidate is None or not _VIDEO_ID_RE.match(candidate):
+        raise InvalidInputError(
+            "Could not find a YouTube video id in the URL."
+        )
+    return candidate
+
+
+def canonical_youtube_url(url: str) -> str:
+    """Return the canonical ``watch?v=`` URL for a YouTube link.
+
+    Parameters
+    ----------
+    url:
+        Any supported YouTube video URL.
+
+    Returns
+    -------
+    str
+        ``https://www.youtube.com/watch?v=<id>``.
+
+    Raises
+    ------
+    InvalidInputError
+        If the URL is not a YouTube video link.
+    """
+
+    video_id = extract_youtube_video_id(url)
+    return f"https://www.youtube.com/watch?v={video_id}"
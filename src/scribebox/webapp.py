@@ -2,18 +2,340 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+import os
+import shutil
 import tempfile
+from collections.abc import AsyncIterator, Iterator, Mapping
 from pathlib import Path
 
-from fastapi import FastAPI, File, Form, UploadFile
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
 
-from .backends import TranscribeOptions
-from .core import run_transcription
-from .youtube import download_youtube_audio
+from .admission import (
+    AdmissionController,
+    AdmissionLimits,
+    AdmissionRejectedError,
+    Ticket,
+)
+from .backends import iter_segments
+from .cache import (
+    TranscriptCache,
+    default_cache_dir,
+    default_transcript_cache,
+)
+from .core import RunResult, run_transcription
+from .exceptions import ExternalToolError
+from .jobs import JOB_TTL_S, Job, JobFn, JobQueue, JobStatus
+from .jobstore import JobSpec, JobStore, new_job_id, open_job_store
+from .media import get_audio_duration_s
+from .metrics import REGISTRY, collect_stages
+from .uploads import (
+    CHUNK_SIZE,
+    FfmpegSink,
+    FileSink,
+    UploadSink,
+    UploadStats,
+    UploadTooLargeError,
+    receive_upload,
+)
+from .worker import job_options
+from .writers import OutputFormat, parse_formats
+from .youtube import (
+    YoutubeAudioCache,
+    default_youtube_cache,
+    download_youtube_audio,
+)
 
 app = FastAPI(title="scribebox")
 
+_job_queue: JobQueue | None = None
+_job_store: JobStore | None = None
+_admission: AdmissionController | None = None
+_transcript_cache: TranscriptCache | None = None
+_youtube_cache: YoutubeAudioCache | None = None
+
+
+def _workers() -> int:
+    return int(os.environ.get("SCRIBEBOX_WORKERS", "1"))
+
+
+def get_job_queue() -> JobQueue:
+    """Return the app's job queue, starting its workers on first use.
+
+    The pool size is read from ``SCRIBEBOX_WORKERS`` (default: 1) and
+    how long finished jobs are kept from ``SCRIBEBOX_JOB_TTL_S``.
+    """
+    global _job_queue
+    if _job_queue is None:
+        ttl_s = os.environ.get("SCRIBEBOX_JOB_TTL_S", "").strip()
+        _job_queue = JobQueue(
+            workers=_workers(),
+            ttl_s=float(ttl_s) if ttl_s else JOB_TTL_S,
+        )
+    return _job_queue
+
+
+def get_job_store() -> JobStore | None:
+    """Return the shared job store, if ``SCRIBEBOX_JOB_STORE`` is set.
+
+    With a store, ``/jobs`` only records submissions and serves results;
+    ``scribebox worker`` processes, on this host or others, run the jobs.
+    """
+    global _job_store
+    location = os.environ.get("SCRIBEBOX_JOB_STORE", "").strip()
+    if _job_store is None and location:
+        _job_store = open_job_store(location)
+    return _job_store
+
+
+def get_admission() -> AdmissionController:
+    """Return the admission controller shared by all requests.
+
+    Limits are read from the environment on first use; see
+    :meth:`scribebox.admission.AdmissionLimits.from_env`.
+    """
+    global _admission
+    if _admission is None:
+        limits = AdmissionLimits.from_env(workers=_workers())
+        _admission = AdmissionController(limits)
+    return _admission
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """Return the transcript cache shared by all requests."""
+    global _transcript_cache
+    if _transcript_cache is None:
+        _transcript_cache = default_transcript_cache()
+    return _transcript_cache
+
+
+def get_youtube_cache() -> YoutubeAudioCache:
+    """Return the YouTube download cache shared by all requests."""
+    global _youtube_cache
+    if _youtube_cache is None:
+        _youtube_cache = default_youtube_cache()
+    return _youtube_cache
+
+
+def _max_upload_bytes() -> int | None:
+    return get_admission().limits.max_upload_bytes
+
+
+def _rejected(exc: AdmissionRejectedError) -> HTTPException:
+    headers = None
+    if exc.retry_after_s is not None:
+        headers = {"Retry-After": str(exc.retry_after_s)}
+    return HTTPException(
+        status_code=exc.status_code,
+        detail=str(exc),
+        headers=headers,
+    )
+
+
+def _check_admission(*, start: bool) -> None:
+    """Turn the request away before its body is read, if saturated."""
+    try:
+        get_admission().check(start=start)
+    except AdmissionRejectedError as exc:
+        raise _rejected(exc) from exc
+
+
+def _admit(audio_path: Path | None, *, start: bool) -> Ticket:
+    """Admit a request by the probed duration of its input."""
+    audio_s = None if audio_path is None else get_audio_duration_s(audio_path)
+    try:
+        return get_admission().admit(audio_s, start=start)
+    except AdmissionRejectedError as exc:
+        raise _rejected(exc) from exc
+
+
+def _check_store(store: JobStore, audio_s: float | None) -> None:
+    """Apply the queued-audio limits to the shared store's backlog."""
+    try:
+        get_admission().check_queued(
+            audio_s,
+            outstanding_s=store.outstanding_audio_s(),
+        )
+    except AdmissionRejectedError as exc:
+        raise _rejected(exc) from exc
+
+
+def _job_outdir(store: JobStore | None) -> tuple[str | None, Path]:
+    """Return the job id to use and the directory for its files."""
+    if store is None:
+        return None, Path(tempfile.mkdtemp(prefix="scribebox_"))
+    # Workers on other hosts read inputs from and write outputs to the
+    # store's shared directory.
+    job_id = new_job_id()
+    outdir = store.job_dir(job_id)
+    outdir.mkdir(parents=True)
+    return job_id, outdir
+
+
+@contextlib.contextmanager
+def _discard_on_error(outdir: Path) -> Iterator[None]:
+    """Remove a request's scratch directory if the request fails."""
+    try:
+        yield
+    except BaseException:
+        shutil.rmtree(outdir, ignore_errors=True)
+        raise
+
+
+def _enqueue(
+    store: JobStore,
+    spec: JobSpec,
+    *,
+    job_id: str | None,
+    info: Mapping[str, object] | None = None,
+) -> Job:
+    """Record a job in the shared store for ``scribebox worker``."""
+    audio_s = (
+        None
+        if spec.audio_path is None
+        else get_audio_duration_s(spec.audio_path)
+    )
+    _check_store(store, audio_s)
+    return store.submit(spec, job_id=job_id, audio_s=audio_s, info=info)
+
+
+def _get_job(job_id: str) -> Job:
+    store = get_job_store()
+    job = get_job_queue().get(job_id) if store is None else store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job.")
+    return job
+
+
+def _run_admitted(ticket: Ticket, fn: JobFn) -> RunResult:
+    """Run a queued job once a decode slot is free."""
+    ticket.start()
+    with ticket:
+        return fn()
+
+
+def _upload_name(filename: str | None) -> str:
+    return Path(filename or "").name or "audio.bin"
+
+
+async def _upload_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(CHUNK_SIZE):
+        yield chunk
+
+
+async def _receive(
+    chunks: AsyncIterator[bytes],
+    sink: UploadSink,
+) -> tuple[Path, UploadStats]:
+    try:
+        return await receive_upload(
+            chunks,
+            sink,
+            max_bytes=_max_upload_bytes(),
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ExternalToolError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+async def _store_upload(
+    file: UploadFile,
+    outdir: Path,
+) -> tuple[Path, UploadStats]:
+    sink = FileSink(outdir / _upload_name(file.filename))
+    return await _receive(_upload_chunks(file), sink)
+
+
+def _formats(value: str | None) -> tuple[str, ...]:
+    try:
+        return tuple(fmt.value for fmt in parse_formats(value))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def _result_headers(result: RunResult) -> dict[str, str]:
+    headers = {"X-Scribebox-Cache": "hit" if result.cache_hit else "miss"}
+    if result.stage_timings:
+        headers["Server-Timing"] = ", ".join(
+            f"{stage};dur={seconds * 1000.0:.1f}"
+            for stage, seconds in result.stage_timings.items()
+        )
+    return headers
+
+
+def _transcribe_url_job(
+    *,
+    url: str,
+    outdir: Path,
+    pdf: bool,
+    language: str | None,
+    formats: tuple[str, ...] = (),
+    ticket: Ticket | None = None,
+) -> RunResult:
+    with collect_stages():
+        audio = download_youtube_audio(
+            url=url,
+            outdir=outdir,
+            cache=get_youtube_cache(),
+        )
+        if ticket is not None:
+            # The duration is only known once the audio is downloaded.
+            ticket.set_audio_s(get_audio_duration_s(audio))
+        return _transcribe_path_job(
+            audio_path=audio,
+            outdir=outdir,
+            pdf=pdf,
+            language=language,
+            title=url,
+            formats=formats,
+        )
+
+
+def _transcribe_path_job(
+    *,
+    audio_path: Path,
+    outdir: Path,
+    pdf: bool,
+    language: str | None,
+    title: str | None,
+    formats: tuple[str, ...] = (),
+) -> RunResult:
+    options = job_options(language)
+    with collect_stages():
+        return run_transcription(
+            audio_path=audio_path,
+            outdir=outdir,
+            pdf=pdf,
+            backend="faster-whisper",
+            options=options,
+            title=title,
+            audio_duration_s=get_audio_duration_s(audio_path),
+            cache=get_transcript_cache(),
+            formats=formats,
+            # Job output directories are per request; keep checkpoints in
+            # a shared place so a resubmitted source resumes.
+            checkpoint_dir=default_cache_dir() / "checkpoints",
+        )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Expose metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
 
 @app.get("/", response_class=HTMLResponse)
 def index() -> str:
@@ -40,6 +362,15 @@ def index() -> str:
       <input type="text" name="language" placeholder="language (e.g. en)" />
       <button type="submit">Transcribe</button>
     </form>
+
+    <h3>Background job (URL or upload)</h3>
+    <form action="/jobs" method="post" enctype="multipart/form-data">
+      <input type="text" name="url" size="80" placeholder="YouTube URL" />
+      <input type="file" name="file" />
+      <label><input type="checkbox" name="pdf" /> PDF</label>
+      <input type="text" name="language" placeholder="language (e.g. en)" />
+      <button type="submit">Queue</button>
+    </form>
   </body>
 </html>
 """
@@ -52,20 +383,25 @@ def transcribe_url(
     language: str | None = Form(None),
 ) -> FileResponse:
     """Download and transcribe a YouTube URL."""
+    ticket = _admit(None, start=True)
     outdir = Path(tempfile.mkdtemp(prefix="scribebox_"))
-    audio = download_youtube_audio(url=url, outdir=outdir)
-
-    options = TranscribeOptions(model="large-v3", language=language)
-    result = run_transcription(
-        audio_path=audio,
-        outdir=outdir,
-        pdf=pdf,
-        backend="faster-whisper",
-        options=options,
-        title=url,
-    )
+    try:
+        with _discard_on_error(outdir), ticket:
+            result = _transcribe_url_job(
+                url=url,
+                outdir=outdir,
+                pdf=pdf,
+                language=language,
+                ticket=ticket,
+            )
+    except AdmissionRejectedError as exc:
+        raise _rejected(exc) from exc
     chosen = result.pdf_path if pdf else result.text_path
-    return FileResponse(path=str(chosen), filename=chosen.name)
+    return FileResponse(
+        path=str(chosen),
+        filename=chosen.name,
+        headers=_result_headers(result),
+    )
 
 
 @app.post("/transcribe-file")
@@ -75,18 +411,329 @@ async def transcribe_file_endpoint(
     language: str | None = Form(None),
 ) -> FileResponse:
     """Transcribe an uploaded file."""
+    _check_admission(start=True)
     outdir = Path(tempfile.mkdtemp(prefix="scribebox_"))
-    path = outdir / (file.filename or "audio.bin")
-    path.write_bytes(await file.read())
-
-    options = TranscribeOptions(model="large-v3", language=language)
-    result = run_transcription(
-        audio_path=path,
-        outdir=outdir,
-        pdf=pdf,
-        backend="faster-whisper",
-        options=options,
-        title=file.filename,
-    )
+    with _discard_on_error(outdir):
+        path, _ = await _store_upload(file, outdir)
+        # The probe and the decode run off the event loop, so concurrent
+        # requests still reach admission and get their 503.
+        ticket = await asyncio.to_thread(_admit, path, start=True)
+        with ticket:
+            result = await asyncio.to_thread(
+                _transcribe_path_job,
+                audio_path=path,
+                outdir=outdir,
+                pdf=pdf,
+                language=language,
+                title=file.filename,
+            )
     chosen = result.pdf_path if pdf else result.text_path
-    return FileResponse(path=str(chosen), filename=chosen.name)
+    return FileResponse(
+        path=str(chosen),
+        filename=chosen.name,
+        headers=_result_headers(result),
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    url: str | None = Form(None),
+    file: UploadFile | None = File(None),
+    pdf: bool = Form(False),
+    language: str | None = Form(None),
+    formats: str | None = Form(None),
+) -> JSONResponse:
+    """Queue a transcription job for a YouTube URL or an uploaded file.
+
+    Returns immediately with the job id; poll ``GET /jobs/{id}``.
+    ``formats`` (e.g. ``srt,vtt,json``) adds output formats to the TXT.
+    With ``SCRIBEBOX_JOB_STORE`` set, the job is recorded in the shared
+    store for ``scribebox worker`` processes instead of run in-process.
+    """
+    extra = _formats(formats)
+    url = (url or "").strip() or None
+    if file is not None and not file.filename:
+        file = None
+    if (url is None) == (file is None):
+        raise HTTPException(
+            status_code=422,
+            detail="Provide exactly one of 'url' or 'file'.",
+        )
+
+    store = get_job_store()
+    if store is None:
+        _check_admission(start=False)
+    else:
+        _check_store(store, None)
+    job_id, outdir = _job_outdir(store)
+    with _discard_on_error(outdir):
+        if store is not None:
+            if url is not None:
+                spec = JobSpec(
+                    outdir=outdir,
+                    url=url,
+                    pdf=pdf,
+                    language=language,
+                    formats=extra,
+                    title=url,
+                )
+                job = _enqueue(store, spec, job_id=job_id)
+            elif file is not None:
+                path, stats = await _store_upload(file, outdir)
+                spec = JobSpec(
+                    outdir=outdir,
+                    audio_path=path,
+                    pdf=pdf,
+                    language=language,
+                    formats=extra,
+                    title=file.filename,
+                )
+                job = await asyncio.to_thread(
+                    _enqueue,
+                    store,
+                    spec,
+                    job_id=job_id,
+                    info={"upload": stats.to_dict()},
+                )
+        elif url is not None:
+            source = url
+            ticket = _admit(None, start=False)
+            job = get_job_queue().submit(
+                lambda: _run_admitted(
+                    ticket,
+                    lambda: _transcribe_url_job(
+                        url=source,
+                        outdir=outdir,
+                        pdf=pdf,
+                        language=language,
+                        formats=extra,
+                        ticket=ticket,
+                    ),
+                ),
+                title=source,
+                workdir=outdir,
+            )
+        elif file is not None:
+            filename = file.filename
+            path, stats = await _store_upload(file, outdir)
+            ticket = await asyncio.to_thread(_admit, path, start=False)
+            job = get_job_queue().submit(
+                lambda: _run_admitted(
+                    ticket,
+                    lambda: _transcribe_path_job(
+                        audio_path=path,
+                        outdir=outdir,
+                        pdf=pdf,
+                        language=language,
+                        title=filename,
+                        formats=extra,
+                    ),
+                ),
+                title=filename,
+                info={"upload": stats.to_dict()},
+                workdir=outdir,
+            )
+
+    return JSONResponse(
+        job.to_dict(),
+        status_code=202,
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+@app.post("/jobs/upload", status_code=202)
+async def submit_upload_job(
+    request: Request,
+    filename: str = "audio.bin",
+    pdf: bool = False,
+    language: str | None = None,
+    pipe: bool = False,
+    formats: str | None = None,
+) -> JSONResponse:
+    """Queue a job for a raw (non-multipart) request body.
+
+    The body is streamed in fixed-size chunks straight to the scratch
+    directory, or with ``pipe=true`` into ffmpeg's stdin so conversion to
+    16kHz WAV overlaps with the upload. Piping needs a streamable
+    container (mp3, wav, ogg/opus, webm, fragmented mp4).
+    """
+    extra = _formats(formats)
+    store = get_job_store()
+    if store is None:
+        _check_admission(start=False)
+    else:
+        _check_store(store, None)
+    job_id, outdir = _job_outdir(store)
+    with _discard_on_error(outdir):
+        name = _upload_name(filename)
+        sink: UploadSink
+        if pipe:
+            try:
+                sink = FfmpegSink(outdir / f"{Path(name).stem}.wav")
+            except ExternalToolError as exc:
+                raise HTTPException(status_code=503, detail=str(exc)) from exc
+        else:
+            sink = FileSink(outdir / name)
+
+        path, stats = await _receive(request.stream(), sink)
+        info = {"upload": stats.to_dict()}
+        if store is not None:
+            spec = JobSpec(
+                outdir=outdir,
+                audio_path=path,
+                pdf=pdf,
+                language=language,
+                formats=extra,
+                title=name,
+            )
+            job = await asyncio.to_thread(
+                _enqueue,
+                store,
+                spec,
+                job_id=job_id,
+                info=info,
+            )
+        else:
+            ticket = await asyncio.to_thread(_admit, path, start=False)
+            job = get_job_queue().submit(
+                lambda: _run_admitted(
+                    ticket,
+                    lambda: _transcribe_path_job(
+                        audio_path=path,
+                        outdir=outdir,
+                        pdf=pdf,
+                        language=language,
+                        title=name,
+                        formats=extra,
+                    ),
+                ),
+                title=name,
+                info=info,
+                workdir=outdir,
+            )
+    return JSONResponse(
+        job.to_dict(),
+        status_code=202,
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str) -> JSONResponse:
+    """Return the status of a job."""
+    job = _get_job(job_id)
+    return JSONResponse(job.to_dict())
+
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str, format: str = "txt") -> FileResponse:
+    """Return the TXT (default) or another output of a finished job."""
+    job = _get_job(job_id)
+    if job.status is JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status is not JobStatus.DONE or job.result is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {job.status.value}.",
+        )
+
+    try:
+        chosen = job.result.outputs.get(OutputFormat(format))
+    except ValueError:
+        chosen = None
+    if chosen is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Format not available: {format}",
+        )
+    return FileResponse(
+        path=str(chosen),
+        filename=chosen.name,
+        headers=_result_headers(job.result),
+    )
+
+
+def _sse(event: str, data: dict[str, object]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_segment_events(
+    *,
+    url: str | None,
+    audio_path: Path | None,
+    outdir: Path,
+    language: str | None,
+    ticket: Ticket,
+) -> Iterator[str]:
+    try:
+        if url is not None:
+            audio_path = download_youtube_audio(
+                url=url,
+                outdir=outdir,
+                cache=get_youtube_cache(),
+            )
+            ticket.set_audio_s(get_audio_duration_s(audio_path))
+        assert audio_path is not None
+        options = job_options(language)
+        stream = iter_segments(
+            audio_path=audio_path,
+            backend="faster-whisper",
+            options=options,
+        )
+        yield _sse("start", {"language": stream.language})
+        for seg in stream:
+            yield _sse(
+                "segment",
+                {"start_s": seg.start_s, "end_s": seg.end_s, "text": seg.text},
+            )
+    except Exception as exc:
+        yield _sse("error", {"detail": str(exc) or type(exc).__name__})
+        return
+    finally:
+        # Also runs when the client disconnects and the stream is closed.
+        # Nothing is sent back from the scratch directory, so the upload
+        # or download in it can go at once.
+        ticket.release()
+        shutil.rmtree(outdir, ignore_errors=True)
+    yield _sse("done", {"language": stream.language})
+
+
+@app.post("/transcribe-stream")
+async def transcribe_stream(
+    url: str | None = Form(None),
+    file: UploadFile | None = File(None),
+    language: str | None = Form(None),
+) -> StreamingResponse:
+    """Stream segments as server-sent events while they are decoded.
+
+    Emits ``start``, one ``segment`` event per decoded segment, then
+    ``done`` (or ``error``).
+    """
+    url = (url or "").strip() or None
+    if file is not None and not file.filename:
+        file = None
+    if (url is None) == (file is None):
+        raise HTTPException(
+            status_code=422,
+            detail="Provide exactly one of 'url' or 'file'.",
+        )
+
+    _check_admission(start=True)
+    outdir = Path(tempfile.mkdtemp(prefix="scribebox_"))
+    audio_path: Path | None = None
+    with _discard_on_error(outdir):
+        if file is not None:
+            audio_path, _ = await _store_upload(file, outdir)
+        ticket = await asyncio.to_thread(_admit, audio_path, start=True)
+
+    return StreamingResponse(
+        _stream_segment_events(
+            url=url,
+            audio_path=audio_path,
+            outdir=outdir,
+            language=language,
+            ticket=ticket,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
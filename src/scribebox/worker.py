@@ -0,0 +1,269 @@
+"""Worker processes draining a durable :mod:`~scribebox.jobstore`."""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from .admission import AdmissionRejectedError
+from .backends import TranscribeOptions
+from .cache import default_transcript_cache
+from .core import RunResult, run_transcription
+from .exceptions import InvalidInputError
+from .jobs import JobStatus
+from .jobstore import DEFAULT_LEASE_S, ClaimedJob, JobSpec, JobStore
+from .media import get_audio_duration_s
+from .metrics import JOBS_FINISHED, collect_stages
+from .tuning import load_profile
+from .youtube import default_youtube_cache, download_youtube_audio
+
+# Errors that fail the same way on every attempt.
+PERMANENT_ERRORS: tuple[type[Exception], ...] = (
+    InvalidInputError,
+    AdmissionRejectedError,
+    FileNotFoundError,
+)
+
+# Called with a job and an event that is set once its lease is lost.
+Execute = Callable[[JobSpec, threading.Event], RunResult]
+# Called with a claimed job and what happened to it.
+OnEvent = Callable[[ClaimedJob, str], None]
+
+
+def worker_id() -> str:
+    """Return an identifier for this process, unique across hosts."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def job_options(language: str | None) -> TranscribeOptions:
+    """Return decode options for queued and web requests.
+
+    ``SCRIBEBOX_BATCH_SIZE`` enables faster-whisper's batched pipeline
+    and ``SCRIBEBOX_DRAFT_MODEL`` draft-and-refine decoding. Compute
+    settings come from the ``scribebox tune`` profile of this host, if
+    there is one.
+    """
+    raw = os.environ.get("SCRIBEBOX_BATCH_SIZE", "").strip()
+    draft = os.environ.get("SCRIBEBOX_DRAFT_MODEL", "").strip()
+    options = TranscribeOptions(
+        model="large-v3",
+        language=language,
+        batch_size=int(raw) if raw else None,
+        draft_model=draft or None,
+    )
+    profile = load_profile(
+        backend="faster-whisper",
+        model=options.model,
+        device=options.device,
+    )
+    return options if profile is None else profile.apply(options)
+
+
+def run_spec(
+    spec: JobSpec,
+    *,
+    checkpoint_dir: Path | None,
+    cancel: threading.Event | None = None,
+) -> RunResult:
+    """Transcribe ``spec`` with this host's caches.
+
+    Parameters
+    ----------
+    spec:
+        What to transcribe.
+    checkpoint_dir:
+        Shared checkpoint directory, so a retry on another worker resumes
+        where the failed attempt stopped.
+    cancel:
+        Stops the decode once set (see :func:`run_transcription`).
+    """
+    with collect_stages():
+        if spec.url is not None:
+            audio_path = download_youtube_audio(
+                url=spec.url,
+                outdir=spec.outdir,
+                cache=default_youtube_cache(),
+            )
+        elif spec.audio_path is not None:
+            audio_path = spec.audio_path
+        else:
+            raise InvalidInputError("Job has neither a URL nor a file.")
+        return run_transcription(
+            audio_path=audio_path,
+            outdir=spec.outdir,
+            pdf=spec.pdf,
+            backend="faster-whisper",
+            options=job_options(spec.language),
+            title=spec.title,
+            audio_duration_s=get_audio_duration_s(audio_path),
+            cache=default_transcript_cache(),
+            formats=spec.formats,
+            checkpoint_dir=checkpoint_dir,
+            cancel=cancel,
+        )
+
+
+class Heartbeat:
+    """Renew a job lease from a background thread while it runs.
+
+    ``lost`` is set once another worker has taken the job over, so the
+    running attempt can stop instead of writing over the new holder's
+    outputs and checkpoint.
+
+    Parameters
+    ----------
+    store:
+        Store holding the lease.
+    job_id:
+        Leased job.
+    worker:
+        Worker holding the lease.
+    lease_s:
+        Lease length; it is renewed every third of it.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        job_id: str,
+        worker: str,
+        *,
+        lease_s: float,
+    ) -> None:
+        self._store = store
+        self._job_id = job_id
+        self._worker = worker
+        self._lease_s = lease_s
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"scribebox-heartbeat-{job_id}",
+            daemon=True,
+        )
+
+    def __enter__(self) -> Heartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._lease_s / 3.0):
+            try:
+                held = self._store.heartbeat(
+                    self._job_id,
+                    self._worker,
+                    lease_s=self._lease_s,
+                )
+            except Exception:
+                # The store may be briefly unreachable; the lease still
+                # has two thirds left.
+                continue
+            if not held:
+                self.lost.set()
+                return
+
+
+def run_worker(
+    store: JobStore,
+    *,
+    worker: str | None = None,
+    lease_s: float = DEFAULT_LEASE_S,
+    poll_s: float = 2.0,
+    max_jobs: int | None = None,
+    exit_when_idle: bool = False,
+    stop: threading.Event | None = None,
+    execute: Execute | None = None,
+    on_event: OnEvent | None = None,
+) -> int:
+    """Claim and run jobs from ``store`` until stopped.
+
+    Each claimed job is leased to this worker and the lease is renewed
+    while the job runs; if the worker dies, the job is handed to another
+    worker once the lease expires. Failures are retried by the store
+    until its attempt limit, except for :data:`PERMANENT_ERRORS`.
+
+    Parameters
+    ----------
+    store:
+        Job store to drain.
+    worker:
+        Worker identifier (default: :func:`worker_id`).
+    lease_s:
+        Lease length in seconds.
+    poll_s:
+        Wait between polls when the queue is empty.
+    max_jobs:
+        Stop after this many jobs.
+    exit_when_idle:
+        Stop once the queue is empty instead of polling.
+    stop:
+        Event that stops the worker between jobs.
+    execute:
+        Runs a job (default: :func:`run_spec` with checkpoints under the
+        store root). It is passed an event that is set if the lease is
+        lost, and should stop as soon as it can once it is.
+    on_event:
+        Called with each claimed job and a one-line description of
+        what happened to it.
+
+    Returns
+    -------
+    int
+        Number of jobs run.
+    """
+    worker = worker or worker_id()
+    stop = stop or threading.Event()
+    if execute is None:
+        checkpoint_dir = store.root / "checkpoints"
+
+        def execute(spec: JobSpec, cancel: threading.Event) -> RunResult:
+            return run_spec(
+                spec,
+                checkpoint_dir=checkpoint_dir,
+                cancel=cancel,
+            )
+
+    report = on_event or (lambda claimed, message: None)
+    ran = 0
+    while not stop.is_set() and (max_jobs is None or ran < max_jobs):
+        claimed = store.claim(worker, lease_s=lease_s)
+        if claimed is None:
+            if exit_when_idle:
+                break
+            stop.wait(poll_s)
+            continue
+        ran += 1
+        report(claimed, f"started (attempt {claimed.attempt})")
+        with Heartbeat(store, claimed.id, worker, lease_s=lease_s) as beat:
+            try:
+                result = execute(claimed.spec, beat.lost)
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+                status = store.fail(
+                    claimed.id,
+                    worker,
+                    error,
+                    retry=not isinstance(exc, PERMANENT_ERRORS),
+                )
+                if status is JobStatus.FAILED:
+                    JOBS_FINISHED.inc(status=status)
+                    report(claimed, f"failed: {error}")
+                elif status is JobStatus.QUEUED:
+                    report(claimed, f"will be retried: {error}")
+                else:
+                    report(claimed, f"lease lost: {error}")
+                continue
+        if store.complete(claimed.id, worker, result):
+            JOBS_FINISHED.inc(status=JobStatus.DONE)
+            report(claimed, "done")
+        else:
+            # The lease expired and another worker took the job over.
+            report(claimed, "lease lost; result discarded")
+    return ran
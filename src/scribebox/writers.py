@@ -0,0 +1,322 @@
+"""Write several output formats from one segment stream."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, TextIO
+
+from .metrics import timed_stage
+from .transcript import BUFFER_SIZE, TextWriter
+from .types import Segment, SegmentTable
+
+if TYPE_CHECKING:
+    from .pdf import PdfWriter
+
+
+class OutputFormat(StrEnum):
+    """Transcript output format."""
+
+    TXT = "txt"
+    SRT = "srt"
+    VTT = "vtt"
+    JSON = "json"
+    PDF = "pdf"
+
+
+def parse_formats(
+    value: str | Iterable[str] | None,
+    *,
+    pdf: bool = False,
+) -> tuple[OutputFormat, ...]:
+    """Parse a format list such as ``"srt,vtt"``.
+
+    TXT is always produced (and listed first); ``pdf`` adds PDF as the
+    ``--pdf`` flag does. Duplicates are dropped.
+
+    Parameters
+    ----------
+    value:
+        Comma-separated string or iterable of format names.
+    pdf:
+        Also include PDF.
+
+    Returns
+    -------
+    tuple[OutputFormat, ...]
+        Formats in a stable order.
+
+    Raises
+    ------
+    ValueError
+        If a format is unknown.
+    """
+    names = value.split(",") if isinstance(value, str) else value or ()
+    wanted = {OutputFormat.TXT}
+    if pdf:
+        wanted.add(OutputFormat.PDF)
+    for name in names:
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            wanted.add(OutputFormat(name))
+        except ValueError:
+            choices = ", ".join(fmt.value for fmt in OutputFormat)
+            raise ValueError(
+                f"Unknown output format {name!r} (choose from {choices})."
+            ) from None
+    return tuple(fmt for fmt in OutputFormat if fmt in wanted)
+
+
+def format_timestamp(seconds: float, *, decimal: str = ",") -> str:
+    """Format ``seconds`` as ``HH:MM:SS,mmm`` (``decimal`` separates ms)."""
+    ms = max(0, round(seconds * 1000))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal}{ms:03d}"
+
+
+class SegmentSink(Protocol):
+    """Anything that accepts segments one at a time."""
+
+    def write(self, segment: Segment) -> None:
+        """Append one segment."""
+
+    def close(self) -> None:
+        """Finish the output."""
+
+
+class _BufferedWriter:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._fh: TextIO = path.open(
+            "w",
+            encoding="utf-8",
+            buffering=BUFFER_SIZE,
+        )
+
+    def flush(self) -> None:
+        """Push buffered output to the file."""
+        if not self._fh.closed:
+            self._fh.flush()
+
+    def close(self) -> None:
+        """Finish the file."""
+        if not self._fh.closed:
+            self._fh.close()
+
+
+def _cue_text(text: str) -> str:
+    return " ".join(line.strip() for line in text.strip().splitlines())
+
+
+class SrtWriter(_BufferedWriter):
+    """Write SubRip subtitles incrementally.
+
+    Parameters
+    ----------
+    path:
+        Output file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.cues = 0
+
+    def write(self, segment: Segment) -> None:
+        """Append one cue; segments without text are skipped."""
+        text = _cue_text(segment.text)
+        if not text:
+            return
+        self.cues += 1
+        self._fh.write(
+            f"{self.cues}\n"
+            f"{format_timestamp(segment.start_s)} --> "
+            f"{format_timestamp(segment.end_s)}\n"
+            f"{text}\n\n"
+        )
+
+
+class VttWriter(_BufferedWriter):
+    """Write WebVTT subtitles incrementally.
+
+    Parameters
+    ----------
+    path:
+        Output file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.cues = 0
+        self._fh.write("WEBVTT\n\n")
+
+    def write(self, segment: Segment) -> None:
+        """Append one cue; segments without text are skipped."""
+        # "-->" may not appear in a WebVTT cue payload.
+        text = _cue_text(segment.text).replace("-->", "->")
+        if not text:
+            return
+        self.cues += 1
+        self._fh.write(
+            f"{format_timestamp(segment.start_s, decimal='.')} --> "
+            f"{format_timestamp(segment.end_s, decimal='.')}\n"
+            f"{text}\n\n"
+        )
+
+
+class JsonWriter(_BufferedWriter):
+    """Stream a JSON document of segments.
+
+    The document is ``{"segments": [...], "language": ...}``; segments are
+    written as they arrive and the language, which backends may only know
+    after decoding, is written on close.
+
+    Parameters
+    ----------
+    path:
+        Output file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.language: str | None = None
+        self.segments = 0
+        self._fh.write('{"segments": [')
+
+    def write(self, segment: Segment) -> None:
+        """Append one segment."""
+        item = {
+            "start": segment.start_s,
+            "end": segment.end_s,
+            "text": segment.text.strip(),
+        }
+        sep = ",\n  " if self.segments else "\n  "
+        self._fh.write(sep + json.dumps(item, ensure_ascii=False))
+        self.segments += 1
+
+    def close(self) -> None:
+        """Write the language and finish the document."""
+        if self._fh.closed:
+            return
+        tail = "\n" if self.segments else ""
+        language = json.dumps(self.language)
+        self._fh.write(f'{tail}], "language": {language}}}\n')
+        super().close()
+
+
+class _PdfSink:
+    def __init__(self, writer: PdfWriter) -> None:
+        self._writer = writer
+
+    def write(self, segment: Segment) -> None:
+        text = segment.text.strip()
+        if text:
+            self._writer.write(text)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class OutputWriter:
+    """Fan one segment stream out to every requested format.
+
+    Each segment is handed to every format writer as it arrives, so all
+    outputs are produced in a single pass without joining the transcript
+    into one string per format. Time spent in each writer is recorded as
+    the ``write_<format>`` stage.
+
+    Parameters
+    ----------
+    outdir:
+        Directory receiving the outputs.
+    stem:
+        File name stem; each format adds its extension.
+    formats:
+        Formats to write.
+    title:
+        Title shown at the top of the PDF.
+    """
+
+    def __init__(
+        self,
+        outdir: Path,
+        stem: str,
+        formats: Iterable[OutputFormat],
+        *,
+        title: str | None = None,
+    ) -> None:
+        outdir.mkdir(parents=True, exist_ok=True)
+        self.paths: dict[OutputFormat, Path] = {}
+        self._sinks: list[tuple[OutputFormat, SegmentSink]] = []
+        self._json: JsonWriter | None = None
+        try:
+            for fmt in dict.fromkeys(formats):
+                path = outdir / f"{stem}.{fmt.value}"
+                self._sinks.append((fmt, self._open(fmt, path, title)))
+                self.paths[fmt] = path
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(
+        self,
+        fmt: OutputFormat,
+        path: Path,
+        title: str | None,
+    ) -> SegmentSink:
+        if fmt is OutputFormat.TXT:
+            return TextWriter(path)
+        if fmt is OutputFormat.SRT:
+            return SrtWriter(path)
+        if fmt is OutputFormat.VTT:
+            return VttWriter(path)
+        if fmt is OutputFormat.JSON:
+            self._json = JsonWriter(path)
+            return self._json
+        # ReportLab is only imported when a PDF is requested.
+        from .pdf import PdfWriter
+
+        return _PdfSink(PdfWriter(path, title=title))
+
+    def __enter__(self) -> OutputWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, segment: Segment) -> None:
+        """Hand one segment to every format writer."""
+        for fmt, sink in self._sinks:
+            with timed_stage(f"write_{fmt.value}"):
+                sink.write(segment)
+
+    def write_all(self, segments: SegmentTable | Iterable[Segment]) -> None:
+        """Write every segment of ``segments``."""
+        for segment in segments:
+            self.write(segment)
+
+    def flush(self) -> None:
+        """Make everything written so far visible in the files.
+
+        The PDF and the closing bracket of the JSON are only written by
+        :meth:`close`.
+        """
+        for fmt, sink in self._sinks:
+            if isinstance(sink, TextWriter | _BufferedWriter):
+                with timed_stage(f"write_{fmt.value}"):
+                    sink.flush()
+
+    def close(self, *, language: str | None = None) -> None:
+        """Finish every output; ``language`` is recorded in the JSON."""
+        if self._json is not None and language is not None:
+            self._json.language = language
+        sinks, self._sinks = self._sinks, []
+        for fmt, sink in sinks:
+            with timed_stage(f"write_{fmt.value}"):
+                sink.close()
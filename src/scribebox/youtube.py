@@ -2,31 +2,271 @@
 
 from __future__ import annotations
 
+import json
+import os
+import shutil
+import tempfile
+import time
 from pathlib import Path
+from typing import Any
 
 from .errors import ScribeboxError
+from .exceptions import InvalidInputError
+from .metrics import CACHE_LOOKUPS, timed_stage
+from .validators import canonical_youtube_url, extract_youtube_video_id
 
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024 * 1024
+DEFAULT_TTL_S = 30 * 24 * 3600.0
 
-def download_youtube_audio(*, url: str, outdir: Path) -> Path:
-    """Download YouTube audio as MP3 using yt-dlp.
+_META_NAME = "meta.json"
+_NATIVE_FORMAT = "bestaudio[ext=webm]/bestaudio[ext=m4a]/bestaudio/best"
+
+
+class YoutubeAudioCache:
+    """Persistent cache of downloaded audio keyed by YouTube video id.
+
+    Each video lives in ``<root>/<video_id>/`` next to a ``meta.json``
+    with the title, container and download time. Lookups refresh the
+    entry, so size-based eviction drops the least recently used videos.
+    Downloads go to a private staging directory that is renamed into
+    place once complete, so concurrent downloads of one video never
+    write into the same directory.
+
+    Parameters
+    ----------
+    root:
+        Cache directory.
+    max_bytes:
+        Total size budget; ``None`` disables size-based eviction.
+    ttl_s:
+        Maximum age since last use in seconds; ``None`` disables expiry.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        ttl_s: float | None = DEFAULT_TTL_S,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+
+    def entry_dir(self, video_id: str) -> Path:
+        """Return the directory holding ``video_id``."""
+        return self.root / video_id
+
+    def get(self, video_id: str) -> Path | None:
+        """Return the cached audio file for ``video_id``, if present."""
+        meta_path = self.entry_dir(video_id) / _META_NAME
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            audio = self.entry_dir(video_id) / str(meta["file"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if not audio.exists():
+            return None
+        age_s = time.time() - meta_path.stat().st_mtime
+        if self.ttl_s is not None and age_s > self.ttl_s:
+            shutil.rmtree(self.entry_dir(video_id), ignore_errors=True)
+            return None
+
+        os.utime(meta_path)
+        return audio
+
+    def staging_dir(self, video_id: str) -> Path:
+        """Create a private directory to download ``video_id`` into."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(prefix=f".{video_id}.", dir=self.root))
+
+    def put(self, video_id: str, audio: Path, info: dict[str, Any]) -> Path:
+        """Record a downloaded file and enforce the budget.
+
+        An ``audio`` file in a :meth:`staging_dir` is moved into the
+        entry directory along with its staging directory. If another
+        download of the same video got there first, the staged copy is
+        dropped and the existing file is returned.
+
+        Returns
+        -------
+        pathlib.Path
+            The cached audio file.
+        """
+        meta = {
+            "id": video_id,
+            "file": audio.name,
+            "title": info.get("title"),
+            "ext": audio.suffix.lstrip("."),
+            "acodec": info.get("acodec"),
+            "duration": info.get("duration"),
+            "size": audio.stat().st_size,
+            "downloaded_at": time.time(),
+        }
+        meta_path = audio.parent / _META_NAME
+        tmp = meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        tmp.replace(meta_path)
+
+        entry = self.entry_dir(video_id)
+        if audio.parent != entry:
+            audio = self._promote(video_id, audio)
+        self.evict(keep=video_id)
+        return audio
+
+    def _promote(self, video_id: str, audio: Path) -> Path:
+        staging = audio.parent
+        entry = self.entry_dir(video_id)
+        for _ in range(2):
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                # Another download finished first; keep its file unless
+                # the entry is left over from an interrupted one.
+                existing = self.get(video_id)
+                if existing is not None:
+                    shutil.rmtree(staging, ignore_errors=True)
+                    return existing
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                return entry / audio.name
+        raise ScribeboxError(f"Could not store {video_id} in the cache.")
+
+    def evict(self, *, keep: str | None = None) -> int:
+        """Drop expired entries and trim to the size budget.
+
+        Parameters
+        ----------
+        keep:
+            Video id that must not be evicted (e.g. the one just added).
+
+        Returns
+        -------
+        int
+            Number of videos removed.
+        """
+        entries: list[tuple[float, int, Path]] = []
+        for meta_path in self.root.glob(f"*/{_META_NAME}"):
+            entry = meta_path.parent
+            if entry.name == keep or entry.name.startswith("."):
+                continue
+            try:
+                used = meta_path.stat().st_mtime
+                size = sum(p.stat().st_size for p in entry.iterdir())
+            except OSError:
+                continue
+            entries.append((used, size, entry))
+
+        removed = 0
+        now = time.time()
+        kept: list[tuple[float, int, Path]] = []
+        for used, size, entry in entries:
+            if self.ttl_s is not None and now - used > self.ttl_s:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+            else:
+                kept.append((used, size, entry))
+
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in kept)
+            if keep is not None:
+                total += _dir_size(self.entry_dir(keep))
+            for _, size, entry in sorted(kept):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                removed += 1
+
+        return removed
+
+
+def _dir_size(path: Path) -> int:
+    try:
+        return sum(p.stat().st_size for p in path.iterdir())
+    except OSError:
+        return 0
+
+
+def default_youtube_cache() -> YoutubeAudioCache:
+    """Return the download cache under the scribebox cache directory.
+
+    The budget can be set with ``SCRIBEBOX_YOUTUBE_CACHE_MAX_MB`` and
+    ``SCRIBEBOX_YOUTUBE_CACHE_TTL_DAYS``.
+    """
+    from .cache import default_cache_dir
+
+    max_bytes: int | None = DEFAULT_MAX_BYTES
+    raw_mb = os.environ.get("SCRIBEBOX_YOUTUBE_CACHE_MAX_MB", "").strip()
+    if raw_mb:
+        max_bytes = int(float(raw_mb) * 1024 * 1024)
+
+    ttl_s: float | None = DEFAULT_TTL_S
+    raw_days = os.environ.get("SCRIBEBOX_YOUTUBE_CACHE_TTL_DAYS", "").strip()
+    if raw_days:
+        ttl_s = float(raw_days) * 24 * 3600.0
+
+    return YoutubeAudioCache(
+        default_cache_dir() / "youtube",
+        max_bytes=max_bytes,
+        ttl_s=ttl_s,
+    )
+
+
+def download_youtube_audio(
+    *,
+    url: str,
+    outdir: Path,
+    cache: YoutubeAudioCache | None = None,
+    transcode_mp3: bool = False,
+) -> Path:
+    """Download YouTube audio using yt-dlp.
+
+    The URL is canonicalized to its video id first. With a ``cache``, a
+    video that was downloaded before is returned without touching the
+    network, and new downloads are stored in the cache instead of
+    ``outdir``. By default the native audio stream (opus/webm or m4a) is
+    kept as-is; ffmpeg decodes it directly, so a lossy MP3 transcode only
+    adds work.
 
     Parameters
     ----------
     url:
         YouTube video URL.
     outdir:
-        Output directory for the produced MP3.
+        Output directory for the audio file when no cache is used.
+    cache:
+        Optional download cache keyed by video id.
+    transcode_mp3:
+        If True, re-encode to 192 kbps MP3 (previous behavior).
 
     Returns
     -------
     pathlib.Path
-        Path to the produced MP3 file.
+        Path to the audio file, named ``<video_id>.<ext>``.
 
     Raises
     ------
     ScribeboxError
         If yt-dlp is missing or the download fails.
     """
+    try:
+        video_id = extract_youtube_video_id(url)
+    except InvalidInputError as exc:
+        raise ScribeboxError(str(exc)) from exc
+
+    # A transcoded MP3 is not what the cache holds.
+    store = None if transcode_mp3 else cache
+    if store is not None:
+        cached = store.get(video_id)
+        CACHE_LOOKUPS.inc(
+            cache="youtube",
+            result="miss" if cached is None else "hit",
+        )
+        if cached is not None:
+            return cached
+
     try:
         import yt_dlp
     except Exception as exc:  # pragma: no cover
@@ -35,34 +275,76 @@ def download_youtube_audio(*, url: str, outdir: Path) -> Path:
             "Install with: pip install -e '.[youtube]'"
         ) from exc
 
-    outdir.mkdir(parents=True, exist_ok=True)
+    target = outdir if store is None else store.staging_dir(video_id)
+    target.mkdir(parents=True, exist_ok=True)
 
-    opts = {
-        "format": "bestaudio/best",
-        "outtmpl": str(outdir / "%(id)s.%(ext)s"),
+    opts: dict[str, Any] = {
+        "format": _NATIVE_FORMAT,
+        "outtmpl": str(target / "%(id)s.%(ext)s"),
         "quiet": True,
         "noplaylist": True,
-        "postprocessors": [
+    }
+    if transcode_mp3:
+        opts["format"] = "bestaudio/best"
+        opts["postprocessors"] = [
             {
                 "key": "FFmpegExtractAudio",
                 "preferredcodec": "mp3",
                 "preferredquality": "192",
             }
-        ],
-    }
+        ]
 
     try:
-        with yt_dlp.YoutubeDL(opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-    except Exception as exc:
-        raise ScribeboxError(f"Failed to download YouTube audio: {exc}") from exc
+        try:
+            with timed_stage("download"), yt_dlp.YoutubeDL(opts) as ydl:
+                info = ydl.extract_info(
+                    canonical_youtube_url(url),
+                    download=True,
+                )
+        except Exception as exc:
+            raise ScribeboxError(
+                f"Failed to download YouTube audio: {exc}"
+            ) from exc
+
+        if not isinstance(info, dict) or not info.get("id"):
+            raise ScribeboxError("Could not determine YouTube video id.")
+
+        audio_path = _downloaded_file(
+            info,
+            target,
+            transcode_mp3=transcode_mp3,
+        )
+        if audio_path is None:
+            raise ScribeboxError(
+                "yt-dlp finished but no audio file was created."
+            )
+    except BaseException:
+        if store is not None:
+            shutil.rmtree(target, ignore_errors=True)
+        raise
+
+    if store is not None:
+        return store.put(video_id, audio_path, info)
+    return audio_path
+
 
-    video_id = info.get("id") if isinstance(info, dict) else None
-    if not video_id:
-        raise ScribeboxError("Could not determine YouTube video id.")
+def _downloaded_file(
+    info: dict[str, Any],
+    target: Path,
+    *,
+    transcode_mp3: bool,
+) -> Path | None:
+    video_id = str(info["id"])
+    if transcode_mp3:
+        mp3_path = target / f"{video_id}.mp3"
+        return mp3_path if mp3_path.exists() else None
 
-    mp3_path = outdir / f"{video_id}.mp3"
-    if not mp3_path.exists():
-        raise ScribeboxError("yt-dlp finished but MP3 was not created.")
+    for item in info.get("requested_downloads") or []:
+        filepath = item.get("filepath") if isinstance(item, dict) else None
+        if filepath and Path(filepath).exists():
+            return Path(filepath)
 
-    return mp3_path
+    for candidate in sorted(target.glob(f"{video_id}.*")):
+        if candidate.suffix not in {".part", ".json", ".tmp", ".ytdl"}:
+            return candidate
+    return None
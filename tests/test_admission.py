@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from scribebox.admission import (
+    AdmissionController,
+    AdmissionLimits,
+    AdmissionRejectedError,
+    RejectReason,
+)
+from scribebox.metrics import ADMISSION_REJECTIONS
+
+
+def test_synchronous_requests_are_bounded_by_decode_slots() -> None:
+    admission = AdmissionController(AdmissionLimits(max_decodes=1))
+    before = ADMISSION_REJECTIONS.value(reason=RejectReason.DECODES)
+
+    ticket = admission.admit(60.0, start=True)
+    with pytest.raises(AdmissionRejectedError) as info:
+        admission.admit(30.0, start=True)
+    with pytest.raises(AdmissionRejectedError):
+        admission.check(start=True)
+
+    assert info.value.status_code == 503
+    assert info.value.retry_after_s is not None
+    assert info.value.retry_after_s >= 1
+    assert ADMISSION_REJECTIONS.value(reason=RejectReason.DECODES) == (
+        before + 2
+    )
+
+    ticket.release()
+    ticket.release()
+    assert admission.decodes == 0
+    assert admission.outstanding_audio_s == 0.0
+    admission.admit(30.0, start=True).release()
+
+
+def test_jobs_are_limited_by_outstanding_audio_seconds() -> None:
+    admission = AdmissionController(
+        AdmissionLimits(max_decodes=2, max_outstanding_audio_s=3600.0)
+    )
+
+    long_job = admission.admit(3000.0, start=False)
+    short_job = admission.admit(500.0, start=False)
+    with pytest.raises(AdmissionRejectedError) as info:
+        admission.admit(200.0, start=False)
+
+    # One 4-hour file is not one 30-second clip.
+    assert info.value.status_code == 429
+    assert info.value.reason is RejectReason.QUEUED_AUDIO
+    assert info.value.retry_after_s is not None
+    assert admission.outstanding_audio_s == 3500.0
+
+    with pytest.raises(AdmissionRejectedError) as too_long:
+        admission.admit(4 * 3600.0, start=False)
+    assert too_long.value.status_code == 413
+    assert too_long.value.retry_after_s is None
+
+    long_job.release()
+    admission.admit(200.0, start=False)
+    short_job.release()
+
+
+def test_per_request_audio_limit_applies_to_late_durations() -> None:
+    admission = AdmissionController(
+        AdmissionLimits(max_audio_s=600.0, max_outstanding_audio_s=1000.0)
+    )
+    ticket = admission.admit(None, start=False)
+
+    ticket.set_audio_s(300.0)
+    assert admission.outstanding_audio_s == 300.0
+    with pytest.raises(AdmissionRejectedError) as info:
+        ticket.set_audio_s(900.0)
+    assert info.value.status_code == 413
+
+    ticket.release()
+    assert admission.outstanding_audio_s == 0.0
+
+
+def test_queued_jobs_wait_for_a_decode_slot() -> None:
+    admission = AdmissionController(AdmissionLimits(max_decodes=1))
+    running = admission.admit(10.0, start=True)
+    queued = admission.admit(10.0, start=False)
+    started = threading.Event()
+
+    def worker() -> None:
+        queued.start()
+        started.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not started.wait(timeout=0.1)
+
+    running.release()
+    assert started.wait(timeout=5)
+    thread.join()
+    assert admission.decodes == 1
+    queued.release()
+    assert admission.decodes == 0
+
+
+def test_limits_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SCRIBEBOX_MAX_QUEUED_AUDIO_S", "7200")
+    monkeypatch.setenv("SCRIBEBOX_MAX_UPLOAD_MB", "1.5")
+    monkeypatch.delenv("SCRIBEBOX_MAX_DECODES", raising=False)
+    monkeypatch.delenv("SCRIBEBOX_MAX_AUDIO_S", raising=False)
+
+    limits = AdmissionLimits.from_env(workers=3)
+
+    assert limits == AdmissionLimits(
+        max_decodes=4,
+        max_outstanding_audio_s=7200.0,
+        max_upload_bytes=1536 * 1024,
+    )
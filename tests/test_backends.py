@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import scribebox.backends as backends
+from scribebox.backends import TranscribeOptions, iter_segments
+
+
+class _FakeModel:
+    def __init__(self) -> None:
+        self.decoded = 0
+
+    def transcribe(self, audio, **kwargs):
+        def gen():
+            for i in range(3):
+                self.decoded += 1
+                yield SimpleNamespace(start=i, end=i + 1, text=f" s{i} ")
+
+        return gen(), SimpleNamespace(language="en")
+
+
+def test_iter_segments_is_lazy(monkeypatch, tmp_path: Path) -> None:
+    model = _FakeModel()
+    monkeypatch.setattr(
+        backends,
+        "load_faster_whisper_model",
+        lambda *args, **kwargs: model,
+    )
+    progress: list[float] = []
+
+    stream = iter_segments(
+        audio_path=tmp_path / "a.wav",
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        progress_cb=progress.append,
+    )
+    assert stream.language == "en"
+    assert model.decoded == 0
+
+    first = next(stream)
+    assert first.text == "s0"
+    assert model.decoded == 1
+
+    rest = list(stream)
+    assert [s.text for s in rest] == ["s1", "s2"]
+    assert progress == [1.0, 2.0, 3.0]
+
+
+class _FakeBatchedPipeline:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append({"audio": audio, **kwargs})
+        segments = [
+            SimpleNamespace(start=0.0, end=30.0, text=" a "),
+            SimpleNamespace(start=30.0, end=45.0, text=" b "),
+        ]
+        return iter(segments), SimpleNamespace(language="en")
+
+
+def test_batch_size_uses_batched_pipeline(monkeypatch, tmp_path: Path) -> None:
+    pipeline = _FakeBatchedPipeline()
+    monkeypatch.setattr(
+        backends,
+        "load_faster_whisper_model",
+        lambda *args, **kwargs: _FakeModel(),
+    )
+    monkeypatch.setattr(backends, "_batched_pipeline", lambda m: pipeline)
+    monkeypatch.setattr(
+        "scribebox.ffmpeg.decode_pcm_16k_mono",
+        lambda path: [0.0] * (16000 * 45),
+    )
+    progress: list[float] = []
+
+    stream = iter_segments(
+        audio_path=tmp_path / "a.wav",
+        backend="faster-whisper",
+        options=TranscribeOptions(batch_size=8, vad_filter=False),
+        progress_cb=progress.append,
+    )
+    segments = list(stream)
+
+    assert [s.text for s in segments] == ["a", "b"]
+    assert progress == [30.0, 45.0]
+    call = pipeline.calls[0]
+    assert call["batch_size"] == 8
+    assert call["clip_timestamps"] == [
+        {"start": 0, "end": 16000 * 30},
+        {"start": 16000 * 30, "end": 16000 * 45},
+    ]
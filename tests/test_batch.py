@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import scribebox.backends as backends
+import scribebox.batch as batch
+from scribebox.backends import SegmentStream, TranscribeOptions
+from scribebox.batch import (
+    BatchManifest,
+    ItemStatus,
+    collect_inputs,
+    run_batch,
+)
+from scribebox.checkpoint import checkpoint_path
+from scribebox.core import RunResult
+from scribebox.types import TranscriptSegment
+
+
+@pytest.fixture()
+def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    calls: list[Path] = []
+
+    def fake_run_transcription(*, audio_path: Path, outdir: Path, **kwargs):
+        calls.append(audio_path)
+        if audio_path.name.startswith("bad"):
+            raise RuntimeError("cannot decode")
+        outdir.mkdir(parents=True, exist_ok=True)
+        txt = outdir / f"{audio_path.stem}.txt"
+        txt.write_text("ok\n", encoding="utf-8")
+        return RunResult(text_path=txt, pdf_path=None, detected_language="en")
+
+    monkeypatch.setattr(batch, "run_transcription", fake_run_transcription)
+    monkeypatch.setattr(batch, "get_audio_duration_s", lambda p: 1800.0)
+    return calls
+
+
+def test_collect_inputs_mirrors_subdirectories(tmp_path: Path) -> None:
+    src = tmp_path / "in"
+    (src / "a").mkdir(parents=True)
+    (src / "a" / "talk.mp3").write_bytes(b"x")
+    (src / "talk.wav").write_bytes(b"x")
+    (src / "notes.txt").write_text("skip me")
+
+    pairs = collect_inputs(src, tmp_path / "out")
+    assert pairs == [
+        (src / "a" / "talk.mp3", tmp_path / "out" / "a"),
+        (src / "talk.wav", tmp_path / "out"),
+    ]
+
+
+def test_collect_inputs_separates_listed_files_with_equal_stems(
+    tmp_path: Path,
+) -> None:
+    inputs = [
+        tmp_path / "a" / "talk.mp3",
+        tmp_path / "b" / "talk.mp3",
+        tmp_path / "b" / "talk.wav",
+        tmp_path / "a" / "other.mp3",
+    ]
+    listing = tmp_path / "inputs.txt"
+    listing.write_text("\n".join(map(str, inputs)), encoding="utf-8")
+
+    outdir = tmp_path / "out"
+    assert collect_inputs(listing, outdir) == [
+        (inputs[0], outdir / "a"),
+        (inputs[1], outdir / "b" / "mp3"),
+        (inputs[2], outdir / "b" / "wav"),
+        (inputs[3], outdir),
+    ]
+
+
+def test_run_batch_records_manifest_and_resumes(
+    tmp_path: Path,
+    fake_pipeline: list[Path],
+) -> None:
+    src = tmp_path / "in"
+    src.mkdir()
+    for name in ["one.mp3", "two.mp3", "bad.mp3"]:
+        (src / name).write_bytes(b"x")
+    outdir = tmp_path / "out"
+    manifest_path = outdir / "manifest.json"
+
+    summary = run_batch(
+        collect_inputs(src, outdir),
+        manifest=BatchManifest.load(manifest_path),
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        concurrency=2,
+    )
+
+    assert summary.processed == 2
+    assert [f[0] for f in summary.failures] == [str(src / "bad.mp3")]
+    assert summary.audio_s == 3600.0
+    assert summary.throughput is not None
+
+    reloaded = BatchManifest.load(manifest_path)
+    statuses = {Path(k).name: v.status for k, v in reloaded.items.items()}
+    assert statuses == {
+        "bad.mp3": ItemStatus.FAILED,
+        "one.mp3": ItemStatus.DONE,
+        "two.mp3": ItemStatus.DONE,
+    }
+
+    fake_pipeline.clear()
+    again = run_batch(
+        collect_inputs(src, outdir),
+        manifest=reloaded,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+    )
+    assert again.skipped == 2
+    assert fake_pipeline == [src / "bad.mp3"]
+
+
+def test_run_batch_resumes_an_item_killed_mid_run(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    segments = [
+        TranscriptSegment(0.0, 10.0, "one"),
+        TranscriptSegment(10.0, 20.0, "two"),
+    ]
+    starts: list[float] = []
+
+    def killed_after_one() -> Iterator[TranscriptSegment]:
+        yield segments[0]
+        raise KeyboardInterrupt
+
+    def fake_iter_segments(*, start_s: float = 0.0, **kwargs) -> SegmentStream:
+        starts.append(start_s)
+        if len(starts) == 1:
+            return SegmentStream(killed_after_one(), language="en")
+        rest = [seg for seg in segments if seg.start_s >= start_s]
+        return SegmentStream(rest, language="en")
+
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
+    monkeypatch.setattr(batch, "get_audio_duration_s", lambda p: 20.0)
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "talk.mp3").write_bytes(b"x")
+    outdir = tmp_path / "out"
+    manifest_path = outdir / "manifest.json"
+
+    def run() -> batch.BatchSummary:
+        return run_batch(
+            collect_inputs(src, outdir),
+            manifest=BatchManifest.load(manifest_path),
+            backend="faster-whisper",
+            options=TranscribeOptions(),
+        )
+
+    with pytest.raises(KeyboardInterrupt):
+        run()
+    # The partial TXT is newer than the source, but the checkpoint marks
+    # the item as unfinished.
+    assert (outdir / "talk.txt").exists()
+    assert checkpoint_path(outdir, "talk").exists()
+
+    summary = run()
+
+    assert summary.skipped == 0
+    assert summary.processed == 1
+    assert starts == [0.0, 10.0]
+    assert (outdir / "talk.txt").read_text(encoding="utf-8") == "one\ntwo\n"
+    assert not checkpoint_path(outdir, "talk").exists()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import wave
+from array import array
+from pathlib import Path
+
+import pytest
+
+from scribebox import bench
+from scribebox.bench import (
+    BenchRun,
+    FakeTranscriber,
+    compare_results,
+    load_results,
+    save_results,
+    write_synthetic_wav,
+)
+
+
+def test_write_synthetic_wav(tmp_path: Path) -> None:
+    path = write_synthetic_wav(tmp_path / "a.wav", duration_s=2.5)
+
+    with wave.open(str(path), "rb") as wf:
+        assert wf.getframerate() == 16000
+        assert wf.getnchannels() == 1
+        assert wf.getnframes() == 40000
+
+
+def test_fake_transcriber_covers_audio(tmp_path: Path) -> None:
+    path = write_synthetic_wav(tmp_path / "a.wav", duration_s=12.0)
+
+    result = FakeTranscriber(segment_s=5.0).transcribe(
+        path,
+        language="en",
+        translate_to_english=False,
+        model="fake",
+        device="cpu",
+    )
+
+    assert [s.start_s for s in result.segments] == [0.0, 5.0, 10.0]
+    assert result.segments[-1].end_s == 12.0
+    assert result.language == "en"
+
+
+def test_run_bench_reports_stages(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    def fake_decode(path: Path) -> array[int]:
+        with wave.open(str(path), "rb") as wf:
+            return array("h", wf.readframes(wf.getnframes()))
+
+    monkeypatch.setattr(bench, "decode_pcm_16k_mono", fake_decode)
+    monkeypatch.setattr(
+        "scribebox.service.decode_pcm_16k_mono",
+        fake_decode,
+    )
+
+    runs = bench.run_bench(durations_s=[10.0], repeat=1, workdir=tmp_path)
+
+    assert len(runs) == 1
+    assert set(runs[0].stages) == set(bench.STAGES)
+    assert runs[0].pipeline_s > 0.0
+    assert runs[0].real_time_factor > 0.0
+
+
+def test_compare_results_flags_regressions(tmp_path: Path) -> None:
+    baseline = [
+        BenchRun(
+            audio_s=60.0,
+            stages={"decode": 0.10, "write_pdf": 0.20},
+            pipeline_s=0.50,
+        )
+    ]
+    path = tmp_path / "base.json"
+    save_results(path, baseline, transcriber="fake")
+
+    current = [
+        BenchRun(
+            audio_s=60.0,
+            stages={"decode": 0.105, "write_pdf": 0.40},
+            pipeline_s=0.70,
+        )
+    ]
+    regressions = compare_results(load_results(path), current)
+
+    assert {r.metric for r in regressions} == {"pipeline", "write_pdf"}
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import scribebox.backends as backends
+from scribebox.backends import SegmentStream, TranscribeOptions
+from scribebox.cache import TranscriptCache, hash_file, transcript_cache_key
+from scribebox.core import run_transcription
+from scribebox.types import TranscriptSegment
+
+
+def test_cache_key_depends_on_content_not_name(tmp_path: Path) -> None:
+    a = tmp_path / "lecture.mp3"
+    b = tmp_path / "renamed.mp3"
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+    fields = {"model": "large-v3", "language": None}
+
+    key_a = transcript_cache_key(hash_file(a), fields)
+    key_b = transcript_cache_key(hash_file(b), fields)
+    assert key_a == key_b
+    assert key_a != transcript_cache_key(
+        hash_file(a),
+        {"model": "small", "language": None},
+    )
+
+
+def test_cache_round_trip_and_ttl(tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path / "c", ttl_s=60.0)
+    segs = [TranscriptSegment(0.0, 1.0, "hi")]
+    cache.put("ab" * 32, segs, "en")
+
+    hit = cache.get("ab" * 32)
+    assert hit is not None
+    assert hit.segments == segs
+    assert hit.language == "en"
+    assert hit.text == "hi"
+
+    entry = next((tmp_path / "c").glob("*/*.json"))
+    old = time.time() - 120
+    os.utime(entry, (old, old))
+    assert cache.get("ab" * 32) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path / "c", max_bytes=None)
+    segs = [TranscriptSegment(0.0, 1.0, "x" * 100)]
+    cache.put("aa" * 32, segs, None)
+    cache.put("bb" * 32, segs, None)
+    old = time.time() - 100
+    os.utime(next((tmp_path / "c").glob("aa/*.json")), (old, old))
+
+    size = next((tmp_path / "c").glob("bb/*.json")).stat().st_size
+    cache.max_bytes = size
+    assert cache.evict() == 1
+    assert cache.get("aa" * 32) is None
+    assert cache.get("bb" * 32) is not None
+
+
+def test_run_transcription_cache_hit_skips_decoding(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    calls = 0
+
+    def fake_iter_segments(**kwargs) -> SegmentStream:
+        nonlocal calls
+        calls += 1
+        return SegmentStream(
+            [TranscriptSegment(0.0, 1.0, "cached")],
+            language="en",
+        )
+
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
+    cache = TranscriptCache(tmp_path / "cache")
+
+    first = tmp_path / "a.mp3"
+    first.write_bytes(b"audio")
+    second = tmp_path / "b.mp3"
+    second.write_bytes(b"audio")
+
+    kwargs = dict(
+        outdir=tmp_path / "o",
+        pdf=False,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        cache=cache,
+    )
+    res1 = run_transcription(audio_path=first, **kwargs)
+    res2 = run_transcription(audio_path=second, **kwargs)
+
+    assert calls == 1
+    assert res1.cache_hit is False
+    assert res2.cache_hit is True
+    assert res2.detected_language == "en"
+    assert res2.text_path.read_text(encoding="utf-8") == "cached\n"
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import scribebox.backends as backends
+from scribebox.backends import SegmentStream, TranscribeOptions
+from scribebox.checkpoint import (
+    Checkpoint,
+    CheckpointBusyError,
+    checkpoint_path,
+)
+from scribebox.core import run_transcription
+from scribebox.exceptions import RunCancelledError
+from scribebox.types import TranscriptSegment
+
+
+def test_checkpoint_reloads_committed_segments(tmp_path: Path) -> None:
+    path = tmp_path / "a.checkpoint.jsonl"
+    with Checkpoint(path, key="k1") as ckpt:
+        ckpt.set_language("de")
+        ckpt.append(TranscriptSegment(0.0, 1.0, "eins"))
+        ckpt.append(TranscriptSegment(1.0, 2.5, "zwei"))
+    with path.open("ab") as fh:
+        fh.write(b'[2.5, 3.0, "dr')  # torn write of a killed worker
+
+    with Checkpoint(path, key="k1") as ckpt:
+        assert ckpt.language == "de"
+        assert list(ckpt.segments.texts()) == ["eins", "zwei"]
+        assert ckpt.resume_s == 2.5
+        ckpt.append(TranscriptSegment(2.5, 3.0, "drei"))
+
+    with Checkpoint(path, key="k1") as ckpt:
+        assert ckpt.resume_s == 3.0
+
+    with Checkpoint(path, key="other") as ckpt:
+        assert len(ckpt.segments) == 0
+
+
+def test_checkpoint_is_locked_while_open(tmp_path: Path) -> None:
+    path = tmp_path / "a.checkpoint.jsonl"
+    with Checkpoint(path, key="k1") as ckpt:
+        ckpt.append(TranscriptSegment(0.0, 1.0, "eins"))
+        with pytest.raises(CheckpointBusyError):
+            Checkpoint(path, key="k1")
+        # The losing run did not truncate the owner's sidecar.
+        ckpt.append(TranscriptSegment(1.0, 2.0, "zwei"))
+
+    with Checkpoint(path, key="k1") as ckpt:
+        assert list(ckpt.segments.texts()) == ["eins", "zwei"]
+        ckpt.discard()
+    assert not path.exists()
+
+
+def test_run_transcription_resumes_from_checkpoint(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    segments = [
+        TranscriptSegment(0.0, 10.0, "one"),
+        TranscriptSegment(10.0, 20.0, "two"),
+        TranscriptSegment(20.0, 30.0, "three"),
+    ]
+    starts: list[float] = []
+    languages: list[str | None] = []
+
+    def killed_after_two() -> Iterator[TranscriptSegment]:
+        yield from segments[:2]
+        raise KeyboardInterrupt
+
+    def fake_iter_segments(
+        *,
+        options: TranscribeOptions,
+        start_s: float = 0.0,
+        **kwargs,
+    ) -> SegmentStream:
+        starts.append(start_s)
+        languages.append(options.language)
+        if len(starts) == 1:
+            return SegmentStream(killed_after_two(), language="fr")
+        rest = [seg for seg in segments if seg.start_s >= start_s]
+        return SegmentStream(rest, language=options.language)
+
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
+    audio = tmp_path / "talk.mp3"
+    audio.write_bytes(b"audio")
+    outdir = tmp_path / "o"
+    kwargs = dict(
+        audio_path=audio,
+        outdir=outdir,
+        pdf=False,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        formats=("srt",),
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        run_transcription(**kwargs)
+    sidecar = checkpoint_path(outdir, "talk")
+    assert sidecar.exists()
+
+    result = run_transcription(**kwargs)
+
+    assert starts == [0.0, 20.0]
+    assert languages == [None, "fr"]
+    assert result.resumed_from_s == 20.0
+    assert result.detected_language == "fr"
+    assert result.text_path.read_text(encoding="utf-8") == (
+        "one\ntwo\nthree\n"
+    )
+    assert (outdir / "talk.srt").read_text(encoding="utf-8").count("-->") == 3
+    assert not sidecar.exists()
+
+
+def test_cancelled_run_stops_and_keeps_its_checkpoint(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    cancel = threading.Event()
+
+    def cancelled_after_one() -> Iterator[TranscriptSegment]:
+        yield TranscriptSegment(0.0, 10.0, "one")
+        cancel.set()
+        yield TranscriptSegment(10.0, 20.0, "two")
+        raise AssertionError("decoding should have stopped")
+
+    monkeypatch.setattr(
+        backends,
+        "iter_segments",
+        lambda **kwargs: SegmentStream(cancelled_after_one(), language="en"),
+    )
+    audio = tmp_path / "talk.mp3"
+    audio.write_bytes(b"audio")
+    outdir = tmp_path / "o"
+
+    with pytest.raises(RunCancelledError):
+        run_transcription(
+            audio_path=audio,
+            outdir=outdir,
+            pdf=False,
+            backend="faster-whisper",
+            options=TranscribeOptions(),
+            audio_duration_s=20.0,
+            cancel=cancel,
+        )
+
+    committed = checkpoint_path(outdir, "talk").read_text(encoding="utf-8")
+    assert '"one"' in committed and '"two"' not in committed
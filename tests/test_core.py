@@ -3,25 +3,30 @@ from __future__ import annotations
 from pathlib import Path
 
 import scribebox.backends as backends
-from scribebox.backends import TranscribeOptions
+import scribebox.core as core_mod
+from scribebox.backends import SegmentStream, TranscribeOptions
 from scribebox.core import run_transcription
-from scribebox.types import Transcript, TranscriptSegment
+from scribebox.types import TranscriptSegment
 
 
 def test_run_transcription_writes_txt(tmp_path: Path, monkeypatch) -> None:
-    def fake_transcribe_file(
+    def fake_iter_segments(
         *,
         audio_path: Path,
         backend: str,
         options: TranscribeOptions,
-    ) -> Transcript:
-        return Transcript(
-            text="a\nb",
-            segments=[TranscriptSegment(0.0, 1.0, "a")],
+        progress_cb=None,
+        start_s: float = 0.0,
+    ) -> SegmentStream:
+        return SegmentStream(
+            [
+                TranscriptSegment(0.0, 1.0, "a"),
+                TranscriptSegment(1.0, 2.0, "b"),
+            ],
             language="en",
         )
 
-    monkeypatch.setattr(backends, "transcribe_file", fake_transcribe_file)
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
 
     audio = tmp_path / "x.mp3"
     audio.write_bytes(b"bin")
@@ -38,3 +43,38 @@ def test_run_transcription_writes_txt(tmp_path: Path, monkeypatch) -> None:
     assert res.text_path.read_text(encoding="utf-8").strip() == "a\nb"
     assert res.pdf_path is None
     assert res.detected_language == "en"
+
+
+def test_run_transcription_flushes_txt_while_decoding(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    txt_path = tmp_path / "o" / "x.txt"
+    seen: list[str] = []
+
+    def segments():
+        yield TranscriptSegment(0.0, 1.0, "first")
+        seen.append(txt_path.read_text(encoding="utf-8"))
+        yield TranscriptSegment(1.0, 2.0, "second")
+
+    # Flush after every segment instead of once a second.
+    monkeypatch.setattr(core_mod, "FLUSH_INTERVAL_S", 0.0)
+
+    def fake_iter_segments(**kwargs) -> SegmentStream:
+        return SegmentStream(segments(), language="en")
+
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
+
+    audio = tmp_path / "x.mp3"
+    audio.write_bytes(b"bin")
+
+    res = run_transcription(
+        audio_path=audio,
+        outdir=tmp_path / "o",
+        pdf=True,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+    )
+    assert seen == ["first\n"]
+    assert res.text_path.read_text(encoding="utf-8") == "first\nsecond\n"
+    assert res.pdf_path is not None and res.pdf_path.exists()
@@ -3,9 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 
 import scribebox.backends as backends
-from scribebox.backends import TranscribeOptions
+from scribebox.backends import SegmentStream, TranscribeOptions
 from scribebox.core import run_transcription
-from scribebox.types import Transcript, TranscriptSegment
+from scribebox.types import TranscriptSegment
 
 
 def test_run_transcription_passes_progress_cb(
@@ -14,23 +14,23 @@ def test_run_transcription_passes_progress_cb(
 ) -> None:
     seen: list[float] = []
 
-    def fake_transcribe_file(
+    def fake_iter_segments(
         *,
         audio_path: Path,
         backend: str,
         options: TranscribeOptions,
         progress_cb,
-    ) -> Transcript:
+        start_s: float = 0.0,
+    ) -> SegmentStream:
         if progress_cb is not None:
             progress_cb(1.0)
             progress_cb(2.0)
-        return Transcript(
-            text="ok",
-            segments=[TranscriptSegment(0.0, 2.0, "ok")],
+        return SegmentStream(
+            [TranscriptSegment(0.0, 2.0, "ok")],
             language="en",
         )
 
-    monkeypatch.setattr(backends, "transcribe_file", fake_transcribe_file)
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
 
     def cb(cur: float) -> None:
         seen.append(cur)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from scribebox.core import RunResult
+from scribebox.jobs import JobQueue, JobStatus
+
+
+def test_job_queue_runs_jobs_and_records_results(tmp_path: Path) -> None:
+    queue = JobQueue(workers=1)
+    txt = tmp_path / "a.txt"
+
+    def work() -> RunResult:
+        txt.write_text("a\n", encoding="utf-8")
+        return RunResult(
+            text_path=txt,
+            pdf_path=None,
+            detected_language="en",
+        )
+
+    job = queue.submit(work, title="a")
+    queue.shutdown()
+
+    done = queue.get(job.id)
+    assert done is not None
+    assert done.status is JobStatus.DONE
+    assert done.result is not None and done.result.text_path == txt
+    assert done.to_dict()["formats"] == ["txt"]
+
+
+def test_job_queue_records_failures() -> None:
+    queue = JobQueue(workers=1)
+
+    def boom() -> RunResult:
+        raise RuntimeError("decoder crashed")
+
+    job = queue.submit(boom)
+    queue.shutdown()
+
+    assert job.status is JobStatus.FAILED
+    assert job.error == "decoder crashed"
+    assert job.finished_at is not None
+
+
+def test_job_queue_bounds_concurrency(tmp_path: Path) -> None:
+    queue = JobQueue(workers=2)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    both_running = threading.Event()
+    release = threading.Event()
+
+    def work() -> RunResult:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+            if running == 2:
+                both_running.set()
+        release.wait(timeout=5)
+        with lock:
+            running -= 1
+        return RunResult(
+            text_path=tmp_path / "x.txt",
+            pdf_path=None,
+            detected_language=None,
+        )
+
+    jobs = [queue.submit(work) for _ in range(5)]
+    try:
+        assert both_running.wait(timeout=5)
+        # Give a third worker, if there were one, the chance to start.
+        time.sleep(0.05)
+        assert peak == 2
+        statuses = [j.status for j in jobs]
+        assert statuses.count(JobStatus.RUNNING) == 2
+        assert statuses.count(JobStatus.QUEUED) == 3
+        assert queue.pending() == 3
+    finally:
+        release.set()
+        queue.shutdown()
+
+    assert peak == 2
+    assert all(j.status is JobStatus.DONE for j in jobs)
+
+
+def test_finished_jobs_and_their_workdirs_are_evicted(
+    tmp_path: Path,
+) -> None:
+    queue = JobQueue(workers=1, ttl_s=3600.0, max_finished=1)
+
+    def work() -> RunResult:
+        return RunResult(
+            text_path=tmp_path / "x.txt",
+            pdf_path=None,
+            detected_language=None,
+        )
+
+    workdirs = [tmp_path / "a", tmp_path / "b"]
+    for workdir in workdirs:
+        workdir.mkdir()
+    first = queue.submit(work, workdir=workdirs[0])
+    second = queue.submit(work, workdir=workdirs[1])
+    queue.shutdown()
+
+    # Only the newest finished job is kept once another is submitted.
+    third = queue.submit(work)
+    assert queue.get(first.id) is None
+    assert not workdirs[0].exists()
+    assert queue.get(second.id) is second
+    assert workdirs[1].exists()
+
+    second.finished_at = time.time() - 7200.0
+    queue.submit(work)
+    assert queue.get(second.id) is None
+    assert not workdirs[1].exists()
+    assert queue.get(third.id) is third
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import scribebox.jobstore as jobstore_mod
+from scribebox.core import RunResult
+from scribebox.exceptions import InvalidInputError, RunCancelledError
+from scribebox.jobs import JobStatus
+from scribebox.jobstore import (
+    JobSpec,
+    SqliteJobStore,
+    open_job_store,
+    register_job_store,
+)
+from scribebox.worker import run_worker
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def _spec(tmp_path: Path, name: str = "a.wav") -> JobSpec:
+    return JobSpec(
+        outdir=tmp_path / "out",
+        audio_path=tmp_path / name,
+        formats=("srt",),
+        title=name,
+    )
+
+
+def _result(tmp_path: Path) -> RunResult:
+    return RunResult(
+        text_path=tmp_path / "out" / "a.txt",
+        pdf_path=None,
+        detected_language="en",
+        audio_duration_s=12.0,
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(
+        jobstore_mod,
+        "time",
+        SimpleNamespace(time=clock.time),
+    )
+    return clock
+
+
+def test_jobs_are_claimed_once_and_results_published(
+    tmp_path: Path,
+    clock: _Clock,
+) -> None:
+    store = SqliteJobStore(tmp_path / "store")
+    job = store.submit(_spec(tmp_path), audio_s=12.0, info={"k": "v"})
+    assert job.status is JobStatus.QUEUED
+    assert store.outstanding_audio_s() == 12.0
+
+    claimed = store.claim("w1", lease_s=30.0)
+    assert claimed is not None
+    assert claimed.spec == _spec(tmp_path)
+    assert claimed.attempt == 1
+    assert store.claim("w2", lease_s=30.0) is None
+
+    # Only the lease holder can publish.
+    assert not store.complete(claimed.id, "w2", _result(tmp_path))
+    assert store.complete(claimed.id, "w1", _result(tmp_path))
+
+    done = store.get(job.id)
+    assert done is not None
+    assert done.status is JobStatus.DONE
+    assert done.result == _result(tmp_path)
+    assert done.info["k"] == "v"
+    assert done.info["attempts"] == 1
+    assert store.outstanding_audio_s() == 0.0
+
+
+def test_expired_leases_are_reclaimed_until_attempts_run_out(
+    tmp_path: Path,
+    clock: _Clock,
+) -> None:
+    store = SqliteJobStore(tmp_path / "store", max_attempts=2)
+    job = store.submit(_spec(tmp_path))
+
+    first = store.claim("w1", lease_s=30.0)
+    assert first is not None
+    clock.now += 20.0
+    assert store.heartbeat(job.id, "w1", lease_s=30.0)
+    clock.now += 20.0
+    # Renewed: still held by w1.
+    assert store.claim("w2", lease_s=30.0) is None
+
+    clock.now += 31.0
+    second = store.claim("w2", lease_s=30.0)
+    assert second is not None and second.attempt == 2
+    assert not store.heartbeat(job.id, "w1", lease_s=30.0)
+    assert not store.complete(job.id, "w1", _result(tmp_path))
+
+    clock.now += 31.0
+    assert store.claim("w3", lease_s=30.0) is None
+    failed = store.get(job.id)
+    assert failed is not None
+    assert failed.status is JobStatus.FAILED
+    assert failed.error is not None and "Lease expired" in failed.error
+
+
+def test_failures_are_retried_after_a_delay(
+    tmp_path: Path,
+    clock: _Clock,
+) -> None:
+    store = SqliteJobStore(
+        tmp_path / "store",
+        max_attempts=2,
+        retry_delay_s=5.0,
+    )
+    job = store.submit(_spec(tmp_path))
+
+    claimed = store.claim("w1", lease_s=30.0)
+    assert claimed is not None
+    assert store.fail(job.id, "w1", "boom") is JobStatus.QUEUED
+    assert store.claim("w1", lease_s=30.0) is None
+    clock.now += 5.0
+    claimed = store.claim("w1", lease_s=30.0)
+    assert claimed is not None and claimed.attempt == 2
+    assert store.fail(job.id, "w1", "boom again") is JobStatus.FAILED
+
+    failed = store.get(job.id)
+    assert failed is not None
+    assert failed.status is JobStatus.FAILED
+    assert failed.error == "boom again"
+
+
+def test_worker_runs_jobs_and_skips_retries_for_bad_input(
+    tmp_path: Path,
+) -> None:
+    store = SqliteJobStore(tmp_path / "store", retry_delay_s=0.0)
+    good = store.submit(_spec(tmp_path, "good.wav"))
+    bad = store.submit(_spec(tmp_path, "bad.wav"))
+    events: list[str] = []
+
+    def execute(spec: JobSpec, cancel: threading.Event) -> RunResult:
+        if spec.title == "bad.wav":
+            raise InvalidInputError("not audio")
+        return _result(tmp_path)
+
+    ran = run_worker(
+        store,
+        worker="w1",
+        exit_when_idle=True,
+        execute=execute,
+        on_event=lambda claimed, message: events.append(message),
+    )
+
+    assert ran == 2
+    assert store.get(good.id).status is JobStatus.DONE
+    failed = store.get(bad.id)
+    assert failed.status is JobStatus.FAILED
+    assert failed.info["attempts"] == 1
+    assert events[-1] == "failed: not audio"
+
+
+def test_worker_stops_a_job_whose_lease_was_taken_over(
+    tmp_path: Path,
+    clock: _Clock,
+) -> None:
+    store = SqliteJobStore(tmp_path / "store")
+    job = store.submit(_spec(tmp_path))
+    events: list[str] = []
+
+    def execute(spec: JobSpec, cancel: threading.Event) -> RunResult:
+        # The lease expires and another worker claims the job.
+        clock.now += 1.0
+        assert store.claim("w2", lease_s=30.0) is not None
+        assert cancel.wait(timeout=5.0)
+        raise RunCancelledError("Run cancelled.")
+
+    run_worker(
+        store,
+        worker="w1",
+        lease_s=0.3,
+        max_jobs=1,
+        execute=execute,
+        on_event=lambda claimed, message: events.append(message),
+    )
+
+    assert events[-1] == "lease lost: Run cancelled."
+    taken = store.get(job.id)
+    assert taken is not None and taken.status is JobStatus.RUNNING
+
+
+def test_open_job_store_resolves_plain_paths_and_schemes(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(
+        jobstore_mod,
+        "_BACKENDS",
+        dict(jobstore_mod._BACKENDS),
+    )
+    assert isinstance(open_job_store(str(tmp_path)), SqliteJobStore)
+    register_job_store("test", lambda rest: SqliteJobStore(tmp_path / rest))
+    store = open_job_store("test://other")
+    assert store.root == tmp_path / "other"
+    with pytest.raises(ValueError):
+        open_job_store("nope://x")
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import scribebox.backends as backends
+import scribebox.langid as langid
+from scribebox.backends import SegmentStream, TranscribeOptions
+from scribebox.core import run_transcription
+from scribebox.langid import LanguageCache, identify_language, sample_offsets
+from scribebox.types import TranscriptSegment
+
+np = pytest.importorskip("numpy")
+
+RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.3 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+
+
+def test_sample_offsets_skip_the_opening() -> None:
+    assert sample_offsets(20.0) == [0.0]
+    assert sample_offsets(None) == [0.0]
+    assert sample_offsets(430.0, windows=3) == [100.0, 200.0, 300.0]
+
+
+def _fake_audio(monkeypatch, probs_by_offset: dict[float, dict]) -> list:
+    calls: list[float] = []
+
+    def fake_decode(path, *, start_s=None, duration_s=None):
+        offset = start_s or 0.0
+        if not probs_by_offset[offset]:
+            return np.zeros(int(duration_s * RATE), dtype=np.float32)
+        samples = _tone(duration_s)
+        samples[0] = offset  # lets window_probs tell windows apart
+        return samples
+
+    def fake_probs(samples, *, backend, options):
+        offset = float(samples[0])
+        calls.append(offset)
+        return probs_by_offset[offset]
+
+    monkeypatch.setattr(langid, "decode_pcm_16k_mono", fake_decode)
+    monkeypatch.setattr(langid, "get_audio_duration_s", lambda path: 430.0)
+    monkeypatch.setattr(langid, "window_probs", fake_probs)
+    return calls
+
+
+def test_identify_language_averages_speech_windows(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    calls = _fake_audio(
+        monkeypatch,
+        {
+            100.0: {},  # silent window: skipped
+            200.0: {"de": 0.9, "en": 0.1},
+            300.0: {"de": 0.5, "en": 0.5},
+        },
+    )
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"audio")
+    cache = LanguageCache(tmp_path / "langs")
+
+    guess = identify_language(
+        audio,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        cache=cache,
+    )
+    again = identify_language(
+        audio,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        cache=cache,
+    )
+
+    assert guess is not None
+    assert guess.language == "de"
+    assert guess.probability == pytest.approx(0.7)
+    assert guess.windows == 2
+    assert guess.confident
+    assert again == guess
+    assert len(calls) == 2
+
+
+def test_language_id_fixes_language_for_decoding(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    _fake_audio(monkeypatch, {o: {"fr": 0.8} for o in (100.0, 200.0, 300.0)})
+    seen: list[str | None] = []
+
+    def fake_iter_segments(*, options: TranscribeOptions, **kwargs):
+        seen.append(options.language)
+        return SegmentStream(
+            [TranscriptSegment(0.0, 1.0, "bonjour")],
+            language=options.language,
+        )
+
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"audio")
+
+    result = run_transcription(
+        audio_path=audio,
+        outdir=tmp_path / "o",
+        pdf=False,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        language_id=True,
+    )
+
+    assert seen == ["fr"]
+    assert result.language_id is not None
+    assert result.language_id.language == "fr"
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from scribebox.ffmpeg import SAMPLE_RATE
+from scribebox.live import LatencyStats, RollingDecoder, run_live
+from scribebox.types import TranscriptSegment
+
+_SCRIPT = [(0.0, 2.0, "one"), (2.0, 4.0, "two"), (4.0, 6.0, "three")]
+
+
+def _clock_samples(start_s: float, duration_s: float) -> np.ndarray:
+    # Each sample holds its own timeline position, so the fake decoder
+    # knows where its window starts.
+    first = round(start_s * SAMPLE_RATE)
+    count = round(duration_s * SAMPLE_RATE)
+    return np.arange(first, first + count, dtype=np.float64) / SAMPLE_RATE
+
+
+def _script_decoder(samples, *, prompt, language):
+    start = float(samples[0])
+    end = start + len(samples) / SAMPLE_RATE
+    segments = []
+    for seg_start, seg_end, text in _SCRIPT:
+        if seg_end <= start + 1e-6 or seg_start >= end:
+            continue
+        if seg_end > end:
+            # Cut off mid-word by the end of the window.
+            text = text[: max(1, len(text) // 2)]
+        segments.append(
+            TranscriptSegment(
+                start_s=max(seg_start, start) - start,
+                end_s=min(seg_end, end) - start,
+                text=text,
+            )
+        )
+    return segments, "en"
+
+
+def test_segments_are_committed_once_stable() -> None:
+    rolling = RollingDecoder(_script_decoder, holdback_s=2.0)
+    committed: list[list[str]] = []
+    for second in range(6):
+        rolling.feed(_clock_samples(second, 1.0))
+        committed.append([s.text for s in rolling.step()])
+
+    # "one" ends at 2 s: it needs 2 s of holdback and a second decode
+    # agreeing on it.
+    assert committed == [[], [], [], ["one"], [], ["two"]]
+    assert rolling.start_s == 4.0
+    assert rolling.language == "en"
+    assert [s.text for s in rolling.step(final=True)] == ["three"]
+
+
+def test_long_windows_are_committed_without_agreement() -> None:
+    calls = 0
+
+    def unstable(samples, *, prompt, language):
+        nonlocal calls
+        calls += 1
+        duration = len(samples) / SAMPLE_RATE
+        half = duration / 2
+        return [
+            TranscriptSegment(0.0, half, f"a{calls}"),
+            TranscriptSegment(half, duration, f"b{calls}"),
+        ], None
+
+    rolling = RollingDecoder(unstable, holdback_s=1.0, max_window_s=4.0)
+    for second in range(3):
+        rolling.feed(_clock_samples(second, 1.0))
+        assert rolling.step() == []
+    rolling.feed(_clock_samples(3, 1.0))
+
+    forced = rolling.step()
+    assert [s.text for s in forced] == ["a4"]
+    assert rolling.start_s == 2.0
+
+
+def test_run_live_emits_everything_and_measures_latency() -> None:
+    chunks = [_clock_samples(i * 0.5, 0.5) for i in range(12)]
+    emitted: list[tuple[str, float | None]] = []
+
+    stats = run_live(
+        iter(chunks),
+        decode=_script_decoder,
+        on_segment=lambda seg, latency: emitted.append((seg.text, latency)),
+        step_s=1.0,
+    )
+
+    assert [text for text, _ in emitted] == ["one", "two", "three"]
+    assert all(latency is not None for _, latency in emitted)
+    assert stats.audio_s == 6.0
+    assert stats.segments == 3
+    assert stats.latency.count == 3
+    assert stats.language == "en"
+
+
+def test_run_live_decodes_queued_audio_on_interrupt() -> None:
+    decoding = threading.Event()
+    queued = threading.Event()
+    finished = threading.Event()
+
+    def chunks():
+        yield _clock_samples(0.0, 2.0)
+        decoding.wait(timeout=5.0)
+        yield _clock_samples(2.0, 2.0)
+        yield _clock_samples(4.0, 2.0)
+        queued.set()
+        # A live source that never ends on its own.
+        finished.wait(timeout=5.0)
+
+    def interrupted_once(samples, *, prompt, language):
+        if not decoding.is_set():
+            decoding.set()
+            queued.wait(timeout=5.0)
+            raise KeyboardInterrupt
+        return _script_decoder(samples, prompt=prompt, language=language)
+
+    emitted: list[str] = []
+    try:
+        stats = run_live(
+            chunks(),
+            decode=interrupted_once,
+            on_segment=lambda seg, latency: emitted.append(seg.text),
+            step_s=1.0,
+        )
+    finally:
+        finished.set()
+
+    # Ctrl-C arrived with 4 s of audio still queued; it is decoded too.
+    assert stats.audio_s == 6.0
+    assert emitted == ["one", "two", "three"]
+
+
+def test_latency_percentiles() -> None:
+    latency = LatencyStats()
+    for value in (0.5, 1.0, 1.5, 2.0, 10.0):
+        latency.observe(value)
+
+    assert latency.percentile(50) == 1.5
+    assert latency.percentile(95) == 10.0
+    assert latency.max_s == 10.0
+    assert latency.to_dict()["count"] == 5
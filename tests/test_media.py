@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import json
+import wave
 from pathlib import Path
 
+import pytest
+
 import scribebox.media as media
 
 
@@ -17,7 +21,7 @@ def test_get_audio_duration_s_parses_float(monkeypatch, tmp_path: Path) -> None:
     audio.write_bytes(b"bin")
 
     def fake_run(*args, **kwargs):
-        return _P(returncode=0, stdout="12.34\n")
+        return _P(returncode=0, stdout='{"format": {"duration": "12.34"}}')
 
     monkeypatch.setattr(media.subprocess, "run", fake_run)
     assert media.get_audio_duration_s(audio) == 12.34
@@ -35,3 +39,126 @@ def test_get_audio_duration_s_returns_none_on_failure(
 
     monkeypatch.setattr(media.subprocess, "run", fake_run)
     assert media.get_audio_duration_s(audio) is None
+
+
+def test_decode_pcm_16k_mono_reads_s16le_pipe(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    np = pytest.importorskip("numpy")
+    import scribebox.ffmpeg as ffmpeg
+
+    pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+    seen: list[list[str]] = []
+
+    def fake_run(cmd, **kwargs):
+        seen.append(cmd)
+        p = _P(returncode=0, stdout="")
+        p.stdout = pcm
+        return p
+
+    monkeypatch.setattr(ffmpeg.subprocess, "run", fake_run)
+    audio = ffmpeg.decode_pcm_16k_mono(tmp_path / "a.mp3", start_s=1.5)
+
+    assert audio.dtype == np.float32
+    assert audio.tolist() == [0.0, 0.5, -1.0]
+    assert seen[0][-1] == "pipe:1"
+    assert seen[0][seen[0].index("-ss") + 1] == "1.500"
+
+
+_WAV_PROBE = {
+    "format": {"format_name": "wav", "duration": "0.500", "size": "16044"},
+    "streams": [
+        {
+            "index": 0,
+            "codec_type": "audio",
+            "codec_name": "pcm_s16le",
+            "sample_rate": "16000",
+            "channels": 1,
+        }
+    ],
+}
+
+
+def test_probe_media_runs_ffprobe_once_per_file(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"bin")
+    calls: list[list[str]] = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return _P(returncode=0, stdout=json.dumps(_WAV_PROBE))
+
+    monkeypatch.setattr(media.subprocess, "run", fake_run)
+    assert media.cached_probe(audio) is None
+
+    info = media.probe_media(audio)
+    assert info is not None
+    assert info.duration_s == 0.5
+    assert info.audio is not None and info.audio.sample_rate == 16000
+    assert info.is_pcm_wav(sample_rate=16000)
+    assert not info.has_video
+    assert media.get_audio_duration_s(audio) == 0.5
+    assert media.cached_probe(audio) is info
+    assert len(calls) == 1
+
+    # A modified file is probed again.
+    audio.write_bytes(b"changed")
+    media.probe_media(audio)
+    assert len(calls) == 2
+
+
+def test_parse_probe_falls_back_to_stream_duration() -> None:
+    info = media.parse_probe(
+        {
+            "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+            "streams": [
+                {"index": 0, "codec_type": "video", "duration": "9.0"},
+                {"index": 1, "codec_type": "audio", "duration": "10.5"},
+            ],
+        }
+    )
+    assert info.duration_s == 10.5
+    assert info.has_video
+    assert info.audio is not None and info.audio.index == 1
+    assert not info.is_pcm_wav(sample_rate=16000)
+
+
+def test_decode_pcm_16k_mono_reads_probed_wav_without_ffmpeg(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    np = pytest.importorskip("numpy")
+    import scribebox.ffmpeg as ffmpeg
+
+    audio = tmp_path / "a.wav"
+    samples = np.arange(8000, dtype=np.int16)
+    with wave.open(str(audio), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(samples.tobytes())
+
+    monkeypatch.setattr(
+        media.subprocess,
+        "run",
+        lambda *a, **k: _P(returncode=0, stdout=json.dumps(_WAV_PROBE)),
+    )
+    media.probe_media(audio)
+
+    def no_ffmpeg(*args, **kwargs):
+        raise AssertionError("ffmpeg should not run")
+
+    monkeypatch.setattr(ffmpeg.subprocess, "run", no_ffmpeg)
+    out = ffmpeg.decode_pcm_16k_mono(audio, start_s=0.25, duration_s=0.125)
+
+    assert len(out) == 2000
+    assert out[0] == np.float32(4000 / 32768.0)
+
+    copied = ffmpeg.convert_to_wav_16k_mono(audio, tmp_path / "out.wav")
+    assert copied.read_bytes() == audio.read_bytes()
+    assert ffmpeg.convert_to_wav_16k_mono(audio, audio) == audio
+    assert audio.read_bytes() == copied.read_bytes()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+
+from scribebox.metrics import (
+    STAGE_SECONDS,
+    Counter,
+    Histogram,
+    Registry,
+    collect_stages,
+    timed_iter,
+    timed_stage,
+)
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    hist = registry.register(
+        Histogram(
+            "demo_seconds",
+            "Demo.",
+            buckets=(0.1, 1.0),
+            labelnames=("stage",),
+        )
+    )
+    hist.observe(0.05, stage="a")
+    hist.observe(0.5, stage="a")
+    hist.observe(5.0, stage="a")
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="a",le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="a"} 3' in text
+
+
+def test_counter_escapes_label_values() -> None:
+    registry = Registry()
+    counter = registry.register(
+        Counter("demo_total", "Demo.", labelnames=("model",))
+    )
+    counter.inc(model='a"b')
+
+    assert 'demo_total{model="a\\"b"} 1.0' in registry.render()
+
+
+def test_nested_collect_stages_share_one_timer() -> None:
+    before = STAGE_SECONDS.count(stage="unit_test_stage")
+
+    with collect_stages() as outer:
+        with timed_stage("unit_test_stage"):
+            time.sleep(0.001)
+        with collect_stages() as inner:
+            for _ in timed_iter([1, 2, 3], "unit_test_stage"):
+                pass
+        assert inner is outer
+
+    assert outer.timings["unit_test_stage"] > 0.0
+    assert STAGE_SECONDS.count(stage="unit_test_stage") == before + 1
+
+
+def test_nested_stages_are_exclusive_and_add_up() -> None:
+    with collect_stages() as timer:
+        started = time.perf_counter()
+        with timed_stage("unit_outer"):
+            time.sleep(0.02)
+            with timed_stage("unit_inner"):
+                time.sleep(0.05)
+            for _ in timed_iter([1, 2], "unit_outer"):
+                with timed_stage("unit_inner"):
+                    time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+
+    timings = timer.timings
+    assert timings["unit_inner"] >= 0.07
+    # The outer stage only counts its own sleep, not the inner stages.
+    assert 0.02 <= timings["unit_outer"] < 0.05
+    total = timings["unit_outer"] + timings["unit_inner"]
+    assert abs(total - elapsed) < 0.01
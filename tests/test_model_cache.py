@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+import scribebox.model_cache as model_cache
+from scribebox.model_cache import ModelCache, ModelKey
+
+
+def _key(name: str) -> ModelKey:
+    return ModelKey(backend="faster-whisper", model=name, device="cpu")
+
+
+def test_model_cache_hits_and_misses() -> None:
+    cache = ModelCache(max_models=2)
+    loads: list[str] = []
+
+    def loader() -> object:
+        loads.append("a")
+        return object()
+
+    first = cache.get(_key("a"), loader)
+    second = cache.get(_key("a"), loader)
+
+    assert first is second
+    assert loads == ["a"]
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.load_time_s >= 0.0
+
+
+def test_model_cache_evicts_least_recently_used() -> None:
+    cache = ModelCache(max_models=2)
+
+    cache.get(_key("a"), object)
+    cache.get(_key("b"), object)
+    cache.get(_key("a"), object)
+    cache.get(_key("c"), object)
+
+    assert cache.keys() == [_key("a"), _key("c")]
+    assert cache.stats().evictions == 1
+
+
+def test_model_cache_evicts_over_rss_budget(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(model_cache, "current_rss_bytes", lambda: 10_000)
+    cache = ModelCache(max_models=4, max_rss_bytes=1_000)
+
+    cache.get(_key("a"), object)
+    cache.get(_key("b"), object)
+
+    assert cache.keys() == [_key("b")]
+
+
+def test_model_cache_loads_once_under_concurrency() -> None:
+    cache = ModelCache(max_models=1)
+    calls = 0
+
+    def slow_loader() -> object:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return object()
+
+    results: list[object] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get(_key("a"), slow_loader))
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == 1
+    assert len({id(r) for r in results}) == 1
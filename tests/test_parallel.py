@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from scribebox.ffmpeg import _parse_silencedetect
+from scribebox.parallel import AudioChunk, plan_chunks, stitch_segments
+from scribebox.types import TranscriptSegment
+
+
+def test_parse_silencedetect_pairs_starts_and_ends() -> None:
+    stderr = "\n".join(
+        [
+            "[silencedetect @ 0x1] silence_start: 10.5",
+            "[silencedetect @ 0x1] silence_end: 12.5 | silence_duration: 2",
+            "[silencedetect @ 0x1] silence_start: 50",
+        ]
+    )
+    assert _parse_silencedetect(stderr) == [
+        (10.5, 12.5),
+        (50.0, float("inf")),
+    ]
+
+
+def test_plan_chunks_cuts_at_nearest_silence() -> None:
+    chunks = plan_chunks(
+        duration_s=300.0,
+        silences=[(95.0, 97.0), (149.0, 151.0), (205.0, 207.0)],
+        num_chunks=3,
+        overlap_s=1.0,
+    )
+
+    assert [(c.start_s, c.end_s) for c in chunks] == [
+        (0.0, 96.0),
+        (96.0, 206.0),
+        (206.0, 300.0),
+    ]
+    assert chunks[1].window_start_s == 95.0
+    assert chunks[1].window_end_s == 207.0
+    assert chunks[-1].window_end_s == 300.0
+
+
+def test_plan_chunks_keeps_short_audio_whole() -> None:
+    chunks = plan_chunks(duration_s=20.0, silences=[], num_chunks=8)
+    assert len(chunks) == 1
+    assert (chunks[0].start_s, chunks[0].end_s) == (0.0, 20.0)
+
+
+def test_stitch_segments_drops_overlap_duplicates() -> None:
+    chunks = [
+        AudioChunk(0, 0.0, 10.0, 0.0, 11.0),
+        AudioChunk(1, 10.0, 20.0, 9.0, 20.0),
+    ]
+    results = [
+        [
+            TranscriptSegment(0.0, 5.0, "one"),
+            TranscriptSegment(8.0, 10.4, "two"),
+            TranscriptSegment(10.4, 11.0, "thr"),
+        ],
+        [
+            TranscriptSegment(9.0, 9.6, "tw"),
+            TranscriptSegment(9.6, 10.5, "two"),
+            TranscriptSegment(10.5, 15.0, "three"),
+        ],
+    ]
+
+    merged = stitch_segments(chunks, results)
+    assert [s.text for s in merged] == ["one", "two", "three"]
@@ -10,3 +10,34 @@ def test_write_pdf(tmp_path: Path) -> None:
     write_pdf(text="hello\nworld", output_path=out, title="Title")
     assert out.exists()
     assert out.stat().st_size > 0
+
+
+def test_wrap_line_matches_full_measurement() -> None:
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    from scribebox.pdf import _wrap_line
+
+    line = " ".join(["alpha", "beta", "gamma", "x" * 60, "delta"] * 20)
+    lines = _wrap_line(
+        line=line,
+        usable_width=200.0,
+        font_name="Helvetica",
+        font_size=11,
+    )
+
+    assert " ".join(lines) == line
+    for wrapped in lines:
+        if " " in wrapped:
+            assert stringWidth(wrapped, "Helvetica", 11) <= 200.0 + 1e-6
+
+
+def test_pdf_writer_counts_pages(tmp_path: Path) -> None:
+    from scribebox.pdf import PdfWriter
+
+    out = tmp_path / "long.pdf"
+    with PdfWriter(out, title="T") as writer:
+        for i in range(200):
+            writer.write(f"segment {i}")
+
+    assert writer.pages > 1
+    assert out.read_bytes().startswith(b"%PDF")
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import scribebox.backends as backends
+import scribebox.refine as refine
+from scribebox.backends import SegmentConfidence, TranscribeOptions
+from scribebox.core import RunResult, run_transcription
+from scribebox.refine import RefineStats, RefineThresholds
+
+# (start, end, avg_logprob, compression_ratio, no_speech_prob) per 3 s.
+_DRAFT = [
+    (0, 3, -0.2, 1.5, 0.1),
+    (3, 6, -0.3, 1.4, 0.1),
+    (6, 9, -0.2, 1.6, 0.1),
+    (9, 12, -1.4, 1.5, 0.1),  # low log probability
+    (12, 15, -0.4, 3.1, 0.1),  # repetitive
+    (15, 18, -0.2, 1.5, 0.1),
+    (18, 21, -0.3, 1.5, 0.1),
+    (21, 24, -0.2, 1.5, 0.1),
+    (24, 27, -0.5, 1.2, 0.8),  # probably not speech
+    (27, 30, -0.2, 1.5, 0.1),
+]
+
+
+class _DraftModel:
+    def transcribe(self, audio, **kwargs):
+        assert isinstance(audio, str)
+        segments = [
+            SimpleNamespace(
+                start=start,
+                end=end,
+                text=f" d{i} ",
+                avg_logprob=logprob,
+                compression_ratio=ratio,
+                no_speech_prob=no_speech,
+            )
+            for i, (start, end, logprob, ratio, no_speech) in enumerate(_DRAFT)
+        ]
+        return iter(segments), SimpleNamespace(language="en")
+
+
+class _LargeModel:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def transcribe(self, audio, **kwargs):
+        _, start_s, duration_s = audio
+        self.calls.append({"start_s": start_s, **kwargs})
+        segments = [
+            SimpleNamespace(start=0.0, end=1.0, text=" pad "),
+            SimpleNamespace(
+                start=1.0,
+                end=duration_s - 1.0,
+                text=f" L{start_s:g} ",
+            ),
+            SimpleNamespace(start=duration_s - 1.0, end=duration_s, text="x"),
+        ]
+        return iter(segments), SimpleNamespace(language="en")
+
+
+@pytest.fixture
+def large(monkeypatch: pytest.MonkeyPatch) -> _LargeModel:
+    model = _LargeModel()
+    models = {"small": _DraftModel(), "large-v3": model}
+    monkeypatch.setattr(
+        backends,
+        "load_faster_whisper_model",
+        lambda name, **kwargs: models[name],
+    )
+    monkeypatch.setattr(
+        "scribebox.ffmpeg.decode_pcm_16k_mono",
+        lambda path, *, start_s=None, duration_s=None: (
+            "clip",
+            start_s or 0.0,
+            duration_s,
+        ),
+    )
+    monkeypatch.setattr(refine, "get_audio_duration_s", lambda path: 30.0)
+    return model
+
+
+def test_only_low_confidence_regions_are_redecoded(
+    large: _LargeModel,
+    tmp_path: Path,
+) -> None:
+    stream = backends.iter_segments(
+        audio_path=tmp_path / "a.wav",
+        backend="faster-whisper",
+        options=TranscribeOptions(draft_model="small"),
+    )
+    segments = list(stream)
+
+    assert [s.text for s in segments] == [
+        "d0",
+        "d1",
+        "d2",
+        "L8",
+        "d5",
+        "d6",
+        "d7",
+        "L23",
+        "d9",
+    ]
+    # The two adjacent low segments are one region, padded by 1 s.
+    assert [(s.start_s, s.end_s) for s in segments][3] == (9.0, 15.0)
+    assert [call["start_s"] for call in large.calls] == [8.0, 23.0]
+    assert all(call["language"] == "en" for call in large.calls)
+    assert large.calls[0]["initial_prompt"] == "d0 d1 d2"
+
+    stats = stream.refine
+    assert stats is not None
+    assert stats.regions == 2
+    assert stats.audio_s == 30.0
+    assert stats.redecoded_s == 8.0 + 5.0
+    assert stats.redecoded_fraction == pytest.approx(13.0 / 30.0)
+
+
+def test_run_result_reports_refine_statistics(
+    large: _LargeModel,
+    tmp_path: Path,
+) -> None:
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"")
+
+    result = run_transcription(
+        audio_path=audio,
+        outdir=tmp_path / "out",
+        pdf=False,
+        backend="faster-whisper",
+        options=TranscribeOptions(draft_model="small"),
+        checkpoint=False,
+    )
+
+    assert result.refine is not None
+    assert result.refine.regions == 2
+    assert "draft" in result.stage_timings
+    assert "refine" in result.stage_timings
+    assert "L8" in result.text_path.read_text(encoding="utf-8")
+    restored = RunResult.from_dict(result.to_dict())
+    assert restored.refine == result.refine
+
+
+def test_thresholds_and_speedup_upper_bound() -> None:
+    thresholds = RefineThresholds()
+    assert not thresholds.is_low(None)
+    assert not thresholds.is_low(SegmentConfidence())
+    assert not thresholds.is_low(SegmentConfidence(avg_logprob=-0.5))
+    assert thresholds.is_low(SegmentConfidence(avg_logprob=-1.5))
+    assert thresholds.is_low(SegmentConfidence(compression_ratio=2.6))
+    assert thresholds.is_low(SegmentConfidence(no_speech_prob=0.9))
+
+    stats = RefineStats(
+        audio_s=600.0,
+        draft_s=30.0,
+        refine_s=30.0,
+        redecoded_s=60.0,
+        regions=4,
+    )
+    # The large model ran at 0.5x real time on the regions: at most
+    # 300 s for the whole file.
+    assert stats.elapsed_s == pytest.approx(60.0)
+    assert stats.speedup_upper_bound == pytest.approx(300.0 / 60.0)
+    assert stats.redecoded_fraction == pytest.approx(0.1)
+    assert RefineStats(audio_s=600.0, draft_s=30.0).speedup_upper_bound is None
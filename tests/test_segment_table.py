@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+from scribebox.cache import TranscriptCache
+from scribebox.transcribe.base import TranscriptionResult
+from scribebox.transcript import TextWriter, format_transcript
+from scribebox.types import SegmentTable, Transcript, TranscriptSegment
+
+
+def _table() -> SegmentTable:
+    return SegmentTable(
+        [
+            TranscriptSegment(0.0, 2.0, "hello"),
+            TranscriptSegment(2.0, 4.0, ""),
+            TranscriptSegment(4.0, 6.0, " café "),
+            TranscriptSegment(6.0, 8.0, "bye"),
+        ]
+    )
+
+
+def test_table_indexes_and_slices() -> None:
+    table = _table()
+
+    assert len(table) == 4
+    assert table[2] == TranscriptSegment(4.0, 6.0, " café ")
+    assert table[-1].text == "bye"
+    assert list(table[1:3].texts()) == ["", " café "]
+    assert table[::2] == [table[0], table[2]]
+    assert table == list(table)
+    assert table.text == "hello\n café \nbye"
+
+
+def test_between_returns_overlapping_segments() -> None:
+    table = _table()
+
+    assert list(table.between(3.0, 5.0).texts()) == ["", " café "]
+    assert list(table.between(6.0, 100.0).texts()) == ["bye"]
+    assert len(table.between(10.0, 20.0)) == 0
+
+
+def test_retime_and_pickle_keep_texts() -> None:
+    table = _table().shifted(10.0)
+
+    assert list(table.rows())[0] == (10.0, 12.0, "hello")
+    assert pickle.loads(pickle.dumps(table)) == table
+
+
+def test_results_and_transcripts_store_tables() -> None:
+    segs = [TranscriptSegment(0.0, 1.0, "a"), TranscriptSegment(1, 2, "b")]
+
+    result = TranscriptionResult(segments=segs)
+    transcript = Transcript(segments=segs, language=None)
+
+    assert isinstance(result.segments, SegmentTable)
+    assert transcript.text == "a\nb"
+
+
+def test_writers_and_cache_consume_tables(tmp_path: Path) -> None:
+    table = _table()
+    with TextWriter(tmp_path / "out.txt") as writer:
+        writer.write_all(table)
+
+    expected = format_transcript(list(table))
+    assert format_transcript(table) == expected
+    assert (tmp_path / "out.txt").read_text(encoding="utf-8") == expected
+
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put("cd" * 32, table, "fr")
+    hit = cache.get("cd" * 32)
+    assert hit is not None
+    assert hit.segments == table
@@ -34,17 +34,16 @@ def test_transcribe_local_file_writes_outputs(
     input_path = tmp_path / "in.mp3"
     input_path.write_bytes(b"not really audio")
 
-    def _fake_convert(inp: Path, out: Path) -> Path:
-        out.write_bytes(b"RIFF....WAVEfmt ")
-        return out
+    def _fake_decode(inp: Path) -> list[float]:
+        return [0.0] * 16000
 
     monkeypatch.setattr(
-        "scribebox.service.convert_to_wav_16k_mono",
-        _fake_convert,
+        "scribebox.service.decode_pcm_16k_mono",
+        _fake_decode,
     )
 
     transcriber = DummyTranscriber()
-    opts = TranscribeOptions(language="en")
+    opts = TranscribeOptions(language="en", vad=False)
     out_opts = OutputOptions(outdir=tmp_path / "out", write_pdf=True)
 
     out = transcribe_local_file(
@@ -59,3 +58,114 @@ def test_transcribe_local_file_writes_outputs(
 
     txt = out.text_path.read_text(encoding="utf-8")
     assert "A" in txt and "B" in txt
+    assert not list((tmp_path / "out").glob("*.wav"))
+
+
+def test_transcribe_local_file_keep_wav_writes_intermediate(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    input_path = tmp_path / "in.mp3"
+    input_path.write_bytes(b"not really audio")
+    seen: list[object] = []
+
+    class RecordingTranscriber(DummyTranscriber):
+        def transcribe(self, audio_path, **kwargs) -> TranscriptionResult:
+            seen.append(audio_path)
+            return super().transcribe(audio_path, **kwargs)
+
+    def _fake_convert(inp: Path, out: Path) -> Path:
+        out.write_bytes(b"RIFF....WAVEfmt ")
+        return out
+
+    monkeypatch.setattr(
+        "scribebox.service.convert_to_wav_16k_mono",
+        _fake_convert,
+    )
+
+    out_opts = OutputOptions(outdir=tmp_path / "out", keep_wav=True)
+    transcribe_local_file(
+        input_path,
+        transcriber=RecordingTranscriber(),
+        options=TranscribeOptions(language="en", vad=False),
+        outputs=out_opts,
+    )
+
+    assert len(seen) == 1
+    assert isinstance(seen[0], Path) and seen[0].suffix == ".wav"
+    assert seen[0].exists()
+
+
+def test_transcribe_local_file_cache_hit_skips_conversion(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from scribebox.cache import TranscriptCache
+
+    input_path = tmp_path / "in.mp3"
+    input_path.write_bytes(b"not really audio")
+    conversions: list[Path] = []
+
+    def _fake_decode(inp: Path) -> list[float]:
+        conversions.append(inp)
+        return [0.0] * 16000
+
+    monkeypatch.setattr(
+        "scribebox.service.decode_pcm_16k_mono",
+        _fake_decode,
+    )
+
+    cache = TranscriptCache(tmp_path / "cache")
+    opts = TranscribeOptions(language="en", vad=False)
+    out_opts = OutputOptions(outdir=tmp_path / "out")
+
+    first = transcribe_local_file(
+        input_path,
+        transcriber=DummyTranscriber(),
+        options=opts,
+        outputs=out_opts,
+        cache=cache,
+    )
+    second = transcribe_local_file(
+        input_path,
+        transcriber=DummyTranscriber(),
+        options=opts,
+        outputs=out_opts,
+        cache=cache,
+    )
+
+    assert len(conversions) == 1
+    assert first.cache_hit is False
+    assert second.cache_hit is True
+    assert "A" in second.text_path.read_text(encoding="utf-8")
+
+
+def test_transcribe_local_file_cache_is_keyed_by_backend(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from scribebox.cache import TranscriptCache
+
+    input_path = tmp_path / "in.mp3"
+    input_path.write_bytes(b"not really audio")
+    monkeypatch.setattr(
+        "scribebox.service.decode_pcm_16k_mono",
+        lambda inp: [0.0] * 16000,
+    )
+
+    class OtherTranscriber(DummyTranscriber):
+        name = "other"
+
+    cache = TranscriptCache(tmp_path / "cache")
+    runs = [
+        transcribe_local_file(
+            input_path,
+            transcriber=transcriber,
+            options=TranscribeOptions(language="en", vad=False),
+            outputs=OutputOptions(outdir=tmp_path / "out"),
+            cache=cache,
+        )
+        for transcriber in (DummyTranscriber(), OtherTranscriber())
+    ]
+
+    assert [run.cache_hit for run in runs] == [False, False]
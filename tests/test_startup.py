@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+# Cumulative import time allowed for ``scribebox.cli``, in microseconds.
+# Generous on purpose; the module list below is the strict check.
+BUDGET_US = int(os.environ.get("SCRIBEBOX_STARTUP_BUDGET_US", "150000"))
+
+HEAVY_MODULES = (
+    "reportlab",
+    "tqdm",
+    "fastapi",
+    "yt_dlp",
+    "faster_whisper",
+    "whisper",
+    "torch",
+    "numpy",
+)
+
+
+def _import_times() -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "scribebox", "--help"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_help_does_not_import_heavy_modules() -> None:
+    times = _import_times()
+
+    loaded = {name.split(".")[0] for name in times}
+    assert not loaded & set(HEAVY_MODULES)
+    assert times["scribebox.cli"] < BUDGET_US
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import scribebox.tuning as tuning
+from scribebox.backends import TranscribeOptions
+from scribebox.cli import _tuned_options, build_parser
+from scribebox.model_cache import ModelCache, ModelKey
+from scribebox.tuning import TuningProfile
+
+
+def _profile(**overrides: object) -> TuningProfile:
+    host, cpus = tuning._host()
+    fields: dict[str, object] = {
+        "backend": "faster-whisper",
+        "model": "small",
+        "device": "cpu",
+        "compute_type": "int8_float32",
+        "cpu_threads": 4,
+        "num_workers": 2,
+        "beam_size": 1,
+        "real_time_factor": 0.1,
+        "peak_rss_bytes": None,
+        "host": host,
+        "cpus": cpus,
+        "created_at": 0.0,
+    }
+    fields.update(overrides)
+    return TuningProfile(**fields)
+
+
+def test_word_error_rate_ignores_case_and_punctuation() -> None:
+    assert tuning.word_error_rate("Hello, world.", "hello world") == 0.0
+    assert tuning.word_error_rate("a b c d", "a x c") == 0.5
+    assert tuning.word_error_rate("", "") == 0.0
+
+
+def test_profiles_round_trip_per_model_and_host(tmp_path: Path) -> None:
+    path = tmp_path / "tuning.json"
+    tuning.save_profile(_profile(host="elsewhere", model="tiny"), path)
+    tuning.save_profile(_profile(beam_size=5), path)
+    tuning.save_profile(_profile(), path)
+
+    found = tuning.load_profile(
+        backend="faster-whisper",
+        model="small",
+        device="cpu",
+        path=path,
+    )
+    assert found == _profile()
+    # Measured on another host: not applied here.
+    assert (
+        tuning.load_profile(
+            backend="faster-whisper",
+            model="tiny",
+            device="cpu",
+            path=path,
+        )
+        is None
+    )
+
+    (tmp_path / "bad.json").write_text("{", encoding="utf-8")
+    assert (
+        tuning.load_profile(
+            backend="faster-whisper",
+            model="small",
+            device="cpu",
+            path=tmp_path / "bad.json",
+        )
+        is None
+    )
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+def test_tune_picks_fastest_setting_within_accuracy(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    clock = _Clock()
+    cost = {
+        ("float32", 5): 20.0,
+        ("float32", 1): 12.0,
+        ("int8", 5): 8.0,
+        ("int8", 1): 4.0,
+    }
+    seen: list[TranscribeOptions] = []
+
+    def fake_iter_segments(*, audio_path, backend, options):
+        seen.append(options)
+        clock.now += cost[(options.compute_type, options.beam_size)]
+        text = "the quick brown fox"
+        if (options.compute_type, options.beam_size) == ("int8", 1):
+            text = "a quick brown box"
+        return [SimpleNamespace(text=text)]
+
+    monkeypatch.setattr(
+        tuning,
+        "write_calibration_clip",
+        lambda source, path, *, duration_s: 40.0,
+    )
+    monkeypatch.setattr(tuning, "_warm_model", lambda backend, options: None)
+    monkeypatch.setattr(tuning.backends, "iter_segments", fake_iter_segments)
+    monkeypatch.setattr(
+        tuning,
+        "time",
+        SimpleNamespace(perf_counter=clock.perf_counter, time=lambda: 1.0),
+    )
+    trials: list[tuning.TuningTrial] = []
+
+    profile, results = tuning.tune(
+        tmp_path / "speech.wav",
+        backend="faster-whisper",
+        options=TranscribeOptions(model="small"),
+        compute_types=("int8", "float32"),
+        thread_counts=(2,),
+        beam_sizes=(1, 5),
+        num_workers=2,
+        on_trial=trials.append,
+    )
+
+    # The most precise, widest-beam setting runs first as the reference.
+    assert (seen[0].compute_type, seen[0].beam_size) == ("float32", 5)
+    assert all(o.num_workers == 2 and o.cpu_threads == 2 for o in seen)
+    assert trials == results and len(results) == 4
+    assert profile is not None
+    assert (profile.compute_type, profile.beam_size) == ("int8", 5)
+    assert profile.real_time_factor == pytest.approx(8.0 / 40.0)
+    assert profile.num_workers == 2
+
+
+def test_select_trial_respects_memory_budget_and_errors() -> None:
+    base = tuning.TuningTrial(
+        compute_type="int8",
+        cpu_threads=4,
+        beam_size=5,
+        audio_s=10.0,
+        elapsed_s=1.0,
+        peak_rss_bytes=2_000,
+        word_error_rate=0.0,
+    )
+    small = replace(
+        base, compute_type="float32", elapsed_s=3.0, peak_rss_bytes=500
+    )
+    broken = replace(
+        base, compute_type="float16", elapsed_s=0.5, error="unsupported"
+    )
+
+    chosen = tuning.select_trial([base, small, broken], max_rss_bytes=1_000)
+
+    assert chosen == small
+    assert tuning.select_trial([broken]) is None
+
+
+def test_cli_flags_override_tuning_profile(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "tuning.json"
+    tuning.save_profile(_profile(), path)
+    monkeypatch.setenv("SCRIBEBOX_TUNING_PROFILE", str(path))
+    parser = build_parser()
+    base = TranscribeOptions(model="small")
+
+    args = parser.parse_args(["file", "a.wav", "--beam-size", "3"])
+    options = _tuned_options(args, backend="faster-whisper", options=base)
+    assert options.compute_type == "int8_float32"
+    assert options.cpu_threads == 4
+    assert options.num_workers == 2
+    assert options.beam_size == 3
+
+    args = parser.parse_args(["file", "a.wav", "--no-tuning"])
+    options = _tuned_options(args, backend="faster-whisper", options=base)
+    assert options == base
+
+
+def test_warm_model_drops_models_of_other_configurations(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = ModelCache(max_models=8)
+
+    def fake_preload(*, backend: str, options: TranscribeOptions) -> None:
+        key = ModelKey(
+            backend=backend,
+            model=options.model,
+            device=options.device,
+            compute_type=options.compute_type,
+            cpu_threads=options.cpu_threads,
+        )
+        cache.get(key, object)
+
+    monkeypatch.setattr(tuning, "get_model_cache", lambda: cache)
+    monkeypatch.setattr(tuning.backends, "preload_model", fake_preload)
+    base = TranscribeOptions(compute_type="float32", cpu_threads=4)
+
+    tuning._warm_model("faster-whisper", base)
+    tuning._warm_model("faster-whisper", replace(base, beam_size=1))
+    assert cache.stats().hits == 1
+
+    tuning._warm_model("faster-whisper", replace(base, compute_type="int8"))
+    loaded = cache.keys()
+    assert [key.compute_type for key in loaded] == ["int8"]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from scribebox.uploads import FileSink, UploadTooLargeError, receive_upload
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def test_receive_upload_writes_chunks(tmp_path: Path) -> None:
+    data = bytes(range(256)) * 40
+    dest = tmp_path / "up.bin"
+
+    path, stats = asyncio.run(
+        receive_upload(_chunks(data, 1000), FileSink(dest))
+    )
+
+    assert path == dest
+    assert dest.read_bytes() == data
+    assert stats.bytes_received == len(data)
+    assert stats.max_chunk_bytes == 1000
+
+
+def test_receive_upload_enforces_limit(tmp_path: Path) -> None:
+    dest = tmp_path / "up.bin"
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(
+            receive_upload(
+                _chunks(b"x" * 5000, 1000),
+                FileSink(dest),
+                max_bytes=2500,
+            )
+        )
+
+    assert not dest.exists()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scribebox.config import OutputOptions, TranscribeOptions
+from scribebox.service import transcribe_local_file
+from scribebox.transcribe.base import Transcriber, TranscriptionResult
+from scribebox.types import Segment
+from scribebox.vad import SpeechTimeline, detect_speech
+
+np = pytest.importorskip("numpy")
+
+RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.3 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def _speech_with_gap() -> np.ndarray:
+    # 0-2 s tone, 2-12 s silence, 12-15 s tone.
+    return np.concatenate([_tone(2.0), _silence(10.0), _tone(3.0)])
+
+
+def test_detect_speech_finds_tone_regions() -> None:
+    regions = detect_speech(_speech_with_gap(), pad_s=0.0)
+
+    assert len(regions) == 2
+    assert regions[0] == pytest.approx((0.0, 2.0), abs=0.05)
+    assert regions[1] == pytest.approx((12.0, 15.0), abs=0.05)
+
+
+def test_timeline_compacts_and_remaps() -> None:
+    timeline = SpeechTimeline(
+        regions=[(0.0, 2.0), (12.0, 15.0)],
+        duration_s=15.0,
+    )
+    compact = timeline.compact(_speech_with_gap())
+
+    assert len(compact) == 5 * RATE
+    assert timeline.skipped_fraction == pytest.approx(10.0 / 15.0)
+
+    segments = timeline.remap([Segment(0.5, 2.0, "a"), Segment(2.0, 4.0, "b")])
+    assert (segments[0].start_s, segments[0].end_s) == (0.5, 2.0)
+    assert (segments[1].start_s, segments[1].end_s) == (12.0, 14.0)
+
+
+class _RecordingTranscriber(Transcriber):
+    def __init__(self) -> None:
+        self.samples = 0
+
+    def transcribe(
+        self,
+        audio_path,
+        *,
+        language,
+        translate_to_english,
+        model,
+        device,
+    ) -> TranscriptionResult:
+        self.samples = len(audio_path)
+        seconds = self.samples / RATE
+        return TranscriptionResult(
+            segments=[Segment(seconds - 1.0, seconds, "tail")],
+            language="en",
+        )
+
+
+def test_service_vad_passes_only_speech(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    input_path = tmp_path / "in.wav"
+    input_path.write_bytes(b"audio")
+    monkeypatch.setattr(
+        "scribebox.service.decode_pcm_16k_mono",
+        lambda path: _speech_with_gap(),
+    )
+    transcriber = _RecordingTranscriber()
+
+    out = transcribe_local_file(
+        input_path,
+        transcriber=transcriber,
+        options=TranscribeOptions(vad=True),
+        outputs=OutputOptions(outdir=tmp_path / "out"),
+    )
+
+    assert transcriber.samples < 7 * RATE
+    assert out.vad_skipped_fraction is not None
+    assert out.vad_skipped_fraction > 0.5
+    assert "tail" in out.text_path.read_text(encoding="utf-8")
+
+
+def test_service_vad_with_keep_wav_decodes_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import wave
+
+    input_path = tmp_path / "in.mp3"
+    input_path.write_bytes(b"audio")
+    conversions: list[Path] = []
+
+    def _fake_convert(inp: Path, out: Path) -> Path:
+        conversions.append(inp)
+        pcm = (_speech_with_gap() * 32767).astype(np.int16)
+        with wave.open(str(out), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(RATE)
+            wav.writeframes(pcm.tobytes())
+        return out
+
+    def _no_decode(path: Path) -> None:
+        raise AssertionError("the source was decoded twice")
+
+    monkeypatch.setattr(
+        "scribebox.service.convert_to_wav_16k_mono",
+        _fake_convert,
+    )
+    monkeypatch.setattr("scribebox.service.decode_pcm_16k_mono", _no_decode)
+    transcriber = _RecordingTranscriber()
+
+    out = transcribe_local_file(
+        input_path,
+        transcriber=transcriber,
+        options=TranscribeOptions(vad=True),
+        outputs=OutputOptions(outdir=tmp_path / "out", keep_wav=True),
+    )
+
+    assert conversions == [input_path]
+    assert transcriber.samples < 7 * RATE
+    assert out.vad_skipped_fraction is not None
+
+
+def test_whisper_backend_remaps_vad_timestamps(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import scribebox.backends as backends
+    from scribebox.backends import TranscribeOptions as CliOptions
+
+    class _Model:
+        def transcribe(self, audio, **kwargs):
+            seconds = len(audio) / RATE
+            return {
+                "language": "en",
+                "segments": [
+                    {"start": 0.0, "end": 1.0, "text": "a"},
+                    {"start": seconds - 1.0, "end": seconds, "text": "b"},
+                ],
+            }
+
+    monkeypatch.setattr(
+        backends,
+        "load_whisper_model",
+        lambda *args, **kwargs: _Model(),
+    )
+    monkeypatch.setattr(
+        "scribebox.ffmpeg.decode_pcm_16k_mono",
+        lambda path, **kwargs: _speech_with_gap(),
+    )
+    progress: list[float] = []
+
+    stream = backends.iter_segments(
+        audio_path=tmp_path / "a.wav",
+        backend="whisper",
+        options=CliOptions(),
+        progress_cb=progress.append,
+    )
+    segments = list(stream)
+
+    assert segments[1].end_s == pytest.approx(15.0, abs=0.05)
+    assert progress[-1] == pytest.approx(15.0, abs=0.05)
+    assert stream.vad_skipped_fraction == pytest.approx(0.6, abs=0.05)
+
+
+def test_faster_whisper_reports_its_own_vad_skips() -> None:
+    from types import SimpleNamespace
+
+    from scribebox.backends import _silero_skipped_fraction
+
+    info = SimpleNamespace(duration=10.0, duration_after_vad=6.0)
+
+    assert _silero_skipped_fraction(info) == pytest.approx(0.4)
+    assert _silero_skipped_fraction(SimpleNamespace()) is None
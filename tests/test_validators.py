@@ -3,7 +3,11 @@ from __future__ import annotations
 import pytest
 
 from scribebox.exceptions import InvalidInputError
-from scribebox.validators import validate_youtube_url
+from scribebox.validators import (
+    canonical_youtube_url,
+    extract_youtube_video_id,
+    validate_youtube_url,
+)
 
 
 def test_validate_youtube_url_accepts_youtube_com() -> None:
@@ -19,3 +23,28 @@ def test_validate_youtube_url_accepts_youtu_be() -> None:
 def test_validate_youtube_url_rejects_other_host() -> None:
     with pytest.raises(InvalidInputError):
         validate_youtube_url("https://example.com/video")
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42s",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ&list=PL123",
+        "https://youtu.be/dQw4w9WgXcQ?t=10",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "https://www.youtube.com/live/dQw4w9WgXcQ?si=abc",
+    ],
+)
+def test_canonical_youtube_url_normalizes_variants(url: str) -> None:
+    assert extract_youtube_video_id(url) == "dQw4w9WgXcQ"
+    assert (
+        canonical_youtube_url(url)
+        == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    )
+
+
+def test_extract_youtube_video_id_rejects_channel_urls() -> None:
+    with pytest.raises(InvalidInputError):
+        extract_youtube_video_id("https://www.youtube.com/@somechannel")
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import scribebox.webapp as webapp
+from scribebox.admission import AdmissionController, AdmissionLimits
+from scribebox.backends import SegmentStream
+from scribebox.core import RunResult
+from scribebox.types import TranscriptSegment
+
+# The test client needs httpx, which is not a runtime dependency.
+TestClient = pytest.importorskip("fastapi.testclient").TestClient
+
+
+@pytest.fixture()
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    monkeypatch.setattr(
+        webapp,
+        "_admission",
+        AdmissionController(AdmissionLimits(max_decodes=1)),
+    )
+    monkeypatch.setattr(webapp, "get_audio_duration_s", lambda path: 10.0)
+    # One event loop for every request, as under uvicorn.
+    with TestClient(webapp.app) as client:
+        yield client
+
+
+def test_busy_transcribe_file_is_rejected_while_another_decodes(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    decoding = threading.Event()
+    release = threading.Event()
+
+    def slow_job(*, audio_path: Path, outdir: Path, **kwargs) -> RunResult:
+        decoding.set()
+        release.wait(timeout=5.0)
+        txt = outdir / "a.txt"
+        txt.write_text("ok\n", encoding="utf-8")
+        return RunResult(text_path=txt, pdf_path=None, detected_language="en")
+
+    monkeypatch.setattr(webapp, "_transcribe_path_job", slow_job)
+    responses = []
+    first = threading.Thread(
+        target=lambda: responses.append(
+            client.post("/transcribe-file", files={"file": ("a.mp3", b"x")})
+        )
+    )
+    first.start()
+    try:
+        assert decoding.wait(timeout=5.0)
+        busy = client.post("/transcribe-file", files={"file": ("b.mp3", b"x")})
+        # Answered while the first decode is still running.
+        assert not release.is_set()
+    finally:
+        release.set()
+        first.join()
+
+    assert busy.status_code == 503
+    assert "Retry-After" in busy.headers
+    assert responses[0].status_code == 200
+
+
+@pytest.fixture()
+def scratch_dirs(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> list[Path]:
+    created: list[Path] = []
+
+    def mkdtemp(prefix: str = "") -> str:
+        path = tmp_path / f"{prefix}{len(created)}"
+        path.mkdir()
+        created.append(path)
+        return str(path)
+
+    monkeypatch.setattr(webapp.tempfile, "mkdtemp", mkdtemp)
+    monkeypatch.setattr(webapp, "job_options", lambda language: None)
+    return created
+
+
+@pytest.mark.parametrize("fails", [False, True])
+def test_transcribe_stream_removes_its_upload(
+    client: TestClient,
+    scratch_dirs: list[Path],
+    monkeypatch: pytest.MonkeyPatch,
+    fails: bool,
+) -> None:
+    def fake_iter_segments(*, audio_path: Path, **kwargs) -> SegmentStream:
+        assert audio_path.exists()
+        if fails:
+            raise RuntimeError("cannot decode")
+        return SegmentStream(
+            [TranscriptSegment(0.0, 1.0, "hi")], language="en"
+        )
+
+    monkeypatch.setattr(webapp, "iter_segments", fake_iter_segments)
+
+    response = client.post(
+        "/transcribe-stream",
+        files={"file": ("a.mp3", b"x")},
+    )
+
+    assert response.status_code == 200
+    assert ("event: error" in response.text) is fails
+    assert ("event: done" in response.text) is not fails
+    assert len(scratch_dirs) == 1 and not scratch_dirs[0].exists()
+
+
+def test_disconnected_stream_removes_its_upload(
+    scratch_dirs: list[Path],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(
+        webapp,
+        "iter_segments",
+        lambda **kwargs: SegmentStream(
+            [TranscriptSegment(0.0, 1.0, "hi")], language="en"
+        ),
+    )
+    outdir = tmp_path / "upload"
+    outdir.mkdir()
+    (outdir / "a.mp3").write_bytes(b"x")
+    admission = AdmissionController(AdmissionLimits())
+
+    events = webapp._stream_segment_events(
+        url=None,
+        audio_path=outdir / "a.mp3",
+        outdir=outdir,
+        language=None,
+        ticket=admission.admit(1.0, start=True),
+    )
+    assert next(events).startswith("event: start")
+    # What the server does when the client goes away mid-stream.
+    events.close()
+
+    assert not outdir.exists()
+    assert admission.decodes == 0
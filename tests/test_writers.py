@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scribebox.backends as backends
+from scribebox.backends import SegmentStream, TranscribeOptions
+from scribebox.core import run_transcription
+from scribebox.types import TranscriptSegment
+from scribebox.writers import (
+    OutputFormat,
+    OutputWriter,
+    format_timestamp,
+    parse_formats,
+)
+
+SEGMENTS = [
+    TranscriptSegment(0.0, 1.5, " hello "),
+    TranscriptSegment(1.5, 2.0, ""),
+    TranscriptSegment(3661.25, 3662.0, "a --> b"),
+]
+
+
+def test_parse_formats_always_includes_txt() -> None:
+    assert parse_formats("vtt, SRT,srt") == (
+        OutputFormat.TXT,
+        OutputFormat.SRT,
+        OutputFormat.VTT,
+    )
+    assert parse_formats(None, pdf=True) == (
+        OutputFormat.TXT,
+        OutputFormat.PDF,
+    )
+    with pytest.raises(ValueError, match="docx"):
+        parse_formats("txt,docx")
+
+
+def test_format_timestamp() -> None:
+    assert format_timestamp(3661.25) == "01:01:01,250"
+    assert format_timestamp(0.0004, decimal=".") == "00:00:00.000"
+
+
+def test_output_writer_fans_out_one_pass(tmp_path: Path) -> None:
+    formats = parse_formats("srt,vtt,json")
+    with OutputWriter(tmp_path, "talk", formats) as writer:
+        writer.write_all(SEGMENTS)
+        writer.close(language="en")
+
+    assert set(writer.paths) == set(formats)
+    assert (tmp_path / "talk.txt").read_text(encoding="utf-8") == (
+        "hello\na --> b\n"
+    )
+    assert (tmp_path / "talk.srt").read_text(encoding="utf-8") == (
+        "1\n00:00:00,000 --> 00:00:01,500\nhello\n\n"
+        "2\n01:01:01,250 --> 01:01:02,000\na --> b\n\n"
+    )
+    vtt = (tmp_path / "talk.vtt").read_text(encoding="utf-8")
+    assert vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nhello")
+    assert "a -> b" in vtt
+
+    doc = json.loads((tmp_path / "talk.json").read_text(encoding="utf-8"))
+    assert doc["language"] == "en"
+    assert [s["text"] for s in doc["segments"]] == ["hello", "", "a --> b"]
+
+
+def test_output_writer_buffers_until_flushed(tmp_path: Path) -> None:
+    formats = parse_formats("srt")
+    with OutputWriter(tmp_path, "talk", formats) as writer:
+        writer.write(SEGMENTS[0])
+        assert (tmp_path / "talk.txt").read_text(encoding="utf-8") == ""
+        writer.flush()
+        assert (tmp_path / "talk.txt").read_text(encoding="utf-8") == (
+            "hello\n"
+        )
+        assert "hello" in (tmp_path / "talk.srt").read_text(encoding="utf-8")
+
+
+def test_empty_json_is_valid(tmp_path: Path) -> None:
+    with OutputWriter(tmp_path, "empty", [OutputFormat.JSON]):
+        pass
+
+    doc = json.loads((tmp_path / "empty.json").read_text(encoding="utf-8"))
+    assert doc == {"segments": [], "language": None}
+
+
+def test_run_transcription_writes_requested_formats(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    calls = 0
+
+    def fake_iter_segments(**kwargs) -> SegmentStream:
+        nonlocal calls
+        calls += 1
+        return SegmentStream(SEGMENTS, language="en")
+
+    monkeypatch.setattr(backends, "iter_segments", fake_iter_segments)
+    audio = tmp_path / "x.mp3"
+    audio.write_bytes(b"bin")
+
+    res = run_transcription(
+        audio_path=audio,
+        outdir=tmp_path / "o",
+        pdf=False,
+        backend="faster-whisper",
+        options=TranscribeOptions(),
+        formats=("srt", "json"),
+    )
+
+    assert calls == 1
+    assert list(res.outputs) == ["txt", "srt", "json"]
+    assert all(path.exists() for path in res.outputs.values())
+    assert "write_srt" in res.stage_timings
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from scribebox.youtube import YoutubeAudioCache, download_youtube_audio
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+class _FakeYDL:
+    calls: list[dict] = []
+
+    def __init__(self, opts: dict) -> None:
+        self.opts = opts
+
+    def __enter__(self) -> _FakeYDL:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def extract_info(self, url: str, download: bool) -> dict:
+        _FakeYDL.calls.append({"url": url, **self.opts})
+        path = Path(self.opts["outtmpl"].replace("%(id)s", VIDEO_ID))
+        path = path.with_name(path.name.replace("%(ext)s", "webm"))
+        path.write_bytes(b"opus data")
+        return {
+            "id": VIDEO_ID,
+            "title": "t",
+            "requested_downloads": [{"filepath": str(path)}],
+        }
+
+
+@pytest.fixture()
+def fake_yt_dlp(monkeypatch: pytest.MonkeyPatch) -> list[dict]:
+    _FakeYDL.calls = []
+    monkeypatch.setitem(
+        sys.modules,
+        "yt_dlp",
+        SimpleNamespace(YoutubeDL=_FakeYDL),
+    )
+    return _FakeYDL.calls
+
+
+def test_download_keeps_native_audio_and_reuses_cache(
+    tmp_path: Path,
+    fake_yt_dlp: list[dict],
+) -> None:
+    cache = YoutubeAudioCache(tmp_path / "cache")
+
+    first = download_youtube_audio(
+        url=f"https://youtu.be/{VIDEO_ID}?t=30",
+        outdir=tmp_path / "out",
+        cache=cache,
+    )
+    second = download_youtube_audio(
+        url=f"https://www.youtube.com/watch?v={VIDEO_ID}&list=PL1",
+        outdir=tmp_path / "out",
+        cache=cache,
+    )
+
+    assert first == second
+    assert first.name == f"{VIDEO_ID}.webm"
+    assert len(fake_yt_dlp) == 1
+    assert "postprocessors" not in fake_yt_dlp[0]
+    assert fake_yt_dlp[0]["url"].endswith(f"watch?v={VIDEO_ID}")
+
+
+def test_youtube_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = YoutubeAudioCache(tmp_path / "cache", max_bytes=None)
+    for vid in ["aaaaaaaaaaa", "bbbbbbbbbbb"]:
+        entry = cache.entry_dir(vid)
+        entry.mkdir(parents=True)
+        audio = entry / f"{vid}.m4a"
+        audio.write_bytes(b"x" * 1000)
+        cache.put(vid, audio, {})
+
+    cache.max_bytes = 1500
+    assert cache.evict() == 1
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_concurrent_downloads_of_one_video_share_one_entry(
+    tmp_path: Path,
+    fake_yt_dlp: list[dict],
+) -> None:
+    cache = YoutubeAudioCache(tmp_path / "cache")
+    # Both downloads miss the cache, then finish one after the other.
+    first_dir = cache.staging_dir(VIDEO_ID)
+    second_dir = cache.staging_dir(VIDEO_ID)
+    assert first_dir != second_dir
+    first_audio = first_dir / f"{VIDEO_ID}.webm"
+    first_audio.write_bytes(b"first")
+    second_audio = second_dir / f"{VIDEO_ID}.webm"
+    second_audio.write_bytes(b"second")
+
+    kept = cache.put(VIDEO_ID, first_audio, {})
+    again = cache.put(VIDEO_ID, second_audio, {})
+
+    assert kept == again == cache.entry_dir(VIDEO_ID) / f"{VIDEO_ID}.webm"
+    assert kept.read_bytes() == b"first"
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == [VIDEO_ID]
+    assert cache.get(VIDEO_ID) == kept